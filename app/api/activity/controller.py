@@ -1,20 +1,26 @@
-from dataclasses import asdict
-
 from dependency_injector.wiring import inject, Provide
-from fastapi import APIRouter, Depends, Path
+from fastapi import APIRouter, Depends, Path, Query, Request, Response
 from fastapi import status
 
 from app.api.activity.serializers import ActivitySerializer, CreateActivitySerializer
 from app.api.auth.deps import get_authenticated_user_session
-from app.api.response_patterns import OkResponse
+from app.api.conditional import make_etag, is_not_modified, not_modified, etag_headers
+from app.api.exceptions import InvalidCursorException
+from app.api.response_patterns import OkResponse, OkPageResponse, json_response
 from app.api.responses import build_responses
 from app.api.rooms.exceptions import RoomNotFoundException, UserNotInRoomException
 from app.api.routing import SpendTimeTogetherAPIRoute
+from app.core.activity.constants import ActivityStatuses
 from app.core.activity.dto import CreateActivityDTO
 from app.core.activity.service import ActivityService
 from app.core.auth.dto import UsersSessionDTO
+from app.core.exceptions import InvalidCursor
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from app.core.rooms.exceptions import RoomNotFound, UserNotInRoom
+from app.core.rooms.service import RoomService
 from app.di.containers import DIContainer
+from app.infra.response_cache import ResponseCache
+from app.infra.versions import ResourceVersions, ACTIVITY_ARCHIVE_KEY, room_activities_key
 
 router = APIRouter(route_class=SpendTimeTogetherAPIRoute)
 
@@ -22,38 +28,71 @@ router = APIRouter(route_class=SpendTimeTogetherAPIRoute)
 @router.get(
     "/activities/{room_id}/all",
     status_code=status.HTTP_200_OK,
-    response_model=OkResponse[list[ActivitySerializer]],
+    response_model=OkPageResponse[ActivitySerializer],
     responses=build_responses(
         status_code=status.HTTP_200_OK,
-        docs_response_model=OkResponse[list[ActivitySerializer]],
+        docs_response_model=OkPageResponse[ActivitySerializer],
         exceptions=(
             RoomNotFoundException,
             UserNotInRoomException,
+            InvalidCursorException,
         ),
     ),
-    summary="Получить все активности комнаты",
+    summary="Получить активности комнаты, от новых к старым",
 )
 @inject
 async def get_room_activities(
+    request: Request,
     room_id: int = Path(..., description="ID комнаты"),
+    activity_status: list[ActivityStatuses] | None = Query(
+        None, alias="status", description="Фильтр по статусам активности"
+    ),
+    archived: bool = Query(False, description="Получить историю из архива завершенных активностей"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Размер страницы"),
+    cursor: str | None = Query(None, description="Курсор next_cursor из предыдущего ответа"),
     user_session: UsersSessionDTO = Depends(get_authenticated_user_session),
-    activity_service: ActivityService = Depends(Provide[DIContainer.services.activity_service])
-):
-    try:
-        activities_dto = await activity_service.get_activities_by_room_id(
+    activity_service: ActivityService = Depends(Provide[DIContainer.services.activity_service]),
+    room_service: RoomService = Depends(Provide[DIContainer.services.room_service]),
+    resource_versions: ResourceVersions = Depends(Provide[DIContainer.services.resource_versions]),
+    response_cache: ResponseCache = Depends(Provide[DIContainer.services.response_cache])
+) -> Response:
+    tags = (room_activities_key(room_id), ACTIVITY_ARCHIVE_KEY)
+    etag = make_etag(request, resource_versions.token(*tags))
+
+    async def load() -> bytes:
+        activities_page = await activity_service.get_activities_by_room_id(
             room_id=room_id,
-            user_id=user_session.user_id
+            user_id=user_session.user_id,
+            limit=limit,
+            cursor=cursor,
+            statuses=activity_status,
+            archived=archived,
+        )
+        return OkPageResponse.render(
+            status_code=status.HTTP_200_OK,
+            model=ActivitySerializer,
+            data=activities_page.items,
+            next_cursor=activities_page.next_cursor,
+        ).body
+
+    try:
+        # Членство проверяется по кэшу до 304 и до общего для комнаты кэша ответов.
+        await room_service.validate_users_room(room_id=room_id, user_id=user_session.user_id)
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+        body = await response_cache.get_or_load(
+            key=("room_activities", room_id, tuple(activity_status or ()), archived, limit, cursor),
+            tags=tags,
+            load=load,
         )
     except RoomNotFound as error:
         raise RoomNotFoundException(detail=str(error)) from error
     except UserNotInRoom as error:
         raise UserNotInRoomException(detail=str(error)) from error
+    except InvalidCursor as error:
+        raise InvalidCursorException(detail=str(error)) from error
 
-    return OkResponse.new(
-        status_code=status.HTTP_200_OK,
-        model=list[ActivitySerializer],
-        data=[asdict(activity) for activity in activities_dto],
-    )
+    return json_response(body, headers=etag_headers(etag))
 
 
 @router.get(
@@ -85,10 +124,10 @@ async def get_activity_by_id(
     except UserNotInRoom as error:
         raise UserNotInRoomException(detail=str(error)) from error
 
-    return OkResponse.new(
+    return OkResponse.render(
         status_code=status.HTTP_200_OK,
         model=ActivitySerializer,
-        data=asdict(activity_dto),
+        data=activity_dto,
     )
 
 
@@ -124,9 +163,9 @@ async def create_activity(
     except UserNotInRoom as error:
         raise UserNotInRoomException(detail=str(error)) from error
 
-    return OkResponse.new(
+    return OkResponse.render(
         status_code=status.HTTP_201_CREATED,
         model=ActivitySerializer,
-        data=asdict(activity_dto),
+        data=activity_dto,
     )
 
@@ -2,7 +2,9 @@ from datetime import datetime
 
 from pydantic import BaseModel
 
+from app.api.serialization import dto_serializers
 from app.core.activity.constants import ActivityStatuses, ActivityTypes
+from app.core.activity.dto import ActivityDTO
 
 
 class ActivitySerializer(BaseModel):
@@ -23,4 +25,7 @@ class CreateActivitySerializer(BaseModel):
     name: str
     status: ActivityStatuses
     type: ActivityTypes = ActivityTypes.VIDEO_GAMES
-    scheduled_at: str | None
\ No newline at end of file
+    scheduled_at: str | None
+
+
+dto_serializers.register(ActivityDTO, ActivitySerializer)
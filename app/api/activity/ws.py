@@ -1,6 +1,7 @@
 """WebSocket endpoint for activity rooms."""
 import json
 import logging
+import time
 
 from dependency_injector.wiring import inject, Provide
 from fastapi import (
@@ -19,10 +20,12 @@ from app.core.rooms.exceptions import RoomNotFound, UserNotInRoom
 from app.core.rooms.service import RoomService
 from app.core.users.service import UserService
 from app.di.containers import DIContainer
+from app.infra.adapters.database import profile_queries
+from settings.database import Settings
 
 from .ws_connection import manager
 from .ws_events import (
-    ActivityStateEvent, ConnectedEvent, UserJoinedEvent, UserLeftEvent,
+    ActivityStateEvent, ConnectedEvent, DebugQueryStatsEvent, UserJoinedEvent, UserLeftEvent,
 )
 from .ws_handlers import (
     send_users_in_activity, send_activity_variants,
@@ -44,7 +47,8 @@ async def websocket_endpoint(
     activity_id: int,
     activity_service: ActivityService = Depends(Provide[DIContainer.services.activity_service]),
     room_service: RoomService = Depends(Provide[DIContainer.services.room_service]),
-    user_service: UserService = Depends(Provide[DIContainer.services.user_service])
+    user_service: UserService = Depends(Provide[DIContainer.services.user_service]),
+    settings: Settings = Depends(Provide[DIContainer.settings]),
 ):
     logger.info(f"Попытка подключения к WebSocket для activity_id={activity_id}")
     await websocket.accept()
@@ -87,6 +91,7 @@ async def websocket_endpoint(
         except (ActivityNotFound, ActivityNotInProgress) as e:
             await websocket.close(code=4000, reason=str(e))
             return
+        presence_touched_at = time.monotonic()
 
         # Send initial state
         await manager.send_personal(
@@ -122,18 +127,35 @@ async def websocket_endpoint(
             action = message.get("action")
             payload = message.get("payload", {})
 
-            if action == "ping":
-                await handle_ping(websocket)
-            elif action == "get_users":
-                await handle_get_users(activity_id, activity_service)
-            elif action == "get_variants":
-                await handle_get_variants(websocket, activity_id, activity_service)
-            elif action == "send_reaction":
-                await handle_send_reaction(websocket, activity_id, user_info, payload)
-            elif action == "start_game":
-                await handle_start_game(websocket, activity_id, user_info, activity, activity_service)
-            elif action == "submit_variant":
-                await handle_submit_variant(websocket, activity_id, user_info, payload, activity_service)
+            with profile_queries() as query_stats:
+                if action == "ping":
+                    await handle_ping(websocket)
+                elif action == "get_users":
+                    await handle_get_users(activity_id, activity_service)
+                elif action == "get_variants":
+                    await handle_get_variants(websocket, activity_id, activity_service)
+                elif action == "send_reaction":
+                    await handle_send_reaction(websocket, activity_id, user_info, payload)
+                elif action == "start_game":
+                    await handle_start_game(websocket, activity_id, user_info, activity, activity_service)
+                elif action == "submit_variant":
+                    await handle_submit_variant(websocket, activity_id, user_info, payload, activity_service)
+
+                # Запись присутствия живого соединения не должна стать старше PRESENCE_MAX_AGE_SECONDS.
+                if time.monotonic() - presence_touched_at >= settings.PRESENCE_TOUCH_INTERVAL_SECONDS:
+                    await activity_service.touch_presence(user_id=user_info.id, activity_id=activity_id)
+                    presence_touched_at = time.monotonic()
+
+            if settings.DEBUG:
+                await manager.send_personal(
+                    DebugQueryStatsEvent(
+                        action=action,
+                        query_count=query_stats.count,
+                        total_ms=round(query_stats.total_time * 1000, 2),
+                        slowest_ms=round(query_stats.slowest_time * 1000, 2),
+                    ),
+                    websocket,
+                )
 
     except WebSocketDisconnect:
         logger.info(f"WebSocket соединение разорвано для activity_id={activity_id}")
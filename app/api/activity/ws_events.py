@@ -1,6 +1,12 @@
-from pydantic import BaseModel
+from datetime import datetime
+
+from pydantic import BaseModel, computed_field
 from typing import Optional, List
 
+from app.api.serialization import dto_serializers
+from app.core.activity.dto import GameStoreDTO, GamePlatformDTO, UserActivityVariantDTO
+from app.core.users.avatars import avatar_renditions
+
 
 class UserData(BaseModel):
     id: int
@@ -8,6 +14,11 @@ class UserData(BaseModel):
     last_name: str
     avatar_url: str | None = None
 
+    @computed_field
+    @property
+    def avatar_renditions(self) -> dict[str, dict[str, str]] | None:
+        return avatar_renditions(self.avatar_url)
+
 
 class StoreData(BaseModel):
     store_id: int
@@ -30,7 +41,7 @@ class VariantData(BaseModel):
     description: str | None = None
     background_image: str | None = None
     background_image_additional: str | None = None
-    release_date: str | None = None
+    release_date: datetime | None = None
     rating: str | None = None
     metacritic: int | None = None
     stores: list[StoreData] = []
@@ -135,6 +146,19 @@ class PongEvent(BaseModel):
     event: str = "pong"
 
 
+class DebugQueryStatsEvent(BaseModel):
+    event: str = "debug_query_stats"
+    action: str | None = None
+    query_count: int
+    total_ms: float
+    slowest_ms: float
+
+
+dto_serializers.register(GameStoreDTO, StoreData)
+dto_serializers.register(GamePlatformDTO, PlatformData)
+dto_serializers.register(UserActivityVariantDTO, VariantData)
+
+
 ALLOWED_REACTIONS = [
     "greeting", "well_played", "thanks",
     "oops", "threaten", "wow"
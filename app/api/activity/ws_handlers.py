@@ -2,16 +2,18 @@ import asyncio
 import logging
 import random
 
+import orjson
 from fastapi import WebSocket
 
+from app.api.serialization import JSON_OPTIONS, dto_serializers
 from app.core.activity.constants import ActivityStatuses
 from app.core.activity.exceptions import ActivityNotFound, ActivityNotInProgress, UserAlreadySubmittedVariant
 from app.core.activity.service import ActivityService
 
 from .ws_connection import manager
 from .ws_events import (
-    UserData, StoreData, PlatformData, VariantData,
-    UsersInActivityEvent, ActivityVariantsEvent, ActivityStateChangedEvent,
+    UserData, VariantData,
+    UsersInActivityEvent, ActivityStateChangedEvent,
     VariantSubmittedEvent, ReactionEvent, ErrorEvent, PongEvent,
     RouletteStartedEvent, RoulettePreEliminateEvent, VariantEliminatedEvent,
     WinnerDeclaredEvent, RouletteCancelledEvent,
@@ -42,38 +44,13 @@ async def send_users_in_activity(activity_id: int, activity_service: ActivitySer
 
 async def send_activity_variants(websocket: WebSocket, activity_id: int, activity_service: ActivityService):
     try:
-        variants = await activity_service.get_activity_variants(activity_id)
-        variants_data = []
-        for v in variants:
-            release_date_str = v.release_date.isoformat() if v.release_date else None
-            stores = [
-                StoreData(store_id=s.store_id, store_name=s.store_name, store_url=s.store_url)
-                for s in (v.stores or [])
-            ]
-            platforms = [
-                PlatformData(platform_id=p.platform_id, platform_name=p.platform_name, platform_slug=p.platform_slug)
-                for p in (v.platforms or [])
-            ]
-            variants_data.append(VariantData(
-                user_id=v.user_id,
-                activity_id=v.activity_id,
-                variant=v.variant,
-                api_game_id=v.api_game_id,
-                name=v.name,
-                description=v.description,
-                background_image=v.background_image,
-                background_image_additional=v.background_image_additional,
-                release_date=release_date_str,
-                rating=v.rating,
-                metacritic=v.metacritic,
-                stores=stores,
-                platforms=platforms,
-                user_first_name=v.user_first_name,
-                user_last_name=v.user_last_name,
-                user_avatar_url=v.user_avatar_url,
-            ))
-        event = ActivityVariantsEvent(variants=variants_data)
-        await manager.send_personal(event, websocket)
+        variants = await activity_service.get_activity_variants(activity_id, from_replica=True)
+        # UserActivityVariantDTO совпадает с VariantData, orjson пишет DTO без промежуточных моделей.
+        text = orjson.dumps(
+            {"event": "activity_variants", "variants": dto_serializers.prepare(VariantData, variants)},
+            option=JSON_OPTIONS,
+        ).decode()
+        await manager.send_personal_raw(text, websocket)
     except Exception as e:
         logger.error(f"Ошибка при отправке вариантов активности: {e}")
 
@@ -168,14 +145,6 @@ async def handle_submit_variant(
             )
             return
 
-        variants = await activity_service.get_activity_variants(activity_id)
-        if any(v.user_id == user_info.id for v in variants):
-            await manager.send_personal(
-                ErrorEvent(message="Вы уже предложили вариант для этой активности"),
-                websocket,
-            )
-            return
-
         await activity_service.submit_variant(
             user_id=user_info.id,
             activity_id=activity_id,
@@ -195,8 +164,11 @@ async def handle_submit_variant(
 
     except (ActivityNotFound, ActivityNotInProgress) as e:
         await manager.send_personal(ErrorEvent(message=str(e)), websocket)
-    except UserAlreadySubmittedVariant as e:
-        await manager.send_personal(ErrorEvent(message=str(e)), websocket)
+    except UserAlreadySubmittedVariant:
+        await manager.send_personal(
+            ErrorEvent(message="Вы уже предложили вариант для этой активности"),
+            websocket,
+        )
 
 
 async def start_roulette(activity_id: int, activity_service: ActivityService):
@@ -6,14 +6,14 @@ from fastapi import status
 from pydantic import BaseModel
 
 from app.api.auth.deps import get_authenticated_user_session
-from app.api.auth.exceptions import UserNotFoundException, UserAlreadyExistsException
+from app.api.auth.exceptions import UserNotFoundException, UserAlreadyExistsException, AuthServiceBusyException
 from app.api.auth.serializers import AuthUserSerializer, AuthUserResponseSerializer, AuthUserRegistrationSerializer, \
     AuthUserRegistrationResponseSerializer, AuthMeResponseSerializer
 from app.api.response_patterns import OkResponse
 from app.api.responses import build_responses
 from app.api.routing import SpendTimeTogetherAPIRoute
 from app.core.auth.dto import UsersSessionDTO
-from app.core.auth.exceptions import UserNotFound, IncorrectPassword, UserAlreadyExists
+from app.core.auth.exceptions import UserNotFound, IncorrectPassword, UserAlreadyExists, PasswordHashingOverloaded
 from app.core.auth.service import AuthService
 from app.core.users.service import UserService
 from app.di.containers import DIContainer
@@ -27,7 +27,7 @@ router = APIRouter(route_class=SpendTimeTogetherAPIRoute)
     responses=build_responses(
         status_code=status.HTTP_200_OK,
         docs_response_model=OkResponse[AuthUserResponseSerializer],
-        exceptions=(UserNotFoundException,),
+        exceptions=(UserNotFoundException, AuthServiceBusyException),
     ),
     summary="Авторизация пользователя и выдача токена",
     response_model=OkResponse[AuthUserResponseSerializer],
@@ -48,6 +48,8 @@ async def login_user(
         session_dto = await auth_service.authenticate_user(login=credentials.login, password=credentials.password)
     except (UserNotFound, IncorrectPassword) as error:
         raise UserNotFoundException(detail=str(error)) from error
+    except PasswordHashingOverloaded as error:
+        raise AuthServiceBusyException(detail=str(error)) from error
 
     _set_cookie(
         response=response,
@@ -67,7 +69,7 @@ async def login_user(
     responses=build_responses(
         status_code=status.HTTP_201_CREATED,
         docs_response_model=OkResponse[AuthUserRegistrationResponseSerializer],
-        exceptions=(UserAlreadyExistsException,),
+        exceptions=(UserAlreadyExistsException, AuthServiceBusyException),
     ),
     summary="Регистрация пользователя и выдача токена",
     response_model=OkResponse[AuthUserRegistrationResponseSerializer],
@@ -94,6 +96,8 @@ async def user_registration(
         )
     except UserAlreadyExists as error:
         raise UserAlreadyExistsException(detail=str(error)) from error
+    except PasswordHashingOverloaded as error:
+        raise AuthServiceBusyException(detail=str(error)) from error
 
     _set_cookie(
         response=response,
@@ -127,7 +131,7 @@ async def logout_user(
 
     Этот эндпоинт позволяет пользователю выйти из системы, удаляя токен сессии.
     """
-    await auth_service.logout_user(session_token=user_session.session_token)
+    await auth_service.logout_user(session_token=user_session.session_token, session_id=user_session.id)
     _delete_cookie(response=response, settings=Settings())
     return OkResponse.new(status_code=status.HTTP_200_OK, model=BaseModel, data={})
 
@@ -147,22 +151,15 @@ async def logout_user(
 async def get_current_user(
     user_session: UsersSessionDTO = Depends(get_authenticated_user_session),
     user_service: UserService = Depends(Provide[DIContainer.services.user_service]),
-) -> OkResponse[AuthMeResponseSerializer]:
+) -> Response:
     """
     Возвращает информацию о текущем авторизованном пользователе.
     """
     user_dto = await user_service.get_user_by_id(user_id=user_session.user_id)
-    return OkResponse.new(
+    return OkResponse.render(
         status_code=status.HTTP_200_OK,
         model=AuthMeResponseSerializer,
-        data={
-            "id": user_dto.id,
-            "login": user_dto.login,
-            "email": user_dto.email,
-            "first_name": user_dto.first_name,
-            "last_name": user_dto.last_name,
-            "avatar_url": user_dto.avatar_url,
-        }
+        data=user_dto
     )
 
 
@@ -5,7 +5,8 @@ from app.api.base_schemas import BaseError, BaseResponse
 
 __all__ = (
     "UserNotFoundException",
-    "UserAlreadyExistsException"
+    "UserAlreadyExistsException",
+    "AuthServiceBusyException",
 )
 
 from app.api.exceptions import BaseAPIException
@@ -36,4 +37,19 @@ class UserAlreadyExistsResponseModel(BaseResponse):
 
 class UserAlreadyExistsException(BaseAPIException):
     status_code = status.HTTP_409_CONFLICT
-    model = UserAlreadyExistsResponseModel
\ No newline at end of file
+    model = UserAlreadyExistsResponseModel
+
+
+class AuthServiceBusyError(BaseError):
+    pass
+
+
+class AuthServiceBusyResponseModel(BaseResponse):
+    status: int = Field(..., examples=[status.HTTP_429_TOO_MANY_REQUESTS])
+    error: AuthServiceBusyError
+
+
+class AuthServiceBusyException(BaseAPIException):
+    status_code = status.HTTP_429_TOO_MANY_REQUESTS
+    model = AuthServiceBusyResponseModel
+    headers = {"Retry-After": "1"}
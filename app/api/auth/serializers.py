@@ -1,6 +1,10 @@
 import re
 
-from pydantic import BaseModel, Field, field_validator, EmailStr
+from pydantic import BaseModel, Field, field_validator, EmailStr, computed_field
+
+from app.api.serialization import dto_serializers
+from app.core.users.avatars import avatar_renditions
+from app.core.users.dto import UserDTO
 
 
 class AuthUserSerializer(BaseModel):
@@ -58,6 +62,13 @@ class AuthMeResponseSerializer(BaseModel):
     last_name: str | None = Field(default=None, title="Фамилия")
     avatar_url: str | None = Field(default=None, title="URL аватара")
 
+    @computed_field(title="URL версий аватара по размеру и формату")
+    @property
+    def avatar_renditions(self) -> dict[str, dict[str, str]] | None:
+        return avatar_renditions(self.avatar_url)
+
     class Config:
         from_attributes = True
 
+
+dto_serializers.register(UserDTO, AuthMeResponseSerializer)
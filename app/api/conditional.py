@@ -0,0 +1,39 @@
+import hashlib
+
+from fastapi import Request, Response, status
+
+# Ответ хранится только в браузере и перед использованием перепроверяется по ETag.
+PRIVATE_REVALIDATE_CACHE_CONTROL = "private, no-cache"
+# Меняется вместе с форматом ответов, чтобы после релиза старые ETag не совпадали.
+ETAG_SCHEMA_VERSION = 1
+
+
+def etag_matches(if_none_match: str | None, etag: str | None) -> bool:
+    """Совпадает ли etag с заголовком If-None-Match (слабое сравнение, RFC 9110, 13.1.2)."""
+    if if_none_match is None or etag is None:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in tags or "*" in tags
+
+
+def make_etag(request: Request, token: str | None) -> str | None:
+    """ETag ответа по токену версий ресурса: один и тот же URL с теми же версиями дает тот же ETag."""
+    if token is None:
+        return None
+    value = f"{ETAG_SCHEMA_VERSION}|{request.url.path}?{request.url.query}|{token}"
+    return f'"{hashlib.blake2b(value.encode(), digest_size=12).hexdigest()}"'
+
+
+def etag_headers(etag: str | None) -> dict[str, str] | None:
+    if etag is None:
+        return None
+    return {"etag": etag, "cache-control": PRIVATE_REVALIDATE_CACHE_CONTROL}
+
+
+def is_not_modified(request: Request, etag: str | None) -> bool:
+    """Есть ли у клиента версия ответа с этим ETag."""
+    return etag_matches(request.headers.get("if-none-match"), etag)
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag))
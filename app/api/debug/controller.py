@@ -0,0 +1,60 @@
+from dependency_injector.wiring import inject, Provide
+from fastapi import APIRouter, Depends, status, Response
+
+from app.api.debug.serializers import DebugStatsSerializer, CacheStatsSerializer
+from app.api.response_patterns import OkResponse
+from app.api.routing import SpendTimeTogetherAPIRoute
+from app.core.auth.cache import SessionTokenCache
+from app.core.rooms.cache import RoomMembershipCache
+from app.di.containers import DIContainer
+from app.infra.adapters.database import Database
+from app.infra.response_cache import ResponseCache
+
+router = APIRouter(route_class=SpendTimeTogetherAPIRoute)
+
+
+@router.get(
+    "/debug/stats",
+    status_code=status.HTTP_200_OK,
+    response_model=OkResponse[DebugStatsSerializer],
+    summary="Статистика пула соединений и кэшей процесса (только в режиме DEBUG)",
+)
+@inject
+async def get_debug_stats(
+    database: Database = Depends(Provide[DIContainer.repositories.database]),
+    session_cache: SessionTokenCache = Depends(Provide[DIContainer.services.session_cache]),
+    membership_cache: RoomMembershipCache = Depends(Provide[DIContainer.services.room_membership_cache]),
+    response_cache: ResponseCache = Depends(Provide[DIContainer.services.response_cache]),
+) -> Response:
+    session_stats = session_cache.stats()
+    membership_stats = membership_cache.stats()
+    response_stats = response_cache.stats()
+    return OkResponse.render(
+        status_code=status.HTTP_200_OK,
+        model=DebugStatsSerializer,
+        data=DebugStatsSerializer(
+            pool=database.pool_metrics.as_dict(),
+            replica_pools={url: metrics.as_dict() for url, metrics in database.replica_pool_metrics().items()},
+            session_cache=CacheStatsSerializer(
+                size=session_stats.size + session_stats.negative_size,
+                hits=session_stats.hits,
+                misses=session_stats.misses,
+                hit_ratio=session_stats.hit_ratio,
+                db_lookups_avoided=session_stats.db_lookups_avoided,
+            ),
+            room_membership_cache=CacheStatsSerializer(
+                size=membership_stats.size,
+                hits=membership_stats.hits,
+                misses=membership_stats.misses,
+                hit_ratio=membership_stats.hit_ratio,
+                db_lookups_avoided=membership_stats.hits,
+            ),
+            response_cache=CacheStatsSerializer(
+                size=response_stats.size,
+                hits=response_stats.hits,
+                misses=response_stats.misses,
+                hit_ratio=response_stats.hit_ratio,
+                db_lookups_avoided=response_stats.hits + response_stats.coalesced,
+            ),
+        ),
+    )
@@ -0,0 +1,17 @@
+from pydantic import BaseModel, Field
+
+
+class CacheStatsSerializer(BaseModel):
+    size: int = Field(title="Количество записей")
+    hits: int = Field(title="Попадания")
+    misses: int = Field(title="Промахи")
+    hit_ratio: float = Field(title="Доля попаданий")
+    db_lookups_avoided: int = Field(title="Сэкономлено запросов к БД")
+
+
+class DebugStatsSerializer(BaseModel):
+    pool: dict[str, int | float] = Field(title="Пул соединений с БД")
+    replica_pools: dict[str, dict[str, int | float]] = Field(title="Пулы соединений с репликами по URL")
+    session_cache: CacheStatsSerializer = Field(title="Кэш токенов сессий")
+    room_membership_cache: CacheStatsSerializer = Field(title="Кэш членства в комнатах")
+    response_cache: CacheStatsSerializer = Field(title="Кэш ответов списков")
@@ -1,12 +1,17 @@
 from collections import defaultdict
+from functools import cache, lru_cache
 from itertools import groupby
 from typing import Any, Union
 
+import orjson
 from fastapi import status
 from fastapi.requests import Request
-from starlette.responses import JSONResponse
+from pydantic import Field
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from starlette.responses import Response
 
-from app.api.base_schemas import BaseResponse
+from app.api.base_schemas import BaseError, BaseResponse
+from app.api.serialization import JSON_OPTIONS
 
 
 class BaseAPIException(Exception):
@@ -51,6 +56,20 @@ class BaseAPIException(Exception):
             },
         }
 
+class InvalidCursorError(BaseError):
+    pass
+
+
+class InvalidCursorResponseModel(BaseResponse):
+    status: int = Field(..., examples=[status.HTTP_400_BAD_REQUEST])
+    error: InvalidCursorError
+
+
+class InvalidCursorException(BaseAPIException):
+    status_code = status.HTTP_400_BAD_REQUEST
+    model = InvalidCursorResponseModel
+
+
 def include_exception_responses(*args: type[BaseAPIException]) -> dict[Any, Any]:
     responses: dict[int, dict[Any, Any]] = {}
 
@@ -75,13 +94,84 @@ def include_exception_responses(*args: type[BaseAPIException]) -> dict[Any, Any]
     return responses
 
 
-async def api_exception_handler(_: Request, exc: BaseAPIException) -> JSONResponse:
+def _render_error(exc: BaseAPIException) -> bytes:
+    return orjson.dumps(exc.get_response_data().model_dump(exclude_none=True), option=JSON_OPTIONS)
+
+
+_DETAIL_PLACEHOLDER = "\x00detail\x00"
+
+
+@cache
+def _static_error_body(exc_type: type[BaseAPIException]) -> bytes:
+    """Тело ошибки, целиком заданной атрибутами класса: собирается один раз на класс."""
+    return _render_error(exc_type())
+
+
+@cache
+def _error_body_template(exc_type: type[BaseAPIException]) -> tuple[bytes, bytes]:
+    """
+    Тело ошибки класса exc_type до и после значения detail. Контроллеры
+    передают в исключение только detail, остальное тело от запроса не зависит.
+    """
+    prefix, suffix = _render_error(exc_type(detail=_DETAIL_PLACEHOLDER)).split(orjson.dumps(_DETAIL_PLACEHOLDER))
+    return prefix, suffix
+
+
+def _error_body(exc: BaseAPIException) -> bytes:
+    ctx = vars(exc)
+    if not ctx:
+        return _static_error_body(type(exc))
+    if ctx.keys() == {"detail"} and isinstance(exc.detail, str):
+        prefix, suffix = _error_body_template(type(exc))
+        return prefix + orjson.dumps(exc.detail) + suffix
+    return _render_error(exc)
+
+
+def _exception_types(base: type[BaseAPIException]) -> list[type[BaseAPIException]]:
+    types = []
+    for subclass in base.__subclasses__():
+        types.append(subclass)
+        types.extend(_exception_types(subclass))
+    return types
+
+
+def prerender_error_bodies() -> None:
+    """Собирает тела всех ошибок API с постоянным содержимым при старте, а не на первом запросе."""
+    for exc_type in _exception_types(BaseAPIException):
+        _static_error_body(exc_type)
+        _error_body_template(exc_type)
+
+
+async def api_exception_handler(_: Request, exc: BaseAPIException) -> Response:
     """
     Обработчик для кастомных исключений API.
-    Преобразует BaseAPIException в JSONResponse.
+    Преобразует BaseAPIException в JSON через orjson. Тела собираются
+    при старте, на запросе в них подставляется только detail.
     """
-    return JSONResponse(
+    return Response(
+        content=_error_body(exc),
         status_code=exc.status_code,
-        content=exc.get_response_data().model_dump(exclude_none=True),
         headers=exc.headers,
-    )
\ No newline at end of file
+        media_type="application/json",
+    )
+
+
+@lru_cache(maxsize=256)
+def _http_error_body(detail: str) -> bytes:
+    return orjson.dumps({"detail": detail})
+
+
+async def http_exception_handler(_: Request, exc: StarletteHTTPException) -> Response:
+    """
+    Замена обработчика HTTPException из FastAPI с тем же форматом {"detail": ...}.
+    401 из get_authenticated_user_session и 404 на несуществующие пути приходят
+    с одним и тем же detail, поэтому тела для строковых detail кэшируются.
+    """
+    headers = getattr(exc, "headers", None)
+    if exc.status_code < 200 or exc.status_code in (status.HTTP_204_NO_CONTENT, status.HTTP_304_NOT_MODIFIED):
+        return Response(status_code=exc.status_code, headers=headers)
+    if isinstance(exc.detail, str):
+        content = _http_error_body(exc.detail)
+    else:
+        content = orjson.dumps({"detail": exc.detail}, option=JSON_OPTIONS)
+    return Response(content=content, status_code=exc.status_code, headers=headers, media_type="application/json")
@@ -0,0 +1,41 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.infra.adapters.database import QueryStats, profile_queries
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+QUERY_TIME_HEADER = "X-DB-Time-Ms"
+SLOWEST_QUERY_HEADER = "X-DB-Slowest-Ms"
+
+
+def query_stats_headers(stats: QueryStats) -> dict[str, str]:
+    return {
+        QUERY_COUNT_HEADER: str(stats.count),
+        QUERY_TIME_HEADER: f"{stats.total_time * 1000:.2f}",
+        SLOWEST_QUERY_HEADER: f"{stats.slowest_time * 1000:.2f}",
+    }
+
+
+class QueryProfilingMiddleware:
+    """
+    Считает запросы к БД за время HTTP-запроса и добавляет статистику
+    в заголовки ответа. Подключается только вне продакшена (DEBUG).
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with profile_queries() as stats:
+            async def send_with_stats(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    for name, value in query_stats_headers(stats).items():
+                        headers.append(name, value)
+                await send(message)
+
+            await self.app(scope, receive, send_with_stats)
@@ -1,5 +1,7 @@
+from functools import cache
 from typing import Any, Generic, TypeAlias, TypeVar
 
+import orjson
 from fastapi import (
     Response,
     status as http_status_code,
@@ -7,12 +9,33 @@ from fastapi import (
 from pydantic import BaseModel, ConfigDict, Field
 
 from app.api.base_schemas import BaseError
+from app.api.serialization import JSON_OPTIONS, dto_serializers
 
 _Model = TypeVar("_Model")
 
 GenericResponse: TypeAlias = BaseModel
 
 
+@cache
+def parametrize(generic: type[BaseModel], model: Any) -> type[BaseModel]:
+    """generic[model] с кэшем: параметризация дженерика Pydantic дорогая на каждый запрос."""
+    return generic[model]  # type: ignore[index]
+
+
+def dump_data(model: Any, data: Any) -> Any:
+    """Готовит data к orjson в форме model, см. DTOSerializerRegistry."""
+    return dto_serializers.prepare(model, data)
+
+
+def render_json(status_code: int, content: dict[str, Any], headers: dict[str, str] | None = None) -> Response:
+    return json_response(orjson.dumps(content, option=JSON_OPTIONS), status_code=status_code, headers=headers)
+
+
+def json_response(body: bytes, status_code: int = 200, headers: dict[str, str] | None = None) -> Response:
+    """Ответ из уже готового JSON, например из ResponseCache."""
+    return Response(content=body, status_code=status_code, headers=headers, media_type="application/json")
+
+
 class DataResponse(GenericResponse, Generic[_Model]):
     data: _Model
 
@@ -30,6 +53,74 @@ class OkResponse(GenericResponse, Generic[_Model]):
         model: type[_Model] | list[type[_Model]] | Any,
         data: _Model | Any,
     ) -> "OkResponse[_Model]":
-        return cls[model](status=status_code, payload=DataResponse[model](data=data))  # type: ignore
+        return parametrize(cls, model)(status=status_code, payload=parametrize(DataResponse, model)(data=data))
+
+    @classmethod
+    def render(
+        cls,
+        *,
+        status_code: int,
+        model: type[_Model] | Any,
+        data: _Model | Any,
+        headers: dict[str, str] | None = None,
+    ) -> Response:
+        """
+        То же, что new, но сразу в JSON через orjson: DTO не превращаются в модели
+        и ответ не валидируется повторно. response_model в декораторе роута
+        по-прежнему задает схему OpenAPI.
+        """
+        return render_json(
+            status_code,
+            {"status": status_code, "error": None, "payload": {"data": dump_data(model, data)}},
+            headers=headers,
+        )
+
+    model_config = ConfigDict(json_schema_extra={"description": ""})
+
+
+class PageDataResponse(GenericResponse, Generic[_Model]):
+    data: list[_Model]
+    next_cursor: str | None = Field(None, title="Курсор следующей страницы, null на последней странице.")
+
+
+class OkPageResponse(GenericResponse, Generic[_Model]):
+    status: int = Field(..., title="Status code of request.", examples=[http_status_code.HTTP_200_OK])
+    error: dict[Any, Any] | BaseError | None = Field(None, title="Errors")
+    payload: PageDataResponse[_Model] = Field(title="Payload data.")
+
+    @classmethod
+    def new(
+        cls,
+        *,
+        status_code: int,
+        model: type[_Model] | Any,
+        data: list[_Model] | list[Any],
+        next_cursor: str | None,
+    ) -> "OkPageResponse[_Model]":
+        return parametrize(cls, model)(
+            status=status_code,
+            payload=parametrize(PageDataResponse, model)(data=data, next_cursor=next_cursor),
+        )
+
+    @classmethod
+    def render(
+        cls,
+        *,
+        status_code: int,
+        model: type[_Model] | Any,
+        data: list[_Model] | list[Any],
+        next_cursor: str | None,
+        headers: dict[str, str] | None = None,
+    ) -> Response:
+        """Страница в JSON через orjson, см. OkResponse.render."""
+        return render_json(
+            status_code,
+            {
+                "status": status_code,
+                "error": None,
+                "payload": {"data": dump_data(model, data), "next_cursor": next_cursor},
+            },
+            headers=headers,
+        )
 
     model_config = ConfigDict(json_schema_extra={"description": ""})
@@ -1,12 +1,12 @@
-from dataclasses import asdict
-
 from dependency_injector.wiring import inject, Provide
-from fastapi import APIRouter, Depends, Path
+from fastapi import APIRouter, Depends, Path, Query, Request, Response
 from fastapi import status, Body
 from pydantic import BaseModel
 
 from app.api.auth.deps import get_authenticated_user_session
-from app.api.response_patterns import OkResponse
+from app.api.conditional import make_etag, is_not_modified, not_modified, etag_headers
+from app.api.exceptions import InvalidCursorException
+from app.api.response_patterns import OkResponse, OkPageResponse, json_response
 from app.api.responses import build_responses
 from app.api.rooms.exceptions import RoomNotFoundException, UserNotInRoomException, RoomNotFoundByInviteCodeException, \
     UserAlreadyInRoomException
@@ -14,11 +14,15 @@ from app.api.rooms.serializers import RoomInfoSerializer, RoomCreateSerializer,
 from app.api.routing import SpendTimeTogetherAPIRoute
 from app.api.users.serializers import UserInfoSerializer
 from app.core.auth.dto import UsersSessionDTO
+from app.core.exceptions import InvalidCursor
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from app.core.rooms.exceptions import RoomNotFound, UserNotInRoom, RoomNotFoundByInviteCode, UserAlreadyInRoom
 from app.core.rooms.service import RoomService
 from app.core.users.dto import UserDTO
 from app.core.users.service import UserService
 from app.di.containers import DIContainer
+from app.infra.response_cache import ResponseCache
+from app.infra.versions import ResourceVersions, USER_PROFILES_KEY, user_rooms_key, room_members_key
 
 router = APIRouter(route_class=SpendTimeTogetherAPIRoute)
 
@@ -26,27 +30,64 @@ router = APIRouter(route_class=SpendTimeTogetherAPIRoute)
 @router.get(
     "/rooms/all",
     status_code=status.HTTP_200_OK,
-    response_model=OkResponse[list[RoomInfoSerializer]],
+    response_model=OkPageResponse[RoomInfoSerializer],
+    responses=build_responses(
+        status_code=status.HTTP_200_OK,
+        docs_response_model=OkPageResponse[RoomInfoSerializer],
+        exceptions=(InvalidCursorException,),
+    ),
     summary="Получить список комнат пользователя",
 )
 @inject
 async def get_users_rooms_list(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Размер страницы"),
+    cursor: str | None = Query(None, description="Курсор next_cursor из предыдущего ответа"),
     user_session: UsersSessionDTO = Depends(get_authenticated_user_session),
-    room_service: RoomService = Depends(Provide[DIContainer.services.room_service])
-) -> OkResponse[list[RoomInfoSerializer]]:
+    room_service: RoomService = Depends(Provide[DIContainer.services.room_service]),
+    resource_versions: ResourceVersions = Depends(Provide[DIContainer.services.resource_versions]),
+    response_cache: ResponseCache = Depends(Provide[DIContainer.services.response_cache])
+) -> Response:
     """
-    Получает список комнат пользователя.
+    Получает страницу списка комнат пользователя.
+    Если версия списка не изменилась с ETag из If-None-Match, отвечает 304,
+    иначе отдает ответ из кэша ответов или собирает его.
 
+    :param request: Запрос.
+    :param limit: Размер страницы.
+    :param cursor: Курсор следующей страницы.
     :param user_session: Сессия, по которой пользователь вошел.
     :param room_service: Сервис для работы с комнатами.
-    :return: Список комнат пользователя.
+    :param resource_versions: Версии ресурсов для ETag.
+    :param response_cache: Кэш готовых ответов.
+    :return: Список комнат пользователя и курсор следующей страницы.
     """
-    rooms = await room_service.get_rooms_by_user_id(user_session.user_id)
-    return OkResponse.new(
-        status_code=status.HTTP_200_OK,
-        model=list[RoomInfoSerializer],
-        data=[asdict(room_dto) for room_dto in rooms],
-    )
+    tags = (user_rooms_key(user_session.user_id),)
+    etag = make_etag(request, resource_versions.token(*tags))
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+
+    async def load() -> bytes:
+        rooms_page = await room_service.get_rooms_by_user_id(
+            user_id=user_session.user_id,
+            limit=limit,
+            cursor=cursor,
+        )
+        return OkPageResponse.render(
+            status_code=status.HTTP_200_OK,
+            model=RoomInfoSerializer,
+            data=rooms_page.items,
+            next_cursor=rooms_page.next_cursor,
+        ).body
+
+    try:
+        body = await response_cache.get_or_load(
+            key=("rooms", user_session.user_id, limit, cursor), tags=tags, load=load
+        )
+    except InvalidCursor as error:
+        raise InvalidCursorException(detail=str(error)) from error
+
+    return json_response(body, headers=etag_headers(etag))
 
 
 @router.post(
@@ -60,7 +101,7 @@ async def create_room(
     user_session: UsersSessionDTO = Depends(get_authenticated_user_session),
     create_room_info: RoomCreateSerializer = Body(),
     room_service: RoomService = Depends(Provide[DIContainer.services.room_service])
-) -> OkResponse[RoomInfoSerializer]:
+) -> Response:
     """
     Создает новую комнату.
 
@@ -73,10 +114,10 @@ async def create_room(
         name=create_room_info.name,
         description=create_room_info.description,
     )
-    return OkResponse.new(
+    return OkResponse.render(
         status_code=status.HTTP_201_CREATED,
         model=RoomInfoSerializer,
-        data=asdict(room_dto),
+        data=room_dto,
     )
 
 
@@ -96,7 +137,7 @@ async def create_invite_code(
     room_id: int = Path(..., description="ID комнаты"),
     user_session: UsersSessionDTO = Depends(get_authenticated_user_session),
     room_service: RoomService = Depends(Provide[DIContainer.services.room_service])
-) -> OkResponse[InviteCodeSerializer]:
+) -> Response:
     """
     Создает код-приглашение для других юзеров в комнату
 
@@ -115,10 +156,10 @@ async def create_invite_code(
     except UserNotInRoom as error:
         raise UserNotInRoomException(detail=str(error)) from error
 
-    return OkResponse.new(
+    return OkResponse.render(
         status_code=status.HTTP_201_CREATED,
         model=InviteCodeSerializer,
-        data=asdict(invite_code_dto),
+        data=invite_code_dto,
     )
 
 
@@ -137,7 +178,7 @@ async def activate_invite_code(
     invite_code: str = Body(..., embed=True, description="Код-приглашение для комнаты"),
     user_session: UsersSessionDTO = Depends(get_authenticated_user_session),
     room_service: RoomService = Depends(Provide[DIContainer.services.room_service])
-) -> OkResponse[RoomInfoSerializer]:
+) -> Response:
     """
     Активирует код-приглашение для комнаты.
 
@@ -158,53 +199,84 @@ async def activate_invite_code(
     except UserAlreadyInRoom as error:
         raise UserAlreadyInRoomException(detail=str(error)) from error
 
-    return OkResponse.new(
+    return OkResponse.render(
         status_code=status.HTTP_200_OK,
         model=RoomInfoSerializer,
-        data=asdict(room_dto)
+        data=room_dto
     )
 
 
 @router.get(
     "/rooms/{room_id}/users",
     status_code=status.HTTP_200_OK,
-    response_model=OkResponse[list[UserInfoSerializer]],
+    response_model=OkPageResponse[UserInfoSerializer],
     responses=build_responses(
         status_code=status.HTTP_200_OK,
-        docs_response_model=OkResponse[list[UserInfoSerializer]],
-        exceptions=(RoomNotFoundException, UserNotInRoomException),
+        docs_response_model=OkPageResponse[UserInfoSerializer],
+        exceptions=(RoomNotFoundException, UserNotInRoomException, InvalidCursorException),
     )
 )
 @inject
 async def get_room_users(
+    request: Request,
     room_id: int = Path(..., description="ID комнаты"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Размер страницы"),
+    cursor: str | None = Query(None, description="Курсор next_cursor из предыдущего ответа"),
     user_session: UsersSessionDTO = Depends(get_authenticated_user_session),
     room_service: RoomService = Depends(Provide[DIContainer.services.room_service]),
-    user_service: UserService = Depends(Provide[DIContainer.services.user_service])
-) -> OkResponse[list[UserInfoSerializer]]:
+    user_service: UserService = Depends(Provide[DIContainer.services.user_service]),
+    resource_versions: ResourceVersions = Depends(Provide[DIContainer.services.resource_versions]),
+    response_cache: ResponseCache = Depends(Provide[DIContainer.services.response_cache])
+) -> Response:
     """
-    Получает список пользователей в комнате.
+    Получает страницу списка пользователей в комнате.
+    Если состав комнаты и профили не изменились с ETag из If-None-Match, отвечает 304,
+    иначе отдает ответ из кэша ответов, общего для всех участников, или собирает его.
 
+    :param request: Запрос.
     :param room_id: ID комнаты.
+    :param limit: Размер страницы.
+    :param cursor: Курсор следующей страницы.
     :param user_session: Сессия, по которой пользователь вошел.
     :param room_service: Сервис для работы с комнатами.
     :param user_service: Сервис для работы с пользователями.
-    :return: Список пользователей в комнате.
+    :param resource_versions: Версии ресурсов для ETag.
+    :param response_cache: Кэш готовых ответов.
+    :return: Список пользователей в комнате и курсор следующей страницы.
     """
+    tags = (room_members_key(room_id), USER_PROFILES_KEY)
+    etag = make_etag(request, resource_versions.token(*tags))
+
+    async def load() -> bytes:
+        user_ids_page = await room_service.get_users_in_room(
+            room_id=room_id,
+            user_id=user_session.user_id,
+            limit=limit,
+            cursor=cursor,
+        )
+        # Профили входят в ETag и кэш ответов через USER_PROFILES_KEY, поэтому читаются с основной БД.
+        users_dto = await user_service.get_users_by_ids(user_ids=user_ids_page.items, from_replica=False)
+        return OkPageResponse.render(
+            status_code=status.HTTP_200_OK,
+            model=UserInfoSerializer,
+            data=users_dto,
+            next_cursor=user_ids_page.next_cursor,
+        ).body
+
     try:
-        user_ids = await room_service.get_users_in_room(room_id=room_id, user_id=user_session.user_id)
+        # Членство проверяется по кэшу до 304 и до общего для комнаты кэша ответов.
+        await room_service.validate_users_room(room_id=room_id, user_id=user_session.user_id)
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+        body = await response_cache.get_or_load(key=("room_members", room_id, limit, cursor), tags=tags, load=load)
     except RoomNotFound as error:
         raise RoomNotFoundException(detail=str(error)) from error
     except UserNotInRoom as error:
         raise UserNotInRoomException(detail=str(error)) from error
+    except InvalidCursor as error:
+        raise InvalidCursorException(detail=str(error)) from error
 
-    users_dto = await user_service.get_users_by_ids(user_ids=user_ids)
-
-    return OkResponse.new(
-        status_code=status.HTTP_200_OK,
-        model=list[UserInfoSerializer],
-        data=[asdict(user_dto) for user_dto in users_dto],
-    )
+    return json_response(body, headers=etag_headers(etag))
 
 
 @router.post(
@@ -223,7 +295,7 @@ async def exit_room(
     room_id: int = Path(..., description="ID комнаты"),
     user_session: UsersSessionDTO = Depends(get_authenticated_user_session),
     room_service: RoomService = Depends(Provide[DIContainer.services.room_service])
-) -> OkResponse[BaseModel]:
+) -> Response:
     """
     Позволяет пользователю покинуть комнату.
 
@@ -239,7 +311,7 @@ async def exit_room(
     except UserNotInRoom as error:
         raise UserNotInRoomException(detail=str(error)) from error
 
-    return OkResponse.new(
+    return OkResponse.render(
         status_code=status.HTTP_200_OK,
         model=BaseModel,
         data={}
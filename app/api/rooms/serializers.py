@@ -1,5 +1,8 @@
 from pydantic import BaseModel
 
+from app.api.serialization import dto_serializers
+from app.core.rooms.dto import RoomDTO, InviteCodeDTO
+
 
 class RoomInfoSerializer(BaseModel):
     id: int
@@ -26,3 +29,7 @@ class InviteCodeSerializer(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+dto_serializers.register(RoomDTO, RoomInfoSerializer)
+dto_serializers.register(InviteCodeDTO, InviteCodeSerializer)
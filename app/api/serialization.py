@@ -0,0 +1,146 @@
+import dataclasses
+import logging
+import types
+import typing
+from functools import cache, partial
+from operator import attrgetter
+from typing import Any, Callable
+
+import orjson
+from pydantic import BaseModel, TypeAdapter
+
+logger = logging.getLogger(__name__)
+
+# Pydantic пишет UTC как Z, orjson по умолчанию +00:00.
+JSON_OPTIONS = orjson.OPT_UTC_Z
+
+FieldGetter = Callable[[Any], Any]
+
+
+@cache
+def _type_adapter(annotation: Any) -> TypeAdapter:
+    return TypeAdapter(annotation)
+
+
+def _without_none(annotation: Any) -> Any:
+    if typing.get_origin(annotation) in (typing.Union, types.UnionType):
+        args = tuple(arg for arg in typing.get_args(annotation) if arg is not type(None))
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _dump_field(name: str, adapter: TypeAdapter, dto: Any) -> Any:
+    # validate_python вернул бы модели Pydantic для вложенных сериализаторов, а их orjson не пишет.
+    return adapter.dump_python(adapter.validate_python(getattr(dto, name), from_attributes=True), mode="json")
+
+
+@dataclasses.dataclass(frozen=True)
+class DTOSerializer:
+    """
+    Как DTO типа dto_type записывается в JSON в форме сериализатора model.
+
+    native - DTO совпадает с сериализатором по полям, их порядку и типам, и orjson пишет
+    его сам, включая вложенные списки DTO, без asdict и промежуточных словарей.
+    Иначе plan перечисляет поля ответа и способ получить каждое: поля DTO,
+    которых нет в сериализаторе (password), в ответ не попадают.
+    """
+    dto_type: type
+    model: type[BaseModel]
+    plan: tuple[tuple[str, FieldGetter], ...] | None = None
+
+    @property
+    def native(self) -> bool:
+        return self.plan is None
+
+    def prepare(self, dto: Any) -> Any:
+        if self.plan is None:
+            return dto
+        return {name: getter(dto) for name, getter in self.plan}
+
+
+class DTOSerializerRegistry:
+    """
+    Реестр пар (DTO, сериализатор ответа). Пары регистрируются рядом
+    с сериализаторами при импорте, поэтому расхождение DTO и сериализатора
+    (нет обязательного поля) обнаруживается при старте, а не на запросе.
+    """
+
+    def __init__(self) -> None:
+        self._serializers: dict[tuple[type, type], DTOSerializer] = {}
+
+    def register(self, dto_type: type, model: type[BaseModel]) -> DTOSerializer:
+        serializer = self._build(dto_type, model)
+        self._serializers[(dto_type, model)] = serializer
+        return serializer
+
+    def get(self, dto_type: type, model: type[BaseModel]) -> DTOSerializer:
+        serializer = self._serializers.get((dto_type, model))
+        if serializer is None:
+            logger.warning(f"{dto_type.__name__} не зарегистрирован для {model.__name__}, план строится на лету")
+            serializer = self.register(dto_type, model)
+        return serializer
+
+    def prepare(self, model: Any, data: Any) -> Any:
+        """Готовит data к orjson в форме model без валидации всего ответа."""
+        if isinstance(data, list):
+            if not data:
+                return data
+            if dataclasses.is_dataclass(data[0]) and self.get(type(data[0]), model).native:
+                return data
+            return [self.prepare(model, item) for item in data]
+        if isinstance(data, BaseModel):
+            return data.model_dump(mode="json")
+        if dataclasses.is_dataclass(data) and isinstance(model, type) and issubclass(model, BaseModel):
+            return self.get(type(data), model).prepare(data)
+        adapter = _type_adapter(model)
+        return adapter.dump_python(adapter.validate_python(data), mode="json")
+
+    def dumps(self, model: Any, data: Any) -> bytes:
+        return orjson.dumps(self.prepare(model, data), option=JSON_OPTIONS)
+
+    def _build(self, dto_type: type, model: type[BaseModel]) -> DTOSerializer:
+        dto_fields = {field.name: field.type for field in dataclasses.fields(dto_type)}
+        plan: list[tuple[str, FieldGetter]] = []
+        # orjson пишет поля dataclass в порядке объявления, поэтому порядок тоже должен совпадать.
+        native = list(dto_fields) == list(model.model_fields) and not model.model_computed_fields
+
+        for name, field_info in model.model_fields.items():
+            if name not in dto_fields:
+                if field_info.is_required():
+                    raise TypeError(f"{dto_type.__name__} has no field {name!r} required by {model.__name__}")
+                default = field_info.get_default(call_default_factory=True)
+                plan.append((name, lambda dto, default=default: default))
+            elif self._same_json(dto_fields[name], field_info.annotation):
+                plan.append((name, attrgetter(name)))
+            else:
+                native = False
+                plan.append((name, partial(_dump_field, name, _type_adapter(field_info.annotation))))
+        for name, computed_field_info in model.model_computed_fields.items():
+            # Вычисляемые поля сериализаторов читают только поля, которые есть и в DTO.
+            plan.append((name, computed_field_info.wrapped_property.fget))
+
+        return DTOSerializer(dto_type=dto_type, model=model, plan=None if native else tuple(plan))
+
+    def _same_json(self, dto_annotation: Any, model_annotation: Any) -> bool:
+        """
+        Одинаково ли orjson запишет значение типа dto_annotation и Pydantic - model_annotation.
+        Optional в DTO при обязательном поле сериализатора считается тем же типом:
+        None там и сейчас не проходит валидацию ответа.
+        """
+        if dto_annotation == model_annotation:
+            return True
+        dto_annotation, model_annotation = _without_none(dto_annotation), _without_none(model_annotation)
+        if dto_annotation == model_annotation:
+            return True
+        if dataclasses.is_dataclass(dto_annotation) and isinstance(model_annotation, type) \
+                and issubclass(model_annotation, BaseModel):
+            return self.get(dto_annotation, model_annotation).native
+        dto_origin, model_origin = typing.get_origin(dto_annotation), typing.get_origin(model_annotation)
+        if dto_origin is None or dto_origin is not model_origin:
+            return False
+        dto_args, model_args = typing.get_args(dto_annotation), typing.get_args(model_annotation)
+        return len(dto_args) == len(model_args) and all(map(self._same_json, dto_args, model_args))
+
+
+dto_serializers = DTOSerializerRegistry()
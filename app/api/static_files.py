@@ -0,0 +1,115 @@
+import asyncio
+import mimetypes
+import os
+import re
+from os import PathLike
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import StaticFiles, NotModifiedResponse
+from starlette.types import Scope, Receive, Send
+
+from app.api.conditional import etag_matches
+
+# Имя содержит хэш содержимого (аватары <sha256>-<размер>.<формат>, собранные ассеты
+# app.<hash>.js): по такому URL содержимое не меняется, и его можно кэшировать бессрочно.
+CONTENT_HASHED_NAME = re.compile(r"(?:^|[.-])[0-9a-f]{16,}(?:[.-]|$)")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Остальное браузер хранит, но перед использованием перепроверяет по ETag.
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# Изображения и архивы уже сжаты, предсжатые версии ищутся только для текстовых форматов.
+COMPRESSIBLE_EXTENSIONS = frozenset({".css", ".js", ".mjs", ".json", ".svg", ".html", ".txt", ".map", ".xml"})
+PRECOMPRESSED_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+class BoundedFileResponse(FileResponse):
+    """FileResponse, который держит дескриптор файла только под семафором open_files."""
+
+    def __init__(self, *args, open_files: asyncio.Semaphore, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._open_files = open_files
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        async with self._open_files:
+            await super().__call__(scope, receive, send)
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    Раздача статики с заголовками для кэширования в браузере и на CDN.
+
+    Файлы с хэшем содержимого в имени отдаются с Cache-Control immutable
+    на год, остальные - с no-cache и ETag, чтобы повторный запрос заканчивался
+    ответом 304. Если рядом с текстовым файлом лежит предсжатая версия
+    (.br, .gz) и клиент ее принимает, отдается она. Range обрабатывает
+    FileResponse; на запросы с Range предсжатые версии не подставляются.
+    Одновременно открыто не больше max_open_files файлов, остальные ответы ждут.
+    """
+
+    def __init__(self, *, max_open_files: int = 256, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.max_open_files = max_open_files
+        self._open_files = asyncio.Semaphore(max_open_files)
+
+    def file_response(
+        self,
+        full_path: PathLike,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        full_path = os.fspath(full_path)
+        filename = os.path.basename(full_path)
+        _, extension = os.path.splitext(filename)
+
+        headers = {
+            "cache-control": IMMUTABLE_CACHE_CONTROL if CONTENT_HASHED_NAME.search(filename)
+            else REVALIDATE_CACHE_CONTROL
+        }
+        path = full_path
+        if extension in COMPRESSIBLE_EXTENSIONS:
+            headers["vary"] = "Accept-Encoding"
+            if status_code == 200 and "range" not in request_headers:
+                path, stat_result = self._precompressed(
+                    full_path, stat_result, request_headers.get("accept-encoding", ""), headers
+                )
+
+        response = BoundedFileResponse(
+            path,
+            status_code=status_code,
+            headers=headers,
+            # Тип берется по исходному имени, а не по .br/.gz.
+            media_type=mimetypes.guess_type(filename)[0] or "text/plain",
+            stat_result=stat_result,
+            open_files=self._open_files,
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    @staticmethod
+    def _precompressed(
+        full_path: str,
+        stat_result: os.stat_result,
+        accept_encoding: str,
+        headers: dict[str, str],
+    ) -> tuple[str, os.stat_result]:
+        accepted = {token.split(";")[0].strip() for token in accept_encoding.lower().split(",")}
+        for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+            if encoding not in accepted:
+                continue
+            try:
+                compressed_stat = os.stat(full_path + suffix)
+            except OSError:
+                continue
+            headers["content-encoding"] = encoding
+            return full_path + suffix, compressed_stat
+        return full_path, stat_result
+
+    def is_not_modified(self, response_headers: Headers, request_headers: Headers) -> bool:
+        # При наличии If-None-Match дата изменения не учитывается (RFC 9110, 13.2.2).
+        if "if-none-match" in request_headers:
+            return etag_matches(request_headers["if-none-match"], response_headers.get("etag"))
+        return super().is_not_modified(response_headers, request_headers)
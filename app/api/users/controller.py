@@ -1,19 +1,21 @@
-from dataclasses import asdict
-
 from dependency_injector.wiring import inject, Provide
-from fastapi import APIRouter, Depends, status, UploadFile, File
+from fastapi import APIRouter, Depends, status, UploadFile, File, Request, Response
 
 from app.api.auth.deps import get_authenticated_user_session
+from app.api.conditional import make_etag, is_not_modified, not_modified, etag_headers
 from app.api.response_patterns import OkResponse
 from app.api.responses import build_responses
 from app.api.routing import SpendTimeTogetherAPIRoute
-from app.api.users.exceptions import UserNotFoundException, UserConflictException, UserBadRequestException
+from app.api.users.exceptions import UserNotFoundException, UserConflictException, UserBadRequestException, \
+    AvatarUploadBusyException
 from app.api.users.serializers import UserInfoSerializer, UserUpdateSerializer
 from app.core.auth.dto import UsersSessionDTO
 from app.core.users.dto import UserUpdateDTO
-from app.core.users.exceptions import UserNotFound, LoginAlreadyExists, EmailAlreadyExists, AvatarException
+from app.core.users.exceptions import UserNotFound, LoginAlreadyExists, EmailAlreadyExists, AvatarException, \
+    AvatarProcessingOverloaded
 from app.core.users.service import UserService
 from app.di.containers import DIContainer
+from app.infra.versions import ResourceVersions, user_profile_key
 
 router = APIRouter(route_class=SpendTimeTogetherAPIRoute)
 
@@ -31,18 +33,25 @@ router = APIRouter(route_class=SpendTimeTogetherAPIRoute)
 )
 @inject
 async def get_current_user_info(
+    request: Request,
     user_service: UserService = Depends(Provide[DIContainer.services.user_service]),
     user_session: UsersSessionDTO = Depends(get_authenticated_user_session),
-) -> OkResponse[UserInfoSerializer]:
+    resource_versions: ResourceVersions = Depends(Provide[DIContainer.services.resource_versions]),
+) -> Response:
+    etag = make_etag(request, resource_versions.token(user_profile_key(user_session.user_id)))
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+
     try:
         user_dto = await user_service.get_user_by_id(user_id=user_session.user_id)
     except UserNotFound as error:
         raise UserNotFoundException(detail=str(error)) from error
 
-    return OkResponse.new(
+    return OkResponse.render(
         status_code=status.HTTP_200_OK,
         model=UserInfoSerializer,
-        data=asdict(user_dto),
+        data=user_dto,
+        headers=etag_headers(etag),
     )
 
 
@@ -62,7 +71,7 @@ async def update_current_user(
     update_data: UserUpdateSerializer,
     user_service: UserService = Depends(Provide[DIContainer.services.user_service]),
     user_session: UsersSessionDTO = Depends(get_authenticated_user_session),
-) -> OkResponse[UserInfoSerializer]:
+) -> Response:
     update_dto = UserUpdateDTO(**update_data.model_dump(exclude_unset=True))
     try:
         updated_user_dto = await user_service.update_user(
@@ -73,10 +82,10 @@ async def update_current_user(
     except (LoginAlreadyExists, EmailAlreadyExists) as error:
         raise UserConflictException(detail=str(error)) from error
 
-    return OkResponse.new(
+    return OkResponse.render(
         status_code=status.HTTP_200_OK,
         model=UserInfoSerializer,
-        data=asdict(updated_user_dto),
+        data=updated_user_dto,
     )
 
 
@@ -87,7 +96,7 @@ async def update_current_user(
     responses=build_responses(
         status_code=status.HTTP_200_OK,
         docs_response_model=OkResponse[UserInfoSerializer],
-        exceptions=(UserNotFoundException, UserBadRequestException),
+        exceptions=(UserNotFoundException, UserBadRequestException, AvatarUploadBusyException),
     ),
     summary="Загрузить аватар для текущего пользователя",
 )
@@ -96,7 +105,7 @@ async def upload_avatar(
     file: UploadFile = File(...),
     user_service: UserService = Depends(Provide[DIContainer.services.user_service]),
     user_session: UsersSessionDTO = Depends(get_authenticated_user_session),
-) -> OkResponse[UserInfoSerializer]:
+) -> Response:
     try:
         updated_user_dto = await user_service.update_avatar(
             user_id=user_session.user_id, file=file
@@ -105,9 +114,11 @@ async def upload_avatar(
         raise UserNotFoundException(detail=str(error)) from error
     except AvatarException as error:
         raise UserBadRequestException(detail=str(error)) from error
+    except AvatarProcessingOverloaded as error:
+        raise AvatarUploadBusyException(detail=str(error)) from error
 
-    return OkResponse.new(
+    return OkResponse.render(
         status_code=status.HTTP_200_OK,
         model=UserInfoSerializer,
-        data=asdict(updated_user_dto),
+        data=updated_user_dto,
     )
@@ -7,6 +7,7 @@ __all__ = (
     "UserNotFoundException",
     "UserConflictException",
     "UserBadRequestException",
+    "AvatarUploadBusyException",
 )
 
 from app.api.exceptions import BaseAPIException
@@ -52,3 +53,18 @@ class UserBadRequestResponseModel(BaseResponse):
 class UserBadRequestException(BaseAPIException):
     status_code = status.HTTP_400_BAD_REQUEST
     model = UserBadRequestResponseModel
+
+
+class AvatarUploadBusyError(BaseError):
+    pass
+
+
+class AvatarUploadBusyResponseModel(BaseResponse):
+    status: int = Field(..., examples=[status.HTTP_429_TOO_MANY_REQUESTS])
+    error: AvatarUploadBusyError
+
+
+class AvatarUploadBusyException(BaseAPIException):
+    status_code = status.HTTP_429_TOO_MANY_REQUESTS
+    model = AvatarUploadBusyResponseModel
+    headers = {"Retry-After": "1"}
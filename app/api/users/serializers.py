@@ -1,6 +1,10 @@
 from datetime import datetime
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, computed_field
+
+from app.api.serialization import dto_serializers
+from app.core.users.avatars import avatar_renditions
+from app.core.users.dto import UserDTO
 
 
 class UserInfoSerializer(BaseModel):
@@ -14,6 +18,11 @@ class UserInfoSerializer(BaseModel):
     created_at: datetime = Field(title="Дата создания")
     updated_at: datetime = Field(title="Дата обновления")
 
+    @computed_field(title="URL версий аватара по размеру и формату")
+    @property
+    def avatar_renditions(self) -> dict[str, dict[str, str]] | None:
+        return avatar_renditions(self.avatar_url)
+
     class Config:
         from_attributes = True
 
@@ -25,3 +34,6 @@ class UserUpdateSerializer(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+dto_serializers.register(UserDTO, UserInfoSerializer)
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, func, Enum, ForeignKey, Text
+from sqlalchemy import DateTime, func, Enum, ForeignKey, Text, Index, UniqueConstraint
 from sqlalchemy import String, Integer
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -10,6 +10,10 @@ from app.infra.adapters.database import Base
 
 class Activity(Base):
     __tablename__ = "activity"
+    __table_args__ = (
+        Index("ix_activity_room_id_status_id", "room_id", "status", "id"),
+        Index("ix_activity_status_finished_at", "status", "finished_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -49,6 +53,11 @@ class Activity(Base):
         server_default=func.now(),
         nullable=False
     )
+    finished_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        default=None
+    )
 
 
 class UserActivity(Base):
@@ -74,10 +83,22 @@ class UserActivity(Base):
         server_default=func.now(),
         nullable=False
     )
+    # Обновляется при каждом подключении и периодически, пока соединение живо.
+    last_seen_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+
+
+VARIANT_PER_USER_CONSTRAINT = "uq_user_activity_variants_activity_id_user_id"
 
 
 class UserActivityVariants(Base):
     __tablename__ = "user_activity_variants"
+    __table_args__ = (
+        UniqueConstraint("activity_id", "user_id", name=VARIANT_PER_USER_CONSTRAINT),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     api_game_id: Mapped[int] = mapped_column(
@@ -134,3 +155,61 @@ class GamePlatform(Base):
     platform_name: Mapped[str] = mapped_column(String(100), nullable=False) 
     platform_slug: Mapped[str] = mapped_column(String(100), nullable=True)
 
+
+# Архив завершенных активностей. Таблицы повторяют колонки основных, но без
+# внешних ключей и автоинкремента: строки переносятся туда со своими id.
+
+class ActivityArchive(Base):
+    __tablename__ = "activity_archive"
+    __table_args__ = (
+        Index("ix_activity_archive_room_id_id", "room_id", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    room_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    creator_user_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    winner_user_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    winner_variant_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    status: Mapped[ActivityStatuses] = mapped_column(Enum(ActivityStatuses), nullable=False)
+    type: Mapped[ActivityTypes] = mapped_column(Enum(ActivityTypes), nullable=False)
+    scheduled_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+class UserActivityVariantsArchive(Base):
+    __tablename__ = "user_activity_variants_archive"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    api_game_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    description: Mapped[str | None] = mapped_column(Text, nullable=True)
+    background_image: Mapped[str] = mapped_column(String(1024), nullable=True)
+    background_image_additional: Mapped[str] = mapped_column(String(1024), nullable=True)
+    release_date: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
+    rating: Mapped[str] = mapped_column(String(4), nullable=True)
+    metacritic: Mapped[int] = mapped_column(Integer, nullable=True)
+    user_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    activity_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    variant: Mapped[str] = mapped_column(String(255), nullable=False)
+
+
+class GameStoreArchive(Base):
+    __tablename__ = "game_stores_archive"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    variant_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    store_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    store_name: Mapped[str] = mapped_column(String(100), nullable=False)
+    store_url: Mapped[str] = mapped_column(String(1024), nullable=True)
+
+
+class GamePlatformArchive(Base):
+    __tablename__ = "game_platforms_archive"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    variant_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    platform_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    platform_name: Mapped[str] = mapped_column(String(100), nullable=False)
+    platform_slug: Mapped[str] = mapped_column(String(100), nullable=True)
@@ -0,0 +1,31 @@
+from sqlalchemy import Row, Select, select
+
+from app.core.activity.dto import ActivityDTO
+from app.core.activity.models import Activity, ActivityArchive
+
+
+def select_activity_dto(model: type[Activity] | type[ActivityArchive] = Activity) -> Select:
+    """Колонки ActivityDTO из основной таблицы или из архива (model=ActivityArchive)."""
+    return select(
+        model.id,
+        model.name,
+        model.room_id,
+        model.status,
+        model.type,
+        model.scheduled_at,
+        model.winner_user_id,
+        model.creator_user_id,
+    )
+
+
+def to_activity_dto(row: Row) -> ActivityDTO:
+    return ActivityDTO(
+        id=row.id,
+        name=row.name,
+        room_id=row.room_id,
+        status=row.status,
+        type=row.type,
+        scheduled_at=row.scheduled_at.__str__() if row.scheduled_at else None,
+        winner_user_id=row.winner_user_id,
+        creator_user_id=row.creator_user_id,
+    )
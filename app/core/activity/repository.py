@@ -2,16 +2,54 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import List, Tuple, Optional
 
-from sqlalchemy import select, func, update
+from sqlalchemy import select, func, update, bindparam, exists
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import joinedload
 
 from app.core.activity.constants import ActivityStatuses
 from app.core.activity.dto import ActivityDTO, CreateActivityDTO
-from app.core.activity.models import Activity
+from app.core.activity.exceptions import UserAlreadySubmittedVariant
+from app.core.activity.models import Activity, ActivityArchive
 from app.core.activity.models import UserActivity, UserActivityVariants, GameStore, GamePlatform
+from app.core.activity.models import VARIANT_PER_USER_CONSTRAINT
+from app.core.activity.projections import select_activity_dto, to_activity_dto
 from app.core.mixins import BaseRepository
 from app.core.users.models import Users
 
+FINAL_STATUSES = (ActivityStatuses.FINISHED, ActivityStatuses.CANCELLED)
+
+# Горячие запросы собираются один раз: ключ кэша компиляции у готового
+# выражения мемоизируется, и на вызов остается только подстановка параметров.
+_ACTIVITY_BY_ID = select(Activity).where(Activity.id == bindparam("activity_id"))
+_ARCHIVED_ACTIVITY_BY_ID = select_activity_dto(ActivityArchive).where(
+    ActivityArchive.id == bindparam("activity_id")
+)
+_USERS_BY_ACTIVITY_ID = select(UserActivity).where(UserActivity.activity_id == bindparam("activity_id"))
+_USER_ACTIVITY = select(UserActivity).where(
+    UserActivity.user_id == bindparam("user_id"),
+    UserActivity.activity_id == bindparam("activity_id")
+)
+_HAS_USER_VARIANT = select(
+    exists().where(
+        UserActivityVariants.activity_id == bindparam("activity_id"),
+        UserActivityVariants.user_id == bindparam("user_id")
+    )
+)
+_STORES_BY_VARIANT_ID = select(GameStore).where(GameStore.variant_id == bindparam("variant_id"))
+_PLATFORMS_BY_VARIANT_ID = select(GamePlatform).where(GamePlatform.variant_id == bindparam("variant_id"))
+
+
+def _violates_variant_per_user(error: IntegrityError) -> bool:
+    """
+    Нарушено ли ограничение "один вариант пользователя на активность".
+    MySQL называет в ошибке имя ограничения, SQLite - колонки уникального индекса.
+    """
+    message = str(error.orig)
+    return (
+        VARIANT_PER_USER_CONSTRAINT in message
+        or "user_activity_variants.activity_id, user_activity_variants.user_id" in message
+    )
+
 
 @dataclass
 class ActivityRepository(BaseRepository):
@@ -19,7 +57,8 @@ class ActivityRepository(BaseRepository):
         self,
         activity_id: int,
         status: ActivityStatuses
-    ):
+    ) -> int:
+        """Возвращает id комнаты активности."""
         query = (
             select(Activity)
             .where(Activity.id == activity_id)
@@ -27,8 +66,12 @@ class ActivityRepository(BaseRepository):
         async with self.db.session() as session:
             result = await session.execute(query)
             activity = result.scalars().one()
+            room_id = activity.room_id
             activity.status = status
+            if status in FINAL_STATUSES:
+                activity.finished_at = func.now()
             await session.commit()
+            return room_id
 
     async def remove_user_from_activity(
         self,
@@ -50,28 +93,48 @@ class ActivityRepository(BaseRepository):
         self,
         activity_id: int
     ) -> list[UserActivity]:
-        query = select(UserActivity).where(UserActivity.activity_id == activity_id)
-
         async with self.db.session() as session:
-            result = await session.execute(query)
+            result = await session.execute(_USERS_BY_ACTIVITY_ID, {"activity_id": activity_id})
             return result.scalars().all()
 
     async def get_activities_by_room_id(
         self,
-        room_id: int
-    ) -> list[Activity]:
-        query = select(Activity).where(Activity.room_id == room_id)
+        room_id: int,
+        limit: int,
+        before_id: int | None = None,
+        statuses: list[ActivityStatuses] | None = None,
+        archived: bool = False
+    ) -> list[ActivityDTO]:
+        """
+        Возвращает активности комнаты от новых к старым, начиная с id меньше before_id.
 
+        :param archived: Читать историю из архива вместо основной таблицы.
+        """
+        model = ActivityArchive if archived else Activity
+        query = select_activity_dto(model).where(model.room_id == room_id)
+        if before_id is not None:
+            query = query.where(model.id < before_id)
+        if statuses:
+            query = query.where(model.status.in_(statuses))
+        query = query.order_by(model.id.desc()).limit(limit)
+
+        # Список отдается с ETag и попадает в кэш ответов, поэтому читается с основной БД:
+        # отстающая реплика отдала бы старый список под уже новой версией.
         async with self.db.session() as session:
             result = await session.execute(query)
-            return result.scalars().all()
+            return [to_activity_dto(row) for row in result]
 
     async def get_activity_by_id(self, activity_id: int) -> Activity | None:
-        query = select(Activity).where(Activity.id == activity_id)
         async with self.db.session() as session:
-            result = await session.execute(query)
+            result = await session.execute(_ACTIVITY_BY_ID, {"activity_id": activity_id})
             return result.scalars().first()
 
+    async def get_archived_activity_by_id(self, activity_id: int) -> ActivityDTO | None:
+        async with self.db.read_session() as session:
+            result = await session.execute(_ARCHIVED_ACTIVITY_BY_ID, {"activity_id": activity_id})
+            row = result.first()
+            return to_activity_dto(row) if row is not None else None
+
     async def create_activity(
         self,
         activity_dto: CreateActivityDTO,
@@ -103,18 +166,16 @@ class ActivityRepository(BaseRepository):
         - UserActivity - объект пользовательской активности
         - is_new_connection - True, если это первое подключение пользователя, False если он уже был подключен
         """
-        query = select(UserActivity).where(
-            UserActivity.user_id == user_id,
-            UserActivity.activity_id == activity_id
-        )
-
         async with self.db.session() as session:
-            result = await session.execute(query)
+            result = await session.execute(
+                _USER_ACTIVITY, {"user_id": user_id, "activity_id": activity_id}
+            )
             user_activity = result.scalars().first()
             is_new_connection = False
 
             if user_activity:
                 user_activity.connections_count += 1
+                user_activity.last_seen_at = func.now()
             else:
                 user_activity = UserActivity(
                     user_id=user_id,
@@ -128,6 +189,16 @@ class ActivityRepository(BaseRepository):
             await session.refresh(user_activity)
             return user_activity, is_new_connection
 
+    async def touch_user_activity(self, user_id: int, activity_id: int) -> None:
+        """Отмечает, что подключения пользователя к активности еще живы."""
+        async with self.db.session() as session:
+            await session.execute(
+                update(UserActivity)
+                .where(UserActivity.user_id == user_id, UserActivity.activity_id == activity_id)
+                .values(last_seen_at=func.now())
+            )
+            await session.commit()
+
     async def decrease_user_connections_count(
         self,
         user_id: int,
@@ -137,13 +208,10 @@ class ActivityRepository(BaseRepository):
         Уменьшает счетчик подключений пользователя к активности.
         Возвращает True, если запись была удалена (счетчик стал 0).
         """
-        query = select(UserActivity).where(
-            UserActivity.user_id == user_id,
-            UserActivity.activity_id == activity_id
-        )
-
         async with self.db.session() as session:
-            result = await session.execute(query)
+            result = await session.execute(
+                _USER_ACTIVITY, {"user_id": user_id, "activity_id": activity_id}
+            )
             user_activity = result.scalars().first()
 
             if not user_activity:
@@ -199,7 +267,12 @@ class ActivityRepository(BaseRepository):
 
         async with self.db.session() as session:
             session.add(user_variant)
-            await session.flush()
+            try:
+                await session.flush()
+            except IntegrityError as error:
+                if not _violates_variant_per_user(error):
+                    raise
+                raise UserAlreadySubmittedVariant(activity_id=activity_id, user_id=user_id) from error
 
             if stores_data:
                 for store_data in stores_data:
@@ -227,12 +300,23 @@ class ActivityRepository(BaseRepository):
             await session.refresh(user_variant)
             return user_variant
 
+    async def has_user_variant(self, user_id: int, activity_id: int) -> bool:
+        async with self.db.session() as session:
+            result = await session.execute(_HAS_USER_VARIANT, {"activity_id": activity_id, "user_id": user_id})
+            return bool(result.scalar())
+
     async def get_variants_with_related_by_activity_id(
         self,
-        activity_id: int
+        activity_id: int,
+        from_replica: bool = False
     ) -> List[Tuple[UserActivityVariants, List[GameStore], List[GamePlatform], Optional[Users]]]:
-        """Получает варианты с связанными магазинами, платформами и информацией о пользователе."""
-        async with self.db.session() as session:
+        """
+        Получает варианты с связанными магазинами, платформами и информацией о пользователе.
+
+        :param from_replica: Читать с реплики, если допустимо отставание (только для отображения).
+        """
+        session_factory = self.db.read_session if from_replica else self.db.session
+        async with session_factory() as session:
             variants_query = (
                 select(UserActivityVariants, Users)
                 .outerjoin(Users, UserActivityVariants.user_id == Users.id)
@@ -243,12 +327,10 @@ class ActivityRepository(BaseRepository):
 
             result_list = []
             for variant, user in variants_with_users:
-                stores_query = select(GameStore).where(GameStore.variant_id == variant.id)
-                stores_result = await session.execute(stores_query)
+                stores_result = await session.execute(_STORES_BY_VARIANT_ID, {"variant_id": variant.id})
                 stores = stores_result.scalars().all()
 
-                platforms_query = select(GamePlatform).where(GamePlatform.variant_id == variant.id)
-                platforms_result = await session.execute(platforms_query)
+                platforms_result = await session.execute(_PLATFORMS_BY_VARIANT_ID, {"variant_id": variant.id})
                 platforms = platforms_result.scalars().all()
 
                 result_list.append((variant, stores, platforms, user))
@@ -260,7 +342,8 @@ class ActivityRepository(BaseRepository):
         activity_id: int,
         winner_user_id: int,
         status: ActivityStatuses
-    ) -> None:
+    ) -> int:
+        """Возвращает id комнаты активности."""
         query = (
             select(Activity)
             .where(Activity.id == activity_id)
@@ -268,6 +351,10 @@ class ActivityRepository(BaseRepository):
         async with self.db.session() as session:
             result = await session.execute(query)
             activity = result.scalars().one()
+            room_id = activity.room_id
             activity.winner_user_id = winner_user_id
             activity.status = status
+            if status in FINAL_STATUSES:
+                activity.finished_at = func.now()
             await session.commit()
+            return room_id
@@ -6,9 +6,11 @@ from app.core.activity.dto import ActivityDTO, CreateActivityDTO, UserActivityVa
 from app.core.activity.exceptions import ActivityNotFound, ActivityNotInProgress, UserAlreadySubmittedVariant
 from app.core.activity.models import UserActivity, UserActivityVariants
 from app.core.activity.repository import ActivityRepository
+from app.core.pagination import DEFAULT_PAGE_SIZE, PageDTO, build_page, decode_cursor
 from app.core.rooms.service import RoomService
 from app.core.users.dto import UserDTO
 from app.core.users.service import UserService
+from app.infra.versions import ResourceVersions, room_activities_key
 
 
 @dataclass
@@ -16,32 +18,38 @@ class ActivityService:
     activity_repository: ActivityRepository
     room_service: RoomService
     user_service: UserService
+    resource_versions: ResourceVersions
 
     async def get_activities_by_room_id(
         self,
         room_id: int,
-        user_id: int
-    ) -> list[ActivityDTO]:
+        user_id: int,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None,
+        statuses: list[ActivityStatuses] | None = None,
+        archived: bool = False
+    ) -> PageDTO[ActivityDTO]:
+        before_id = decode_cursor(cursor)
         await self.room_service.validate_users_room(room_id=room_id, user_id=user_id)
 
-        activities = await self.activity_repository.get_activities_by_room_id(room_id=room_id)
-        return [
-            ActivityDTO(
-                id=activity.id,
-                name=activity.name,
-                room_id=activity.room_id,
-                status=activity.status,
-                type=activity.type,
-                scheduled_at=activity.scheduled_at.__str__() if activity.scheduled_at else None,
-                winner_user_id=activity.winner_user_id,
-                creator_user_id=activity.creator_user_id
-            ) for activity in activities
-        ]
+        activities = await self.activity_repository.get_activities_by_room_id(
+            room_id=room_id,
+            limit=limit + 1,
+            before_id=before_id,
+            statuses=statuses,
+            archived=archived
+        )
+        activities, next_cursor = build_page(activities, limit)
+        return PageDTO(items=activities, next_cursor=next_cursor)
 
     async def get_activity_by_id(self, activity_id: int) -> ActivityDTO:
         activity = await self.activity_repository.get_activity_by_id(activity_id)
         if not activity:
-            raise ActivityNotFound(activity_id=activity_id)
+            # Завершенные активности со временем переносятся в архив.
+            archived_activity = await self.activity_repository.get_archived_activity_by_id(activity_id)
+            if archived_activity is None:
+                raise ActivityNotFound(activity_id=activity_id)
+            return archived_activity
 
         return ActivityDTO(
             id=activity.id,
@@ -67,6 +75,7 @@ class ActivityService:
             room_id=room_id,
             creator_user_id=user_id
         )
+        await self.resource_versions.bump(room_activities_key(room_id))
 
         return ActivityDTO(
             id=created_activity.id,
@@ -112,6 +121,9 @@ class ActivityService:
 
         return was_deleted
 
+    async def touch_presence(self, user_id: int, activity_id: int) -> None:
+        await self.activity_repository.touch_user_activity(user_id=user_id, activity_id=activity_id)
+
     async def get_users_in_activity(self, activity_id: int) -> list[UserDTO]:
         activity = await self.activity_repository.get_activity_by_id(activity_id)
         if not activity:
@@ -129,8 +141,7 @@ class ActivityService:
         if activity.status == ActivityStatuses.IN_PROGRESS or activity.status == ActivityStatuses.FINISHED:
             raise ActivityNotInProgress(activity_id=activity_id)
 
-        existing_variants = await self.get_activity_variants(activity_id)
-        if any(v.user_id == user_id for v in existing_variants):
+        if await self.activity_repository.has_user_variant(user_id=user_id, activity_id=activity_id):
             raise UserAlreadySubmittedVariant(activity_id=activity_id, user_id=user_id)
 
         variant = variant_data.get("name", "")
@@ -162,8 +173,15 @@ class ActivityService:
             platforms_data=platforms_data
         )
 
-    async def get_activity_variants(self, activity_id: int) -> list[UserActivityVariantDTO]:
-        variants_with_related = await self.activity_repository.get_variants_with_related_by_activity_id(activity_id=activity_id)
+    async def get_activity_variants(
+        self,
+        activity_id: int,
+        from_replica: bool = False
+    ) -> list[UserActivityVariantDTO]:
+        variants_with_related = await self.activity_repository.get_variants_with_related_by_activity_id(
+            activity_id=activity_id,
+            from_replica=from_replica
+        )
 
         result = []
         for variant, stores, platforms, user in variants_with_related:
@@ -207,11 +225,13 @@ class ActivityService:
         return result
 
     async def finalize_activity(self, activity_id: int, winner_user_id: int):
-        await self.activity_repository.update_activity_winner_and_status(
+        room_id = await self.activity_repository.update_activity_winner_and_status(
             activity_id=activity_id,
             winner_user_id=winner_user_id,
             status=ActivityStatuses.FINISHED
         )
+        await self.resource_versions.bump(room_activities_key(room_id))
 
     async def update_activity_status(self, activity_id: int, status: ActivityStatuses):
-        await self.activity_repository.update_activity_status(activity_id=activity_id, status=status)
+        room_id = await self.activity_repository.update_activity_status(activity_id=activity_id, status=status)
+        await self.resource_versions.bump(room_activities_key(room_id))
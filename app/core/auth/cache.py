@@ -0,0 +1,86 @@
+from dataclasses import dataclass
+
+from app.core.auth.dto import UsersSessionDTO
+from app.infra.adapters.invalidation import InvalidationBus
+from app.infra.cache import MISSING, TTLCache
+
+SESSION_TOKEN_CHANNEL = "session_token"
+
+
+@dataclass
+class SessionCacheStats:
+    size: int
+    negative_size: int
+    hits: int
+    negative_hits: int
+    misses: int
+
+    @property
+    def db_lookups_avoided(self) -> int:
+        return self.hits + self.negative_hits
+
+    @property
+    def hit_ratio(self) -> float:
+        """Доля проверок, попавших в кэш известных сессий (без кэша неизвестных токенов)."""
+        total = self.db_lookups_avoided + self.misses
+        return self.hits / total if total else 0.0
+
+
+class SessionTokenCache:
+    """
+    Кэш токен сессии -> UsersSessionDTO для аутентификации по cookie.
+
+    Неизвестные токены кэшируются отдельно, с меньшим временем жизни и своим
+    лимитом размера, чтобы перебор токенов не бил в БД и не вытеснял
+    настоящие сессии. При выходе пользователя токен сбрасывается сразу,
+    в том числе у других воркеров через шину инвалидации.
+    """
+
+    def __init__(
+        self,
+        invalidation_bus: InvalidationBus,
+        maxsize: int,
+        ttl: float,
+        negative_maxsize: int,
+        negative_ttl: float
+    ) -> None:
+        self.invalidation_bus = invalidation_bus
+        self._sessions: TTLCache[str, UsersSessionDTO] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._unknown: TTLCache[str, None] = TTLCache(maxsize=negative_maxsize, ttl=negative_ttl)
+        self.generation = 0
+        invalidation_bus.subscribe(SESSION_TOKEN_CHANNEL, self._on_invalidation)
+
+    def get(self, session_token: str) -> UsersSessionDTO | None:
+        """Возвращает DTO, None для известного отсутствующего токена или MISSING."""
+        user_session = self._sessions.get(session_token)
+        if user_session is not MISSING:
+            return user_session
+        if self._unknown.get(session_token) is not MISSING:
+            return None
+        return MISSING
+
+    def set(self, session_token: str, user_session: UsersSessionDTO | None, generation: int) -> None:
+        if generation != self.generation:
+            return
+        if user_session is None:
+            self._unknown.set(session_token, None)
+        else:
+            self._sessions.set(session_token, user_session)
+
+    async def invalidate(self, session_token: str) -> None:
+        await self.invalidation_bus.publish(SESSION_TOKEN_CHANNEL, session_token)
+
+    def _on_invalidation(self, session_token: str) -> None:
+        self.generation += 1
+        self._sessions.pop(session_token)
+        self._unknown.pop(session_token)
+
+    def stats(self) -> SessionCacheStats:
+        sessions, unknown = self._sessions.stats(), self._unknown.stats()
+        return SessionCacheStats(
+            size=sessions.size,
+            negative_size=unknown.size,
+            hits=sessions.hits,
+            negative_hits=unknown.hits,
+            misses=unknown.misses,
+        )
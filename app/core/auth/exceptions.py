@@ -16,3 +16,6 @@ class IncorrectPassword(AuthServiceError):
 class UserAlreadyExists(AuthServiceError):
     msg_template = "User with login={login} or email={email} already exists."
 
+
+class PasswordHashingOverloaded(AuthServiceError):
+    msg_template = "Too many concurrent password checks ({in_flight}), try again later."
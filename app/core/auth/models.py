@@ -33,4 +33,18 @@ class UsersSession(Base):
     )
 
     def __repr__(self) -> str:
-        return f"UsersSession(id={self.id}, session_token={self.session_token}, user_id={self.user_id})"
\ No newline at end of file
+        return f"UsersSession(id={self.id}, session_token={self.session_token}, user_id={self.user_id})"
+
+
+class RevokedSession(Base):
+    """Отозванные при выходе сессии: по ним отклоняются подписанные токены."""
+    __tablename__ = "revoked_sessions"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    session_id: Mapped[int] = mapped_column(nullable=False)
+    revoked_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+        index=True
+    )
@@ -0,0 +1,59 @@
+"""
+Подбор стоимости bcrypt (rounds) под время хэширования на текущем хосте.
+
+Каждый шаг rounds удваивает время. Команда замеряет медиану хэширования для
+rounds от --min-rounds и вверх, пока время не превысит целевое, и рекомендует
+наибольшее значение, укладывающееся в --target-ms. Найденное значение
+задается в PASSWORD_BCRYPT_ROUNDS.
+
+    python -m app.core.auth.password.calibrate --target-ms 250
+"""
+import argparse
+import statistics
+import time
+
+from passlib.hash import bcrypt
+
+MIN_ROUNDS = 10
+MAX_ROUNDS = 16
+
+
+def measure_hash_ms(rounds: int, samples: int) -> float:
+    hasher = bcrypt.using(rounds=rounds)
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        hasher.hash("calibration-password")
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def recommend_rounds(target_ms: float, min_rounds: int, samples: int) -> tuple[int, list[tuple[int, float]]]:
+    timings: list[tuple[int, float]] = []
+    recommended = min_rounds
+    for rounds in range(min_rounds, MAX_ROUNDS + 1):
+        elapsed = measure_hash_ms(rounds, samples)
+        timings.append((rounds, elapsed))
+        if elapsed > target_ms:
+            break
+        recommended = rounds
+    return recommended, timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Подбор PASSWORD_BCRYPT_ROUNDS под целевое время хэширования")
+    parser.add_argument("--target-ms", type=float, default=250, help="Целевое время одного хэширования, ms")
+    parser.add_argument("--min-rounds", type=int, default=MIN_ROUNDS, help="Минимально допустимая стоимость")
+    parser.add_argument("--samples", type=int, default=5, help="Замеров на каждое значение rounds")
+    args = parser.parse_args()
+
+    recommended, timings = recommend_rounds(args.target_ms, args.min_rounds, args.samples)
+    for rounds, elapsed in timings:
+        print(f"rounds={rounds:<3} {elapsed:8.1f} ms")
+    if timings[0][1] > args.target_ms:
+        print(f"Даже rounds={args.min_rounds} дольше {args.target_ms:.0f} ms, ниже опускать стоимость не стоит.")
+    print(f"PASSWORD_BCRYPT_ROUNDS={recommended}")
+
+
+if __name__ == "__main__":
+    main()
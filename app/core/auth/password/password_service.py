@@ -1,14 +1,69 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
 from passlib.context import CryptContext
 
+from app.core.auth.exceptions import PasswordHashingOverloaded
+
+logger = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+DEFAULT_BCRYPT_ROUNDS = 12
+
 
 class PasswordService:
-    def __init__(self) -> None:
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    """
+    Хэширование и проверка паролей bcrypt.
+
+    bcrypt занимает сотни миллисекунд CPU и отпускает GIL, поэтому вычисления
+    выполняются в отдельном пуле из max_workers потоков, а не в цикле событий.
+    Одновременно в пуле и в очереди к нему может быть не больше
+    max_workers + max_queue задач, сверх этого запрос сразу отклоняется
+    с PasswordHashingOverloaded.
 
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+    Новые хэши считаются со стоимостью rounds; хэши с другой стоимостью
+    needs_rehash помечает для пересчета (см. calibrate.py для подбора rounds).
+    """
+
+    def __init__(self, rounds: int = DEFAULT_BCRYPT_ROUNDS, max_workers: int = 2, max_queue: int = 32) -> None:
+        self.rounds = rounds
+        self.pwd_context = CryptContext(
+            schemes=["bcrypt"],
+            deprecated="auto",
+            bcrypt__rounds=rounds,
+            bcrypt__min_rounds=rounds,
+            bcrypt__max_rounds=rounds,
+        )
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password")
+        self._in_flight = 0
+
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """Проверяет, соответствует ли обычный пароль хэшированному."""
-        return self.pwd_context.verify(plain_password, hashed_password)
+        return await self._run(self.pwd_context.verify, plain_password, hashed_password)
 
-    def get_password_hash(self, password: str) -> str:
+    async def get_password_hash(self, password: str) -> str:
         """Возвращает хэш для пароля."""
-        return self.pwd_context.hash(password)
+        return await self._run(self.pwd_context.hash, password)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """Хэш посчитан с другой стоимостью или устаревшей схемой. Проверка дешевая, без bcrypt."""
+        return self.pwd_context.needs_update(hashed_password)
+
+    async def _run(self, func: Callable[..., _T], *args: str) -> _T:
+        if self._in_flight >= self.max_workers + self.max_queue:
+            logger.warning(f"Пул хэширования паролей перегружен: {self._in_flight} задач в работе и в очереди")
+            raise PasswordHashingOverloaded(in_flight=self._in_flight)
+
+        self._in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self._in_flight -= 1
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,42 +1,119 @@
 from dataclasses import dataclass
+from typing import Callable
 
-from sqlalchemy import select
+from sqlalchemy import select, bindparam, update, func, insert
+from sqlalchemy.exc import IntegrityError
 
-from app.core.auth.models import UsersSession
+from app.core.auth.exceptions import UserAlreadyExists
+from app.core.auth.models import UsersSession, RevokedSession
 from app.core.mixins import BaseRepository
+from app.core.users.models import Users
+
+_SESSION_BY_TOKEN = select(UsersSession).where(UsersSession.session_token == bindparam("session_token"))
+_LATEST_SESSION_BY_USER_ID = select(
+    UsersSession
+).where(UsersSession.user_id == bindparam("user_id")).order_by(UsersSession.created_at.desc()).limit(1)
+
+_TOUCH_SESSION = update(UsersSession).where(
+    UsersSession.id == bindparam("session_id")
+).values(updated_at=func.now())
+_REVOKED_SESSIONS_AFTER_ID = select(RevokedSession.id, RevokedSession.session_id).where(
+    RevokedSession.id > bindparam("after_id")
+).order_by(RevokedSession.id)
+
+# Выдает токен по (user_id, session_id), когда id сессии уже известен после flush.
+IssueToken = Callable[[int, int], str]
 
 
 @dataclass
 class AuthRepository(BaseRepository):
-    async def delete_user_session_by_token(self, session_token: str) -> None:
-        query = select(UsersSession).where(UsersSession.session_token == session_token)
+    async def delete_user_session_by_token(self, session_token: str) -> int | None:
+        """Удаляет сессию и возвращает ее id, если она была."""
         async with self.db.session() as session:
-            result = await session.execute(query)
+            result = await session.execute(_SESSION_BY_TOKEN, {"session_token": session_token})
             user_session = result.scalars().first()
             if user_session:
                 await session.delete(user_session)
                 await session.commit()
+                return user_session.id
+            return None
+
+    async def revoke_session(self, session_id: int) -> None:
+        async with self.db.session() as session:
+            await session.execute(insert(RevokedSession).values(session_id=session_id))
+            await session.commit()
+
+    async def get_revoked_sessions(self, after_id: int) -> list[tuple[int, int]]:
+        """Возвращает пары (id записи, id сессии) для отзывов новее after_id."""
+        async with self.db.session() as session:
+            result = await session.execute(_REVOKED_SESSIONS_AFTER_ID, {"after_id": after_id})
+            return [(row.id, row.session_id) for row in result]
 
     async def get_users_session(self, user_id: int) -> UsersSession | None:
-        query = select(
-            UsersSession
-        ).where(UsersSession.user_id==user_id).order_by(UsersSession.created_at.desc()).limit(1)
         async with self.db.session() as session:
-            result = await session.execute(query)
+            result = await session.execute(_LATEST_SESSION_BY_USER_ID, {"user_id": user_id})
             return result.scalars().first()
 
-    async def save_user_session(self, user_id: int, session_token: str) -> UsersSession:
+    async def touch_user_session(self, session_id: int) -> None:
+        async with self.db.session() as session:
+            await session.execute(_TOUCH_SESSION, {"session_id": session_id})
+            await session.commit()
+
+    async def save_user_session(
+        self,
+        user_id: int,
+        session_token: str,
+        issue_token: IssueToken | None = None
+    ) -> UsersSession:
         new_session = UsersSession(user_id=user_id, session_token=session_token)
         async with self.db.session() as session:
             session.add(new_session)
+            if issue_token is not None:
+                await session.flush()
+                new_session.session_token = issue_token(user_id, new_session.id)
             await session.commit()
             await session.refresh(new_session)
             return new_session
 
     async def get_users_session_by_token(self, session_token: str) -> UsersSession | None:
-        query = select(
-            UsersSession
-        ).where(UsersSession.session_token == session_token)
         async with self.db.session() as session:
-            result = await session.execute(query)
-            return result.scalars().first()
\ No newline at end of file
+            result = await session.execute(_SESSION_BY_TOKEN, {"session_token": session_token})
+            return result.scalars().first()
+
+    async def register_user(
+        self,
+        login: str,
+        email: str,
+        first_name: str,
+        password: str,
+        session_token: str,
+        last_name: str | None = None,
+        issue_token: IssueToken | None = None,
+    ) -> tuple[Users, UsersSession]:
+        """
+        Создает пользователя и его сессию в одной транзакции.
+        Занятые логин или email определяются по уникальным индексам таблицы users.
+        """
+        new_user = Users(
+            login=login,
+            email=email,
+            first_name=first_name,
+            last_name=last_name,
+            password=password
+        )
+        async with self.db.session() as session:
+            session.add(new_user)
+            try:
+                await session.flush()
+            except IntegrityError as error:
+                raise UserAlreadyExists(login=login, email=email) from error
+
+            new_session = UsersSession(user_id=new_user.id, session_token=session_token)
+            session.add(new_session)
+            await session.flush()
+            if issue_token is not None:
+                new_session.session_token = issue_token(new_user.id, new_session.id)
+                await session.flush()
+            await session.refresh(new_user)
+            await session.commit()
+            return new_user, new_session
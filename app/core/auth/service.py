@@ -1,23 +1,42 @@
+import logging
 import uuid
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 
+from app.core.auth.cache import SessionTokenCache
 from app.core.auth.dto import UsersSessionDTO, UserRegistrationDTO
-from app.core.auth.exceptions import UserNotFound, IncorrectPassword, UserAlreadyExists
+from app.core.auth.exceptions import UserNotFound, IncorrectPassword, PasswordHashingOverloaded
 from app.core.auth.password.password_service import PasswordService
-from app.core.auth.repository import AuthRepository
+from app.core.auth.repository import AuthRepository, IssueToken
+from app.core.auth.tokens import SessionTokenSigner, SessionRevocationList
 from app.core.users.service import UserService
+from app.infra.cache import MISSING
 import asyncio
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class AuthService:
     auth_repository: AuthRepository
     user_service: UserService
     password_service: PasswordService
+    session_cache: SessionTokenCache
+    token_signer: SessionTokenSigner
+    revocation_list: SessionRevocationList
+    _background_tasks: set[asyncio.Task] = field(default_factory=set, init=False, repr=False)
 
 
-    async def logout_user(self, session_token: str) -> None:
+    async def logout_user(self, session_token: str, session_id: int) -> None:
+        """
+        Удаляет сессию. Подписанный токен отзывается по session_id из уже проверенного
+        токена: строку сессии к этому моменту могла удалить очистка БД, а токен еще действует.
+        """
         await self.auth_repository.delete_user_session_by_token(session_token=session_token)
+        if self.token_signer.enabled and self.token_signer.is_signed(session_token):
+            self.revocation_list.add(session_id)
+            await self.auth_repository.revoke_session(session_id=session_id)
+        await self.session_cache.invalidate(session_token=session_token)
 
 
     async def authenticate_user(self, login: str, password: str) -> UsersSessionDTO:
@@ -26,34 +45,91 @@ class AuthService:
         if user_dto is None:
             raise UserNotFound(login=login)
 
-        if not self.password_service.verify_password(
+        if not await self.password_service.verify_password(
             plain_password=password, hashed_password=user_dto.password
         ):
             raise IncorrectPassword(login=login)
 
+        if self.password_service.needs_rehash(user_dto.password):
+            task = asyncio.create_task(self._rehash_password(user_id=user_dto.id, password=password))
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+
         return await self.get_or_create_user_session(user_id=user_dto.id)
 
+    async def _rehash_password(self, user_id: int, password: str) -> None:
+        """Пересчитывает хэш пароля с текущей стоимостью bcrypt после успешного входа."""
+        try:
+            hashed_password = await self.password_service.get_password_hash(password=password)
+            await self.user_service.update_password_hash(user_id=user_id, hashed_password=hashed_password)
+        except PasswordHashingOverloaded:
+            logger.info(f"Пересчет хэша пароля пользователя {user_id} отложен: пул хэширования занят")
+        except Exception as e:
+            logger.error(f"Ошибка пересчета хэша пароля пользователя {user_id}: {e}")
+
 
     async def get_user_session_by_token(self, session_token: str) -> UsersSessionDTO | None:
+        if self.token_signer.is_signed(session_token):
+            return self._verify_signed_token(session_token)
+
+        cached_session = self.session_cache.get(session_token)
+        if cached_session is not MISSING:
+            return cached_session
+
+        generation = self.session_cache.generation
         session = await self.auth_repository.get_users_session_by_token(session_token=session_token)
-        if session is None:
-            return None
-        return UsersSessionDTO(
+        user_session = None if session is None else UsersSessionDTO(
             id=session.id,
             user_id=session.user_id,
             session_token=session.session_token,
             created_at=session.created_at.__str__(),
             updated_at=session.updated_at.__str__()
         )
+        self.session_cache.set(session_token, user_session, generation=generation)
+        return user_session
+
+
+    def _verify_signed_token(self, session_token: str) -> UsersSessionDTO | None:
+        """Проверка подписанного токена без обращения к БД."""
+        claims = self.token_signer.verify(session_token)
+        if claims is None or claims.session_id in self.revocation_list:
+            return None
+        issued_at = datetime.fromtimestamp(claims.issued_at, tz=timezone.utc).__str__()
+        return UsersSessionDTO(
+            id=claims.session_id,
+            user_id=claims.user_id,
+            session_token=session_token,
+            created_at=issued_at,
+            updated_at=issued_at
+        )
 
+    @property
+    def _issue_token(self) -> IssueToken | None:
+        return self.token_signer.sign if self.token_signer.enabled else None
 
     async def get_or_create_user_session(self, user_id: int) -> UsersSessionDTO:
+        if self.token_signer.enabled:
+            # Подписанный токен содержит время выдачи, поэтому на каждый вход выдается новая сессия.
+            session = await self.auth_repository.save_user_session(
+                user_id=user_id, session_token=str(uuid.uuid4()), issue_token=self._issue_token
+            )
+            return UsersSessionDTO(
+                id=session.id,
+                user_id=session.user_id,
+                session_token=session.session_token,
+                created_at=session.created_at.__str__(),
+                updated_at=session.updated_at.__str__()
+            )
+
         session = await self.auth_repository.get_users_session(user_id=user_id)
         if session is None:
             UUID = uuid.uuid4()
             session = await self.auth_repository.save_user_session(
                 user_id=user_id, session_token=str(UUID)
             )
+        else:
+            # Продлеваем сессию, чтобы очистка не удалила ее раньше выданной cookie.
+            await self.auth_repository.touch_user_session(session_id=session.id)
         return UsersSessionDTO(
             id=session.id,
             user_id=session.user_id,
@@ -70,21 +146,18 @@ class AuthService:
         email: str,
         last_name: str | None = None,
     ) -> UserRegistrationDTO:
-        if await self._is_user_exist_by_login_or_email(login=login, email=email):
-            raise UserAlreadyExists(login=login, email=email)
-
-        hashed_password = self.password_service.get_password_hash(password=password)
+        hashed_password = await self.password_service.get_password_hash(password=password)
 
-        new_user = await self.user_service.create_user(
+        new_user, session = await self.auth_repository.register_user(
             login=login,
-            hashed_password=hashed_password,
+            email=email,
             first_name=first_name,
             last_name=last_name,
-            email=email,
+            password=hashed_password,
+            session_token=str(uuid.uuid4()),
+            issue_token=self._issue_token,
         )
 
-        session = await self.get_or_create_user_session(user_id=new_user.id)
-
         return UserRegistrationDTO(
             id=new_user.id,
             login=new_user.login,
@@ -97,14 +170,6 @@ class AuthService:
         )
 
 
-    async def _is_user_exist_by_login_or_email(self, login: str, email: str) -> bool:
-        user_by_login, user_by_email = await asyncio.gather(
-            self.user_service.get_user_by_login(login=login),
-            self.user_service.get_user_by_email(email=email),
-        )
-        return bool(user_by_login or user_by_email)
-
-
 
 
 
@@ -0,0 +1,133 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import logging
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+SIGNED_TOKEN_PREFIX = "stt1"
+
+
+@dataclass(frozen=True)
+class SessionClaims:
+    user_id: int
+    session_id: int
+    issued_at: int
+
+
+class SessionTokenSigner:
+    """
+    Подписанные токены сессий вида stt1.<user_id>.<session_id>.<issued_at>.<hmac>.
+
+    Проверка такого токена не обращается к БД: достаточно HMAC-SHA256 и срока
+    жизни max_age. Без secret_key подпись выключена, и выдаются прежние UUID-токены.
+    """
+
+    def __init__(self, secret_key: str | None, max_age: int) -> None:
+        self._key = secret_key.encode() if secret_key else None
+        self.max_age = max_age
+
+    @property
+    def enabled(self) -> bool:
+        return self._key is not None
+
+    @staticmethod
+    def is_signed(token: str) -> bool:
+        return token.startswith(SIGNED_TOKEN_PREFIX + ".")
+
+    def sign(self, user_id: int, session_id: int, issued_at: int | None = None) -> str:
+        issued_at = int(time.time()) if issued_at is None else issued_at
+        payload = f"{SIGNED_TOKEN_PREFIX}.{user_id}.{session_id}.{issued_at}"
+        return f"{payload}.{self._signature(payload)}"
+
+    def verify(self, token: str) -> SessionClaims | None:
+        """Возвращает данные токена или None, если подпись неверна или срок истек."""
+        if self._key is None:
+            return None
+        payload, _, signature = token.rpartition(".")
+        # compare_digest не принимает str с не-ASCII символами, а токен приходит от клиента.
+        if not hmac.compare_digest(signature.encode(errors="ignore"), self._signature(payload).encode()):
+            return None
+        try:
+            _, user_id, session_id, issued_at = payload.split(".")
+            claims = SessionClaims(user_id=int(user_id), session_id=int(session_id), issued_at=int(issued_at))
+        except ValueError:
+            return None
+        if claims.issued_at + self.max_age < time.time():
+            return None
+        return claims
+
+    def _signature(self, payload: str) -> str:
+        digest = hmac.new(self._key, payload.encode(), hashlib.sha256).digest()
+        return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+class SessionRevocationList:
+    """
+    Множество id отозванных сессий для проверки подписанных токенов.
+
+    Выход на этом воркере добавляет id сразу, отзывы с других воркеров
+    подтягиваются из таблицы revoked_sessions раз в refresh_interval секунд.
+    Через max_age после отзыва токены сессии истекают сами, и id забывается;
+    строки таблицы старше этого срока удаляет периодическая очистка БД.
+    """
+
+    def __init__(
+        self,
+        fetch_revoked: Callable[[int], Awaitable[list[tuple[int, int]]]],
+        refresh_interval: float,
+        max_age: int
+    ) -> None:
+        self._fetch_revoked = fetch_revoked
+        self.refresh_interval = refresh_interval
+        self.max_age = max_age
+        self._session_ids: dict[int, float] = {}
+        self._last_id = 0
+        self._task: asyncio.Task | None = None
+
+    def __contains__(self, session_id: int) -> bool:
+        return session_id in self._session_ids
+
+    def __len__(self) -> int:
+        return len(self._session_ids)
+
+    def add(self, session_id: int) -> None:
+        self._session_ids.setdefault(session_id, time.time())
+
+    async def refresh(self) -> int:
+        rows = await self._fetch_revoked(self._last_id)
+        for row_id, session_id in rows:
+            self.add(session_id)
+            self._last_id = max(self._last_id, row_id)
+
+        expired_before = time.time() - self.max_age
+        for session_id in [sid for sid, revoked_at in self._session_ids.items() if revoked_at < expired_before]:
+            del self._session_ids[session_id]
+        return len(rows)
+
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Ошибка обновления списка отозванных сессий: {e}")
+            await asyncio.sleep(self.refresh_interval)
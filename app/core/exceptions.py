@@ -18,3 +18,7 @@ def _prepare_message_args(arguments: dict[str, Any]) -> dict[str, Any]:
         if isinstance(arguments[key], Enum):
             arguments[key] = arguments[key].value
     return arguments
+
+
+class InvalidCursor(SpendTimeTogetherCoreException):
+    msg_template = "Invalid pagination cursor={cursor}."
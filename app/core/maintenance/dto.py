@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class JanitorReportDTO:
+    expired_invites: int = 0
+    stale_sessions: int = 0
+    orphaned_user_activity: int = 0
+    archived_activities: int = 0
+    cache_invalidations: int = 0
+    revoked_sessions: int = 0
+    unused_avatars: int = 0
+    duration_ms: float = 0.0
@@ -0,0 +1,163 @@
+from dataclasses import dataclass
+
+from sqlalchemy import select, delete, insert, update, or_, tuple_, literal, Select, ColumnElement, DateTime
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+from app.core.activity.constants import ActivityStatuses
+from app.core.activity.models import Activity, UserActivity, UserActivityVariants, GameStore, GamePlatform, \
+    ActivityArchive, UserActivityVariantsArchive, GameStoreArchive, GamePlatformArchive
+from app.core.activity.repository import FINAL_STATUSES
+from app.core.auth.models import UsersSession, RevokedSession
+from app.core.mixins import BaseRepository
+from app.core.rooms.models import RoomInvites
+from app.core.users.models import Users
+from app.infra.adapters.invalidation import CacheInvalidation
+
+
+class _SecondsAgo(FunctionElement):
+    """
+    Момент seconds секунд назад по часам БД. Метки времени пишутся через
+    func.now() на стороне БД, поэтому и границу считает БД, а не часы воркера:
+    драйвер MySQL при передаче datetime отбрасывает часовой пояс.
+    """
+    type = DateTime()
+    name = "seconds_ago"
+    inherit_cache = True
+
+
+@compiles(_SecondsAgo)
+def _compile_seconds_ago(element, compiler, **kw):
+    return f"DATE_SUB(NOW(), INTERVAL {compiler.process(element.clauses, **kw)} SECOND)"
+
+
+@compiles(_SecondsAgo, "sqlite")
+def _compile_seconds_ago_sqlite(element, compiler, **kw):
+    return f"datetime('now', '-' || {compiler.process(element.clauses, **kw)} || ' seconds')"
+
+
+def _older_than(column: ColumnElement, seconds: int) -> ColumnElement:
+    return column < _SecondsAgo(literal(int(seconds)))
+
+
+def _copy_to_archive(model, archive_model, where: ColumnElement):
+    columns = [column.name for column in archive_model.__table__.columns]
+    return insert(archive_model).from_select(
+        columns, select(*(getattr(model, column) for column in columns)).where(where)
+    )
+
+
+@dataclass
+class MaintenanceRepository(BaseRepository):
+    """
+    Удаление устаревших строк небольшими пачками: сначала выбираются ключи
+    (не больше limit), затем удаляются по ним, чтобы каждая транзакция
+    держала блокировки только на одну пачку.
+    """
+
+    async def delete_expired_invites(self, limit: int) -> int:
+        ids_query = select(RoomInvites.id).where(_older_than(RoomInvites.expires_at, 0)).limit(limit)
+        return await self._delete_batch(ids_query, lambda ids: delete(RoomInvites).where(RoomInvites.id.in_(ids)))
+
+    async def delete_stale_sessions(self, max_age_seconds: int, limit: int) -> int:
+        """Сессии, которые не обновлялись дольше срока жизни cookie."""
+        ids_query = select(UsersSession.id).where(
+            _older_than(UsersSession.updated_at, max_age_seconds)
+        ).limit(limit)
+        return await self._delete_batch(ids_query, lambda ids: delete(UsersSession).where(UsersSession.id.in_(ids)))
+
+    async def delete_orphaned_user_activity(self, max_age_seconds: int, limit: int) -> int:
+        """
+        Записи присутствия в завершенных активностях и записи, которые не обновлялись
+        дольше max_age_seconds: их оставляют воркеры, упавшие до уменьшения счетчика
+        подключений. Живые подключения обновляют last_seen_at чаще этого срока.
+        """
+        keys_query = select(UserActivity.user_id, UserActivity.activity_id).join(
+            Activity, Activity.id == UserActivity.activity_id
+        ).where(
+            or_(
+                Activity.status.in_([ActivityStatuses.FINISHED, ActivityStatuses.CANCELLED]),
+                _older_than(UserActivity.last_seen_at, max_age_seconds),
+            )
+        ).limit(limit)
+        return await self._delete_batch(
+            keys_query,
+            lambda keys: delete(UserActivity).where(
+                tuple_(UserActivity.user_id, UserActivity.activity_id).in_(keys)
+            )
+        )
+
+    async def delete_old_cache_invalidations(self, max_age_seconds: int, limit: int) -> int:
+        ids_query = select(CacheInvalidation.id).where(
+            _older_than(CacheInvalidation.created_at, max_age_seconds)
+        ).limit(limit)
+        return await self._delete_batch(
+            ids_query, lambda ids: delete(CacheInvalidation).where(CacheInvalidation.id.in_(ids))
+        )
+
+    async def delete_old_revoked_sessions(self, max_age_seconds: int, limit: int) -> int:
+        """Отзывы старше срока жизни токена: такие токены уже отклоняются по истечению срока."""
+        ids_query = select(RevokedSession.id).where(
+            _older_than(RevokedSession.revoked_at, max_age_seconds)
+        ).limit(limit)
+        return await self._delete_batch(
+            ids_query, lambda ids: delete(RevokedSession).where(RevokedSession.id.in_(ids))
+        )
+
+    async def get_avatar_urls_in_use(self, avatar_urls: list[str]) -> set[str]:
+        """Какие из avatar_urls записаны у пользователей. Читается с основной БД: реплика может отставать."""
+        async with self.db.session() as session:
+            result = await session.execute(
+                select(Users.avatar_url).where(Users.avatar_url.in_(avatar_urls)).distinct()
+            )
+            return set(result.scalars().all())
+
+    async def archive_finished_activities(self, older_than_seconds: int, limit: int) -> int:
+        """
+        Переносит до limit активностей, завершенных раньше older_than_seconds назад,
+        вместе с вариантами, магазинами и платформами в архивные таблицы.
+        Копирование и удаление пачки выполняются в одной транзакции.
+        """
+        ids_query = select(Activity.id).where(
+            Activity.status.in_(FINAL_STATUSES),
+            _older_than(Activity.finished_at, older_than_seconds),
+        ).order_by(Activity.id).limit(limit)
+
+        async with self.db.session() as session:
+            activity_ids = list((await session.execute(ids_query)).scalars().all())
+            if not activity_ids:
+                return 0
+            variant_ids = list((await session.execute(
+                select(UserActivityVariants.id).where(UserActivityVariants.activity_id.in_(activity_ids))
+            )).scalars().all())
+
+            await session.execute(_copy_to_archive(Activity, ActivityArchive, Activity.id.in_(activity_ids)))
+            await session.execute(_copy_to_archive(
+                UserActivityVariants, UserActivityVariantsArchive, UserActivityVariants.id.in_(variant_ids)
+            ))
+            await session.execute(_copy_to_archive(GameStore, GameStoreArchive, GameStore.variant_id.in_(variant_ids)))
+            await session.execute(_copy_to_archive(
+                GamePlatform, GamePlatformArchive, GamePlatform.variant_id.in_(variant_ids)
+            ))
+
+            # activity.winner_variant_id ссылается на варианты, поэтому сначала снимаем ссылку.
+            await session.execute(
+                update(Activity).where(Activity.id.in_(activity_ids)).values(winner_variant_id=None)
+            )
+            await session.execute(delete(GameStore).where(GameStore.variant_id.in_(variant_ids)))
+            await session.execute(delete(GamePlatform).where(GamePlatform.variant_id.in_(variant_ids)))
+            await session.execute(delete(UserActivityVariants).where(UserActivityVariants.id.in_(variant_ids)))
+            await session.execute(delete(UserActivity).where(UserActivity.activity_id.in_(activity_ids)))
+            await session.execute(delete(Activity).where(Activity.id.in_(activity_ids)))
+            await session.commit()
+            return len(activity_ids)
+
+    async def _delete_batch(self, keys_query: Select, build_delete) -> int:
+        async with self.db.session() as session:
+            result = await session.execute(keys_query)
+            keys = [tuple(row) if len(row) > 1 else row[0] for row in result]
+            if not keys:
+                return 0
+            result = await session.execute(build_delete(keys))
+            await session.commit()
+            return result.rowcount
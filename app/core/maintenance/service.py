@@ -0,0 +1,148 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+from app.core.maintenance.dto import JanitorReportDTO
+from app.core.maintenance.repository import MaintenanceRepository
+from app.core.users.avatars import AvatarProcessor
+from app.infra.versions import ResourceVersions, ACTIVITY_ARCHIVE_KEY
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class JanitorService:
+    """
+    Периодическая очистка таблиц, которые иначе растут без ограничений:
+    просроченные приглашения, устаревшие сессии и брошенные записи присутствия.
+    Завершенные активности старше archive_after_seconds переносятся в архив
+    пачками по archive_batch_size активностей. Файлы аватаров, на которые
+    никто не ссылается и которые не использовались дольше avatar_grace_seconds,
+    удаляются.
+
+    Удаление идет пачками по batch_size строк с паузой batch_pause между ними
+    и не больше max_batches_per_run пачек на таблицу за один проход.
+    """
+    maintenance_repository: MaintenanceRepository
+    resource_versions: ResourceVersions | None = None
+    batch_size: int = 500
+    batch_pause: float = 0.5
+    max_batches_per_run: int = 100
+    session_max_age_seconds: int = 2592000
+    presence_max_age_seconds: int = 86400
+    archive_after_seconds: int = 2592000
+    archive_batch_size: int = 50
+    invalidation_retention_seconds: int = 3600
+    avatar_processor: AvatarProcessor | None = None
+    avatar_grace_seconds: int = 3600
+    last_report: JanitorReportDTO | None = field(default=None, init=False)
+    _task: asyncio.Task | None = field(default=None, init=False, repr=False)
+
+    async def run_once(self) -> JanitorReportDTO:
+        started = time.perf_counter()
+        repository = self.maintenance_repository
+        report = JanitorReportDTO(
+            expired_invites=await self._purge(
+                lambda limit: repository.delete_expired_invites(limit=limit)
+            ),
+            stale_sessions=await self._purge(
+                lambda limit: repository.delete_stale_sessions(
+                    max_age_seconds=self.session_max_age_seconds, limit=limit
+                )
+            ),
+            orphaned_user_activity=await self._purge(
+                lambda limit: repository.delete_orphaned_user_activity(
+                    max_age_seconds=self.presence_max_age_seconds, limit=limit
+                )
+            ),
+            archived_activities=await self._purge(
+                lambda limit: repository.archive_finished_activities(
+                    older_than_seconds=self.archive_after_seconds, limit=limit
+                ),
+                batch_size=self.archive_batch_size
+            ),
+            cache_invalidations=await self._purge(
+                lambda limit: repository.delete_old_cache_invalidations(
+                    max_age_seconds=self.invalidation_retention_seconds, limit=limit
+                )
+            ),
+            revoked_sessions=await self._purge(
+                lambda limit: repository.delete_old_revoked_sessions(
+                    max_age_seconds=self.session_max_age_seconds, limit=limit
+                )
+            ),
+            unused_avatars=await self._delete_unused_avatars(),
+        )
+        if report.archived_activities and self.resource_versions is not None:
+            # Перенос в архив меняет и текущие списки активностей комнат, и историю.
+            await self.resource_versions.bump(ACTIVITY_ARCHIVE_KEY)
+        report.duration_ms = (time.perf_counter() - started) * 1000
+        self.last_report = report
+        logger.info(
+            f"Очистка БД: приглашений {report.expired_invites}, сессий {report.stale_sessions}, "
+            f"записей присутствия {report.orphaned_user_activity}, "
+            f"событий инвалидации {report.cache_invalidations}, отзывов сессий {report.revoked_sessions}, "
+            f"неиспользуемых аватаров {report.unused_avatars}, "
+            f"в архив перенесено активностей {report.archived_activities} за {report.duration_ms:.0f} ms"
+        )
+        return report
+
+    async def _delete_unused_avatars(self) -> int:
+        """
+        Удаляет аватары без ссылок пачками по batch_size. Перед удалением время
+        изменения файлов проверяется еще раз: если загрузка того же изображения
+        успела их использовать, файлы остаются.
+        """
+        if self.avatar_processor is None:
+            return 0
+        candidates = await self.avatar_processor.find_stale_avatars(min_age_seconds=self.avatar_grace_seconds)
+        removed = 0
+        for start in range(0, len(candidates), self.batch_size):
+            batch = candidates[start:start + self.batch_size]
+            in_use = await self.maintenance_repository.get_avatar_urls_in_use(batch)
+            for avatar_url in batch:
+                if avatar_url not in in_use and await self.avatar_processor.delete_avatar(
+                    avatar_url, min_age_seconds=self.avatar_grace_seconds
+                ):
+                    removed += 1
+        return removed
+
+    async def _purge(
+        self,
+        delete_batch: Callable[[int], Awaitable[int]],
+        batch_size: int | None = None
+    ) -> int:
+        batch_size = batch_size or self.batch_size
+        removed = 0
+        for _ in range(self.max_batches_per_run):
+            deleted = await delete_batch(batch_size)
+            removed += deleted
+            if deleted < batch_size:
+                break
+            await asyncio.sleep(self.batch_pause)
+        return removed
+
+    def start(self, interval: float) -> None:
+        if self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run(interval))
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self, interval: float) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Ошибка очистки БД: {e}")
+            await asyncio.sleep(interval)
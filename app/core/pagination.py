@@ -0,0 +1,55 @@
+import base64
+import binascii
+from dataclasses import dataclass, field
+from operator import attrgetter
+from typing import Callable, Generic, Sequence, TypeVar
+
+import orjson
+
+from app.core.exceptions import InvalidCursor
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+_Item = TypeVar("_Item")
+_Row = TypeVar("_Row")
+
+
+@dataclass
+class PageDTO(Generic[_Item]):
+    items: list[_Item] = field(default_factory=list)
+    next_cursor: str | None = None
+
+
+def encode_cursor(last_id: int) -> str:
+    """Кодирует ключ последней записи страницы в непрозрачный курсор."""
+    return base64.urlsafe_b64encode(orjson.dumps({"id": last_id})).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str | None) -> int | None:
+    """Возвращает ключ, после которого начинается следующая страница."""
+    if not cursor:
+        return None
+    try:
+        payload = orjson.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        last_id = payload["id"]
+    except (binascii.Error, ValueError, TypeError, KeyError) as error:
+        raise InvalidCursor(cursor=cursor) from error
+    if not isinstance(last_id, int):
+        raise InvalidCursor(cursor=cursor)
+    return last_id
+
+
+def build_page(
+    rows: Sequence[_Row],
+    limit: int,
+    key: Callable[[_Row], int] = attrgetter("id"),
+) -> tuple[list[_Row], str | None]:
+    """
+    Отрезает лишнюю строку, выбранную запросом с limit + 1, и строит курсор
+    по ключу последней строки страницы.
+    """
+    items = list(rows[:limit])
+    if len(rows) <= limit:
+        return items, None
+    return items, encode_cursor(key(items[-1]))
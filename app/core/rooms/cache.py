@@ -0,0 +1,38 @@
+from app.infra.adapters.invalidation import InvalidationBus
+from app.infra.cache import MISSING, CacheStats, TTLCache
+
+ROOM_MEMBERSHIP_CHANNEL = "room_membership"
+
+
+class RoomMembershipCache:
+    """
+    Кэш членства пользователя в комнате по ключу (room_id, user_id).
+    Хранит и положительные, и отрицательные ответы; сбрасывается при вступлении
+    и выходе из комнаты, в том числе по событиям от других воркеров.
+    """
+
+    def __init__(self, invalidation_bus: InvalidationBus, maxsize: int, ttl: float) -> None:
+        self.invalidation_bus = invalidation_bus
+        self._cache: TTLCache[tuple[int, int], bool] = TTLCache(maxsize=maxsize, ttl=ttl)
+        invalidation_bus.subscribe(ROOM_MEMBERSHIP_CHANNEL, self._on_invalidation)
+
+    @property
+    def generation(self) -> int:
+        return self._cache.generation
+
+    def get(self, room_id: int, user_id: int) -> bool | None:
+        is_member = self._cache.get((room_id, user_id))
+        return None if is_member is MISSING else is_member
+
+    def set(self, room_id: int, user_id: int, is_member: bool, generation: int) -> None:
+        self._cache.set((room_id, user_id), is_member, generation=generation)
+
+    async def invalidate(self, room_id: int, user_id: int) -> None:
+        await self.invalidation_bus.publish(ROOM_MEMBERSHIP_CHANNEL, f"{room_id}:{user_id}")
+
+    def _on_invalidation(self, key: str) -> None:
+        room_id, user_id = key.split(":")
+        self._cache.pop((int(room_id), int(user_id)))
+
+    def stats(self) -> CacheStats:
+        return self._cache.stats()
@@ -5,8 +5,8 @@ from dataclasses import dataclass
 class RoomDTO:
     id: int
     name: str
-    created_at: str
     description: str | None = None
+    created_at: str
 
 
 @dataclass(kw_only=True)
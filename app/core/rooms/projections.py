@@ -0,0 +1,17 @@
+from sqlalchemy import Row, Select, select
+
+from app.core.rooms.dto import RoomDTO
+from app.core.rooms.models import Rooms
+
+
+def select_room_dto() -> Select:
+    return select(Rooms.id, Rooms.name, Rooms.description, Rooms.created_at)
+
+
+def to_room_dto(row: Row) -> RoomDTO:
+    return RoomDTO(
+        id=row.id,
+        name=row.name,
+        description=row.description,
+        created_at=row.created_at.isoformat(),
+    )
@@ -1,10 +1,28 @@
 from dataclasses import dataclass
 
-from sqlalchemy import select, func, text
+from sqlalchemy import select, func, text, bindparam, exists
 
 from app.core.mixins import BaseRepository
 from app.core.rooms.constants import INVITE_CODE_EXPIRED_PERIOD
+from app.core.rooms.dto import RoomDTO
 from app.core.rooms.models import Rooms, UsersRooms, RoomInvites
+from app.core.rooms.projections import select_room_dto, to_room_dto
+
+_ROOM_BY_ID = select(Rooms).where(Rooms.id == bindparam("room_id"))
+_IS_USER_IN_ROOM = select(UsersRooms.user_id).where(
+    UsersRooms.user_id == bindparam("user_id"),
+    UsersRooms.room_id == bindparam("room_id")
+).limit(1)
+_ROOM_MEMBERSHIP = select(
+    Rooms.id,
+    exists().where(
+        UsersRooms.room_id == Rooms.id,
+        UsersRooms.user_id == bindparam("user_id")
+    ).label("is_member")
+).where(Rooms.id == bindparam("room_id"))
+_ACTIVE_INVITE_BY_CODE = select(RoomInvites).where(
+    RoomInvites.invite_code == bindparam("invite_code"), RoomInvites.expires_at > func.now()
+)
 
 
 @dataclass
@@ -21,13 +39,23 @@ class RoomRepository(BaseRepository):
                 await session.delete(user_room)
                 await session.commit()
 
-    async def get_rooms_by_user_id(self, user_id: int) -> list[Rooms]:
-        query = select(Rooms).join(UsersRooms, UsersRooms.room_id == Rooms.id).where(
+    async def get_rooms_by_user_id(
+        self,
+        user_id: int,
+        limit: int,
+        after_id: int | None = None
+    ) -> list[RoomDTO]:
+        query = select_room_dto().join(UsersRooms, UsersRooms.room_id == Rooms.id).where(
             UsersRooms.user_id == user_id
         )
+        if after_id is not None:
+            query = query.where(UsersRooms.room_id > after_id)
+        query = query.order_by(UsersRooms.room_id).limit(limit)
+        # Список отдается с ETag и попадает в кэш ответов, поэтому читается с основной БД:
+        # отстающая реплика отдала бы старый список под уже новой версией.
         async with self.db.session() as session:
             result = await session.execute(query)
-            return result.scalars().all()
+            return [to_room_dto(row) for row in result]
 
     async def create_room(
         self,
@@ -46,9 +74,8 @@ class RoomRepository(BaseRepository):
             return room
 
     async def get_room_by_id(self, room_id: int) -> Rooms | None:
-        query = select(Rooms).where(Rooms.id == room_id)
         async with self.db.session() as session:
-            result = await session.execute(query)
+            result = await session.execute(_ROOM_BY_ID, {"room_id": room_id})
             room = result.scalars().first()
             return room if room is not None else None
 
@@ -58,13 +85,16 @@ class RoomRepository(BaseRepository):
         user_id: int,
         room_id: int
     ) -> bool:
-        query = select(UsersRooms).where(
-            UsersRooms.user_id == user_id,
-            UsersRooms.room_id == room_id
-        )
         async with self.db.session() as session:
-            result = await session.execute(query)
-            return result.scalars().first() is not None
+            result = await session.execute(_IS_USER_IN_ROOM, {"user_id": user_id, "room_id": room_id})
+            return result.first() is not None
+
+    async def get_room_membership(self, room_id: int, user_id: int) -> bool | None:
+        """Возвращает None, если комнаты нет, иначе признак членства пользователя в ней."""
+        async with self.db.session() as session:
+            result = await session.execute(_ROOM_MEMBERSHIP, {"room_id": room_id, "user_id": user_id})
+            row = result.first()
+            return bool(row.is_member) if row is not None else None
 
     async def create_invite_code(
         self,
@@ -91,11 +121,8 @@ class RoomRepository(BaseRepository):
         self,
         invite_code: str
     ) -> RoomInvites | None:
-        query = select(RoomInvites).where(
-            RoomInvites.invite_code == invite_code, RoomInvites.expires_at > func.now()
-        )
         async with self.db.session() as session:
-            result = await session.execute(query)
+            result = await session.execute(_ACTIVE_INVITE_BY_CODE, {"invite_code": invite_code})
             return result.scalars().first()
 
     async def add_user_to_room(
@@ -111,9 +138,14 @@ class RoomRepository(BaseRepository):
 
     async def get_users_by_room_id(
         self,
-        room_id: int
+        room_id: int,
+        limit: int,
+        after_id: int | None = None
     ) -> list[int]:
         query = select(UsersRooms.user_id).where(UsersRooms.room_id == room_id)
+        if after_id is not None:
+            query = query.where(UsersRooms.user_id > after_id)
+        query = query.order_by(UsersRooms.user_id).limit(limit)
         async with self.db.session() as session:
             result = await session.execute(query)
             return list(result.scalars().all())
@@ -2,9 +2,12 @@ import secrets
 import string
 from dataclasses import dataclass
 
+from app.core.pagination import DEFAULT_PAGE_SIZE, PageDTO, build_page, decode_cursor
+from app.core.rooms.cache import RoomMembershipCache
 from app.core.rooms.dto import RoomDTO, InviteCodeDTO
 from app.core.rooms.exceptions import RoomNotFound, UserNotInRoom, RoomNotFoundByInviteCode, UserAlreadyInRoom
 from app.core.rooms.repository import RoomRepository
+from app.infra.versions import ResourceVersions, user_rooms_key, room_members_key
 
 
 def _generate_invite_code(length: int = 8) -> str:
@@ -15,21 +18,31 @@ def _generate_invite_code(length: int = 8) -> str:
 @dataclass
 class RoomService:
     room_repository: RoomRepository
+    membership_cache: RoomMembershipCache
+    resource_versions: ResourceVersions
 
     async def exit_room(self, user_id: int, room_id: int) -> None:
         await self.validate_users_room(user_id=user_id, room_id=room_id)
         await self.room_repository.remove_user_from_room(room_id=room_id, user_id=user_id)
+        await self._membership_changed(room_id=room_id, user_id=user_id)
 
-    async def get_rooms_by_user_id(self, user_id: int) -> list[RoomDTO]:
-        room_models = await self.room_repository.get_rooms_by_user_id(user_id=user_id)
-        return [
-            RoomDTO(
-                id=room.id,
-                name=room.name,
-                description=room.description,
-                created_at=room.created_at.isoformat(),
-            ) for room in room_models
-        ]
+    async def _membership_changed(self, room_id: int, user_id: int) -> None:
+        await self.membership_cache.invalidate(room_id=room_id, user_id=user_id)
+        await self.resource_versions.bump(user_rooms_key(user_id), room_members_key(room_id))
+
+    async def get_rooms_by_user_id(
+        self,
+        user_id: int,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None
+    ) -> PageDTO[RoomDTO]:
+        rooms = await self.room_repository.get_rooms_by_user_id(
+            user_id=user_id,
+            limit=limit + 1,
+            after_id=decode_cursor(cursor)
+        )
+        rooms, next_cursor = build_page(rooms, limit)
+        return PageDTO(items=rooms, next_cursor=next_cursor)
 
     async def create_room(
         self,
@@ -42,6 +55,7 @@ class RoomService:
             name=name,
             description=description
         )
+        await self._membership_changed(room_id=room_model.id, user_id=user_id)
         return RoomDTO(
             id=room_model.id,
             name=room_model.name,
@@ -99,6 +113,7 @@ class RoomService:
             raise UserAlreadyInRoom(room_id=room_invite.room_id, user_id=user_id)
 
         await self.room_repository.add_user_to_room(room_id=room_invite.room_id, user_id=user_id)
+        await self._membership_changed(room_id=room_invite.room_id, user_id=user_id)
 
         return RoomDTO(
             id=room_model.id,
@@ -112,23 +127,34 @@ class RoomService:
         room_id: int,
         user_id: int
     ) -> None:
-        if not await self.get_room_by_id(room_id=room_id):
-            raise RoomNotFound(id=room_id)
-
-        if not await self.room_repository.is_user_in_room(
-            room_id=room_id,
-            user_id=user_id
-        ):
+        is_member = self.membership_cache.get(room_id=room_id, user_id=user_id)
+        if is_member is None:
+            generation = self.membership_cache.generation
+            is_member = await self.room_repository.get_room_membership(room_id=room_id, user_id=user_id)
+            if is_member is None:
+                raise RoomNotFound(room_id=room_id)
+            self.membership_cache.set(room_id=room_id, user_id=user_id, is_member=is_member, generation=generation)
+
+        if not is_member:
             raise UserNotInRoom(room_id=room_id, user_id=user_id)
 
 
     async def get_users_in_room(
         self,
         room_id: int,
-        user_id: int
-    ) -> list[int]:
+        user_id: int,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None
+    ) -> PageDTO[int]:
+        after_id = decode_cursor(cursor)
         await self.validate_users_room(room_id=room_id, user_id=user_id)
-        return await self.room_repository.get_users_by_room_id(room_id=room_id)
+        user_ids = await self.room_repository.get_users_by_room_id(
+            room_id=room_id,
+            limit=limit + 1,
+            after_id=after_id
+        )
+        user_ids, next_cursor = build_page(user_ids, limit, key=int)
+        return PageDTO(items=user_ids, next_cursor=next_cursor)
 
 
 
@@ -0,0 +1,296 @@
+import asyncio
+import hashlib
+import io
+import logging
+import multiprocessing
+import os
+import re
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image
+from fastapi import UploadFile
+
+from app.core.users.constants import AVATARS_DIR, STATIC_ROOT, AVATAR_MAX_DIMENSION, AVATAR_READ_CHUNK_SIZE, \
+    AVATAR_RENDITION_SIZES, AVATAR_RENDITION_FORMATS
+from app.core.users.exceptions import InvalidAvatarFormatException, AvatarProcessingOverloaded, \
+    AvatarTooLargeException
+
+logger = logging.getLogger(__name__)
+
+# Набор версий аватара: <ключ>-<размер>.<формат>, ключ - начало sha256 исходного файла.
+_RENDITION_URL = re.compile(rf"^/{AVATARS_DIR}/(?P<key>[0-9a-f]{{32}})-\d+\.png$")
+# Аватары до появления версий: один PNG 256x256 со случайным именем.
+_LEGACY_URL = re.compile(rf"^/{AVATARS_DIR}/(?P<name>[0-9a-f-]{{36}}\.png)$")
+_RENDITION_FILE = re.compile(r"^(?P<key>[0-9a-f]{32})-\d+\.(png|webp)$")
+_LEGACY_FILE = re.compile(r"^[0-9a-f-]{36}\.png$")
+
+
+def rendition_filename(key: str, size: int, image_format: str) -> str:
+    return f"{key}-{size}.{image_format}"
+
+
+def _avatar_url(key: str) -> str:
+    return f"/{AVATARS_DIR}/{rendition_filename(key, max(AVATAR_RENDITION_SIZES), 'png')}"
+
+
+def _rendition_filenames(key: str) -> list[str]:
+    return [
+        rendition_filename(key, size, image_format)
+        for size in AVATAR_RENDITION_SIZES
+        for image_format in AVATAR_RENDITION_FORMATS
+    ]
+
+
+def avatar_renditions(avatar_url: str | None) -> dict[str, dict[str, str]] | None:
+    """
+    Раскрывает avatar_url в URL всех версий: {"48": {"webp": ..., "png": ...}, ...}.
+    Для старых аватаров без версий возвращает None.
+    """
+    match = _RENDITION_URL.match(avatar_url or "")
+    if match is None:
+        return None
+    return {
+        str(size): {
+            image_format: f"/{AVATARS_DIR}/{rendition_filename(match['key'], size, image_format)}"
+            for image_format in AVATAR_RENDITION_FORMATS
+        }
+        for size in AVATAR_RENDITION_SIZES
+    }
+
+
+async def read_upload(file: UploadFile, max_bytes: int, chunk_size: int = AVATAR_READ_CHUNK_SIZE) -> bytes:
+    """
+    Читает загрузку по chunk_size байт и прерывает чтение, как только
+    прочитано больше max_bytes, не дочитывая остаток файла.
+    """
+    if file.size is not None and file.size > max_bytes:
+        raise AvatarTooLargeException(detail=f"Avatar size cannot exceed {max_bytes // (1024 * 1024)}MB.")
+
+    buffer = bytearray()
+    while chunk := await file.read(chunk_size):
+        buffer += chunk
+        if len(buffer) > max_bytes:
+            raise AvatarTooLargeException(detail=f"Avatar size cannot exceed {max_bytes // (1024 * 1024)}MB.")
+    return bytes(buffer)
+
+
+def render_avatar(
+    data: bytes,
+    sizes: tuple[int, ...] = AVATAR_RENDITION_SIZES,
+    draft: bool = True
+) -> list[tuple[int, str, bytes]]:
+    """
+    Декодирует изображение, обрезает до квадрата по центру и для каждого
+    размера из sizes кодирует WebP и PNG. Возвращает (размер, формат, байты).
+    Выполняется в процессе пула, поэтому работает только с байтами.
+
+    Размеры проверяются по заголовку до декодирования. JPEG декодируется
+    в режиме draft: libjpeg сразу уменьшает его в 2, 4 или 8 раз, но не меньше
+    наибольшего размера, поэтому полноразмерный растр в памяти не собирается.
+    """
+    max_size = max(sizes)
+    try:
+        image = Image.open(io.BytesIO(data))
+        if image.width > AVATAR_MAX_DIMENSION or image.height > AVATAR_MAX_DIMENSION:
+            raise ValueError(
+                f"image is {image.width}x{image.height}, "
+                f"max {AVATAR_MAX_DIMENSION}x{AVATAR_MAX_DIMENSION} allowed"
+            )
+        if draft:
+            image.draft(None, (max_size, max_size))
+        image.load()
+    except (OSError, Image.DecompressionBombError) as error:
+        raise ValueError(str(error)) from None
+
+    min_dim = min(image.width, image.height)
+    left = (image.width - min_dim) / 2
+    top = (image.height - min_dim) / 2
+    right = (image.width + min_dim) / 2
+    bottom = (image.height + min_dim) / 2
+    image = image.crop((left, top, right, bottom))
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "transparency" in image.info or image.mode in ("LA", "PA") else "RGB")
+
+    renditions = []
+    # Меньшие версии масштабируются из уже уменьшенной большей, а не из исходника.
+    for size in sorted(sizes, reverse=True):
+        image = image.resize((size, size), Image.Resampling.LANCZOS)
+        for image_format in AVATAR_RENDITION_FORMATS:
+            output = io.BytesIO()
+            if image_format == "webp":
+                image.save(output, "WEBP", quality=85, method=4)
+            else:
+                image.save(output, "PNG", optimize=True)
+            renditions.append((size, image_format, output.getvalue()))
+    return renditions
+
+
+def _content_key(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:32]
+
+
+def write_atomically(directory: str, filename: str, data: bytes) -> None:
+    """Пишет во временный файл рядом с целевым и переименовывает: читатели не видят недописанный файл."""
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            tmp_file.write(data)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, os.path.join(directory, filename))
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class AvatarProcessor:
+    """
+    Обработка загруженных аватаров вне цикла событий.
+
+    Декодирование, обрезка, масштабирование и кодирование держат GIL
+    десятки и сотни миллисекунд на большой JPEG, поэтому выполняются в пуле
+    из max_workers процессов, а запись файлов - в потоке через временный файл
+    и атомарное переименование. Одновременно обрабатывается и ждет очереди
+    не больше max_workers + max_queue загрузок, сверх этого запрос сразу
+    отклоняется с AvatarProcessingOverloaded.
+
+    Версии именуются по хэшу исходного файла: повторная загрузка того же
+    изображения не обрабатывается заново, а содержимое файла по одному URL
+    никогда не меняется, поэтому его можно кэшировать бессрочно.
+
+    Одни файлы могут принадлежать нескольким пользователям, поэтому при смене
+    аватара старые файлы не удаляются сразу: их удаляет периодическая очистка,
+    если на них никто не ссылается и они не использовались дольше заданного
+    срока (повторная загрузка обновляет время изменения файлов).
+    """
+
+    def __init__(self, max_workers: int = 2, max_queue: int = 8, static_root: str = STATIC_ROOT) -> None:
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.static_root = static_root
+        self._executor: ProcessPoolExecutor | None = None
+        self._in_flight = 0
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        # Процессы запускаются при первой загрузке, а не при старте приложения.
+        # forkserver не копирует потоки и соединения родителя, в отличие от fork.
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context("forkserver")
+            )
+        return self._executor
+
+    @property
+    def avatars_dir(self) -> str:
+        return os.path.join(self.static_root, AVATARS_DIR)
+
+    async def save_avatar(self, data: bytes) -> str:
+        """
+        Обрабатывает изображение и сохраняет все версии.
+        Возвращает URL наибольшей версии в PNG, остальные выводятся из него через avatar_renditions.
+        """
+        if self._in_flight >= self.max_workers + self.max_queue:
+            logger.warning(f"Пул обработки аватаров перегружен: {self._in_flight} загрузок в работе и в очереди")
+            raise AvatarProcessingOverloaded(in_flight=self._in_flight)
+
+        self._in_flight += 1
+        try:
+            key = await asyncio.to_thread(_content_key, data)
+            avatar_url = _avatar_url(key)
+            if await asyncio.to_thread(self._reuse_renditions, key):
+                return avatar_url
+
+            loop = asyncio.get_running_loop()
+            try:
+                renditions = await loop.run_in_executor(self.executor, render_avatar, data)
+            except ValueError as error:
+                raise InvalidAvatarFormatException(detail=str(error)) from error
+
+            try:
+                await asyncio.to_thread(self._write_renditions, key, renditions)
+            except OSError as e:
+                logger.error(f"Не удалось сохранить аватар в {self.avatars_dir}: {e}")
+                raise
+            return avatar_url
+        finally:
+            self._in_flight -= 1
+
+    async def find_stale_avatars(self, min_age_seconds: float) -> list[str]:
+        """URL аватаров, файлы которых не создавались и не использовались дольше min_age_seconds."""
+        return await asyncio.to_thread(self._stale_avatar_urls, min_age_seconds)
+
+    async def delete_avatar(self, avatar_url: str, min_age_seconds: float | None = None) -> bool:
+        """
+        Удаляет файлы аватара: все версии или одиночный файл старого формата.
+        С min_age_seconds файлы, использованные за этот срок, не удаляются.
+        Ошибки удаления записываются в лог. Возвращает True, если файлы удалены.
+        """
+        if match := _RENDITION_URL.match(avatar_url):
+            filenames = _rendition_filenames(match["key"])
+        elif match := _LEGACY_URL.match(avatar_url):
+            filenames = [match["name"]]
+        else:
+            return False
+        return await asyncio.to_thread(self._remove_files, filenames, min_age_seconds)
+
+    def _reuse_renditions(self, key: str) -> bool:
+        """Есть ли уже все версии; время изменения найденных файлов обновляется, чтобы их не удалила очистка."""
+        try:
+            for filename in _rendition_filenames(key):
+                os.utime(os.path.join(self.avatars_dir, filename))
+        except FileNotFoundError:
+            return False
+        return True
+
+    def _stale_avatar_urls(self, min_age_seconds: float) -> list[str]:
+        newest: dict[str, float] = {}
+        try:
+            entries = list(os.scandir(self.avatars_dir))
+        except FileNotFoundError:
+            return []
+        for entry in entries:
+            if match := _RENDITION_FILE.match(entry.name):
+                avatar_url = _avatar_url(match["key"])
+            elif _LEGACY_FILE.match(entry.name):
+                avatar_url = f"/{AVATARS_DIR}/{entry.name}"
+            else:
+                continue
+            try:
+                modified_at = entry.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            newest[avatar_url] = max(newest.get(avatar_url, 0.0), modified_at)
+        cutoff = time.time() - min_age_seconds
+        return [avatar_url for avatar_url, modified_at in newest.items() if modified_at < cutoff]
+
+    def _write_renditions(self, key: str, renditions: list[tuple[int, str, bytes]]) -> None:
+        for size, image_format, content in renditions:
+            write_atomically(self.avatars_dir, rendition_filename(key, size, image_format), content)
+
+    def _remove_files(self, filenames: list[str], min_age_seconds: float | None = None) -> bool:
+        paths = [os.path.join(self.avatars_dir, filename) for filename in filenames]
+        if min_age_seconds is not None:
+            cutoff = time.time() - min_age_seconds
+            for path in paths:
+                try:
+                    if os.stat(path).st_mtime >= cutoff:
+                        return False
+                except FileNotFoundError:
+                    pass
+        for path in paths:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.error(f"Не удалось удалить файл аватара {path}: {e}")
+                return False
+        return True
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -1,5 +1,9 @@
 AVATARS_DIR = "static/avatars"
 STATIC_ROOT = "/var/www/spend-time-together"
 AVATAR_MAX_SIZE_MB = 5
-AVATAR_SIZE = (256, 256)
-ALLOWED_AVATAR_CONTENT_TYPES = ["image/jpeg", "image/png"]
\ No newline at end of file
+AVATAR_RENDITION_SIZES = (48, 128, 256)
+AVATAR_RENDITION_FORMATS = ("webp", "png")
+AVATAR_MAX_DIMENSION = 8000
+AVATAR_READ_CHUNK_SIZE = 64 * 1024
+ALLOWED_AVATAR_CONTENT_TYPES = ["image/jpeg", "image/png"]
+USER_LOADER_MAX_BATCH_SIZE = 500
@@ -27,3 +27,7 @@ class InvalidAvatarFormatException(AvatarException):
 
 class AvatarTooLargeException(AvatarException):
     msg_template = "Avatar is too large: {detail}"
+
+
+class AvatarProcessingOverloaded(UsersServiceError):
+    msg_template = "Too many concurrent avatar uploads ({in_flight}), try again later."
@@ -0,0 +1,81 @@
+import asyncio
+import logging
+from dataclasses import replace
+from typing import Iterable
+from weakref import WeakKeyDictionary
+
+from app.core.users.constants import USER_LOADER_MAX_BATCH_SIZE
+from app.core.users.dto import UserDTO
+from app.core.users.repository import UserRepository
+
+logger = logging.getLogger(__name__)
+
+
+class UserLoader:
+    """
+    Объединяет одновременные запросы пользователей по id в один запрос IN (...).
+
+    Запросы, сделанные в одном такте цикла событий, копятся в общем батче,
+    повторяющиеся id запрашиваются один раз. Батч выполняется на следующем
+    такте и режется на части не больше max_batch_size. Батчи ведутся
+    отдельно для каждого цикла событий и для чтения с реплики/мастера.
+    """
+
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        max_batch_size: int = USER_LOADER_MAX_BATCH_SIZE
+    ) -> None:
+        self.user_repository = user_repository
+        self.max_batch_size = max_batch_size
+        self._batches: WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[bool, dict[int, asyncio.Future]]
+        ] = WeakKeyDictionary()
+        self._tasks: set[asyncio.Task] = set()
+
+    async def load(self, user_id: int, from_replica: bool = True) -> UserDTO | None:
+        user = await asyncio.shield(self._enqueue(user_id, from_replica))
+        return replace(user) if user is not None else None
+
+    async def load_many(self, user_ids: Iterable[int], from_replica: bool = True) -> list[UserDTO]:
+        """Возвращает найденных пользователей в порядке user_ids, без повторов."""
+        futures = [self._enqueue(user_id, from_replica) for user_id in dict.fromkeys(user_ids)]
+        users = await asyncio.shield(asyncio.gather(*futures))
+        return [replace(user) for user in users if user is not None]
+
+    def _enqueue(self, user_id: int, from_replica: bool) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        batches = self._batches.setdefault(loop, {})
+        batch = batches.get(from_replica)
+        if batch is None:
+            batch = batches[from_replica] = {}
+            loop.call_soon(self._dispatch, loop, from_replica)
+
+        future = batch.get(user_id)
+        if future is None:
+            future = batch[user_id] = loop.create_future()
+        return future
+
+    def _dispatch(self, loop: asyncio.AbstractEventLoop, from_replica: bool) -> None:
+        batch = self._batches[loop].pop(from_replica)
+        user_ids = list(batch)
+        for start in range(0, len(user_ids), self.max_batch_size):
+            chunk = {user_id: batch[user_id] for user_id in user_ids[start:start + self.max_batch_size]}
+            task = loop.create_task(self._fetch(chunk, from_replica))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _fetch(self, batch: dict[int, asyncio.Future], from_replica: bool) -> None:
+        try:
+            users = await self.user_repository.get_users_by_ids(list(batch), from_replica=from_replica)
+        except Exception as error:
+            logger.error(f"Ошибка загрузки батча пользователей ({len(batch)} шт.): {error}")
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        users_by_id = {user.id: user for user in users}
+        for user_id, future in batch.items():
+            if not future.done():
+                future.set_result(users_by_id.get(user_id))
@@ -0,0 +1,25 @@
+from sqlalchemy import Row, Select, select
+
+from app.core.users.dto import UserDTO
+from app.core.users.models import Users
+
+USER_DTO_COLUMNS = (
+    Users.id,
+    Users.login,
+    Users.email,
+    Users.first_name,
+    Users.last_name,
+    Users.avatar_url,
+    Users.telegram_link,
+    Users.created_at,
+    Users.updated_at,
+)
+
+
+def select_user_dto() -> Select:
+    """Выборка только публичных колонок пользователя, без хэша пароля."""
+    return select(*USER_DTO_COLUMNS)
+
+
+def to_user_dto(row: Row) -> UserDTO:
+    return UserDTO(**row._mapping)
@@ -1,62 +1,48 @@
 from dataclasses import dataclass
 
-from sqlalchemy import select
+from sqlalchemy import select, bindparam, update
 
 from app.core.mixins import BaseRepository
+from app.core.users.dto import UserDTO
 from app.core.users.models import Users
+from app.core.users.projections import select_user_dto, to_user_dto
+
+_USER_BY_ID = select(Users).where(Users.id == bindparam("user_id"))
+_USER_BY_LOGIN = select(Users).where(Users.login == bindparam("login"))
+_USER_BY_EMAIL = select(Users).where(Users.email == bindparam("email"))
+_UPDATE_PASSWORD = update(Users).where(Users.id == bindparam("user_id")).values(password=bindparam("password"))
 
 
 @dataclass
 class UserRepository(BaseRepository):
     async def get_user_by_id(self, user_id: int) -> Users | None:
-        query = select(Users).where(Users.id == user_id)
         async with self.db.session() as session:
-            result = await session.execute(query)
+            result = await session.execute(_USER_BY_ID, {"user_id": user_id})
             return result.scalars().first()
 
-    async def get_users(self) -> list[Users]:
+    async def get_users(self, limit: int, after_id: int | None = None) -> list[Users]:
         query = select(Users)
+        if after_id is not None:
+            query = query.where(Users.id > after_id)
+        query = query.order_by(Users.id).limit(limit)
         async with self.db.session() as session:
             result = await session.execute(query)
             return list(result.scalars().all())
 
 
     async def get_user_by_login(self, login: str) -> Users | None:
-        query = select(Users).where(Users.login == login)
         async with self.db.session() as session:
-            result = await session.execute(query)
+            result = await session.execute(_USER_BY_LOGIN, {"login": login})
             user = result.scalars().first()
             return user if user is not None else None
 
 
     async def get_user_by_email(self, email: str) -> Users | None:
-        query = select(Users).where(Users.email == email)
         async with self.db.session() as session:
-            result = await session.execute(query)
+            result = await session.execute(_USER_BY_EMAIL, {"email": email})
             user = result.scalars().first()
             return user if user is not None else None
 
-    async def create_user(
-        self,
-        login: str,
-        email: str,
-        first_name: str,
-        password: str,
-        last_name: str | None = None,
-    ) -> Users:
-        new_user = Users(
-            login=login,
-            email=email,
-            first_name=first_name,
-            last_name=last_name,
-            password=password
-        )
-        async with self.db.session() as session:
-            session.add(new_user)
-            await session.commit()
-            await session.refresh(new_user)
-            return new_user
-
     async def update_user(self, user: Users) -> Users:
         async with self.db.session() as session:
             session.add(user)
@@ -64,11 +50,18 @@ class UserRepository(BaseRepository):
             await session.refresh(user)
             return user
 
+    async def update_password(self, user_id: int, password: str) -> None:
+        async with self.db.session() as session:
+            await session.execute(_UPDATE_PASSWORD, {"user_id": user_id, "password": password})
+            await session.commit()
+
     async def get_users_by_ids(
         self,
-        user_ids: list[int]
-    ) -> list[Users]:
-        query = select(Users).where(Users.id.in_(user_ids))
-        async with self.db.session() as session:
+        user_ids: list[int],
+        from_replica: bool = True
+    ) -> list[UserDTO]:
+        query = select_user_dto().where(Users.id.in_(user_ids)).order_by(Users.id)
+        session_factory = self.db.read_session if from_replica else self.db.session
+        async with session_factory() as session:
             result = await session.execute(query)
-            return list(result.scalars().all())
\ No newline at end of file
+            return [to_user_dto(row) for row in result]
@@ -1,16 +1,16 @@
 import logging
-import os
-import uuid
 from dataclasses import dataclass
 
-from PIL import Image
 from fastapi import UploadFile
 
-from app.core.users.constants import ALLOWED_AVATAR_CONTENT_TYPES, AVATAR_MAX_SIZE_MB, AVATAR_SIZE, AVATARS_DIR, \
-    STATIC_ROOT
+from app.core.pagination import DEFAULT_PAGE_SIZE, PageDTO, build_page, decode_cursor
+from app.core.users.avatars import AvatarProcessor, read_upload
+from app.core.users.constants import ALLOWED_AVATAR_CONTENT_TYPES, AVATAR_MAX_SIZE_MB
 from app.core.users.dto import UserDTO, UserUpdateDTO
-from app.core.users.exceptions import UserNotFound, AvatarTooLargeException, InvalidAvatarFormatException
+from app.core.users.exceptions import UserNotFound, InvalidAvatarFormatException
+from app.core.users.loader import UserLoader
 from app.core.users.repository import UserRepository
+from app.infra.versions import ResourceVersions, USER_PROFILES_KEY, user_profile_key
 
 logger = logging.getLogger(__name__)
 
@@ -18,26 +18,25 @@ logger = logging.getLogger(__name__)
 @dataclass
 class UserService:
     user_repository: UserRepository
+    user_loader: UserLoader
+    avatar_processor: AvatarProcessor
+    resource_versions: ResourceVersions
 
     async def get_user_by_id(self, user_id: int) -> UserDTO | None:
-        user = await self.user_repository.get_user_by_id(user_id)
+        # Читаем с мастера: профиль запрашивают сразу после регистрации и обновления.
+        user = await self.user_loader.load(user_id, from_replica=False)
         if user is None:
             raise UserNotFound(user_id=user_id)
-        return UserDTO(
-            id=user.id,
-            login=user.login,
-            email=user.email,
-            first_name=user.first_name,
-            last_name=user.last_name,
-            password=user.password,
-            avatar_url=user.avatar_url,
-            created_at=user.created_at,
-            updated_at=user.updated_at
-        )
+        return user
 
-    async def get_users(self) -> list[UserDTO]:
-        users = await self.user_repository.get_users()
-        return [
+    async def get_users(
+        self,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None
+    ) -> PageDTO[UserDTO]:
+        users = await self.user_repository.get_users(limit=limit + 1, after_id=decode_cursor(cursor))
+        users, next_cursor = build_page(users, limit)
+        return PageDTO(items=[
             UserDTO(
                 id=user.id,
                 login=user.login,
@@ -48,7 +47,7 @@ class UserService:
                 updated_at=user.updated_at,
                 avatar_url=user.avatar_url
             ) for user in users
-        ]
+        ], next_cursor=next_cursor)
 
     async def get_user_by_login(self, login: str) -> UserDTO | None:
         user = await self.user_repository.get_user_by_login(login)
@@ -82,33 +81,6 @@ class UserService:
         )
 
 
-    async def create_user(
-        self,
-        login: str,
-        email: str,
-        first_name: str,
-        hashed_password: str,
-        last_name: str | None = None,
-    ):
-        created_user = await self.user_repository.create_user(
-            login=login,
-            email=email,
-            first_name=first_name,
-            last_name=last_name,
-            password=hashed_password
-        )
-
-        return UserDTO(
-            id=created_user.id,
-            login=created_user.login,
-            email=created_user.email,
-            first_name=created_user.first_name,
-            last_name=created_user.last_name,
-            created_at=created_user.created_at,
-            updated_at=created_user.updated_at,
-            avatar_url=created_user.avatar_url
-        )
-
     async def update_user(self, user_id: int, update_dto: UserUpdateDTO) -> UserDTO:
         user = await self.user_repository.get_user_by_id(user_id=user_id)
         if not user:
@@ -120,6 +92,7 @@ class UserService:
                 setattr(user, key, value)
 
         updated_user = await self.user_repository.update_user(user=user)
+        await self.resource_versions.bump(user_profile_key(user_id), USER_PROFILES_KEY)
 
         return UserDTO(
             id=updated_user.id,
@@ -132,61 +105,28 @@ class UserService:
             avatar_url=updated_user.avatar_url
         )
 
+    async def update_password_hash(self, user_id: int, hashed_password: str) -> None:
+        await self.user_repository.update_password(user_id=user_id, password=hashed_password)
+
     async def update_avatar(self, user_id: int, file: UploadFile) -> UserDTO:
         if file.content_type not in ALLOWED_AVATAR_CONTENT_TYPES:
             raise InvalidAvatarFormatException(
                 detail=f"Only {', '.join(ALLOWED_AVATAR_CONTENT_TYPES)} formats are allowed."
             )
 
-        file_bytes = await file.read()
-        if len(file_bytes) > AVATAR_MAX_SIZE_MB * 1024 * 1024:
-            raise AvatarTooLargeException(detail=f"Avatar size cannot exceed {AVATAR_MAX_SIZE_MB}MB.")
-
-        await file.seek(0)
-        image = Image.open(file.file)
-
-        min_dim = min(image.width, image.height)
-        left = (image.width - min_dim) / 2
-        top = (image.height - min_dim) / 2
-        right = (image.width + min_dim) / 2
-        bottom = (image.height + min_dim) / 2
-        image = image.crop((left, top, right, bottom))
-        image = image.resize(AVATAR_SIZE)
-
-        absolute_avatars_dir = os.path.join(STATIC_ROOT, AVATARS_DIR)
-
-        os.makedirs(absolute_avatars_dir, exist_ok=True)
-
-        unique_filename = f"{uuid.uuid4()}.png"
-        absolute_file_path = os.path.join(absolute_avatars_dir, unique_filename)
-
-        logger.info(f"Attempting to save avatar to: {absolute_file_path}")
-        try:
-            image.save(absolute_file_path, "PNG")
-            logger.info(f"Successfully saved avatar to: {absolute_file_path}")
-        except Exception as e:
-            logger.error(f"Failed to save avatar to {absolute_file_path}. Error: {e}")
-            raise
+        user = await self.user_repository.get_user_by_id(user_id=user_id)
+        if not user:
+            raise UserNotFound(user_id=user_id)
 
-        avatar_url = f"/{AVATARS_DIR}/{unique_filename}"
+        file_bytes = await read_upload(file, max_bytes=AVATAR_MAX_SIZE_MB * 1024 * 1024)
+        avatar_url = await self.avatar_processor.save_avatar(file_bytes)
+        # Файлы прежнего аватара удаляет периодическая очистка, когда на них больше никто не ссылается.
         update_dto = UserUpdateDTO(avatar_url=avatar_url)
-
         return await self.update_user(user_id=user_id, update_dto=update_dto)
 
     async def get_users_by_ids(
         self,
-        user_ids: list[int]
+        user_ids: list[int],
+        from_replica: bool = True
     ) -> list[UserDTO]:
-        users = await self.user_repository.get_users_by_ids(user_ids)
-        return [
-            UserDTO(
-                id=user.id,
-                login=user.login,
-                email=user.email,
-                first_name=user.first_name,
-                last_name=user.last_name,
-                created_at=user.created_at,
-                updated_at=user.updated_at,
-                avatar_url=user.avatar_url
-            ) for user in users
-        ]
+        return await self.user_loader.load_many(user_ids, from_replica=from_replica)
@@ -3,9 +3,11 @@ from dependency_injector.providers import Singleton
 
 from app.core.activity.repository import ActivityRepository
 from app.core.auth.repository import AuthRepository
+from app.core.maintenance.repository import MaintenanceRepository
 from app.core.rooms.repository import RoomRepository
 from app.core.users.repository import UserRepository
 from app.infra.adapters.database import Database
+from app.infra.adapters.invalidation import InvalidationBus, DatabaseInvalidationBus
 from settings.database import Settings
 
 
@@ -15,6 +17,23 @@ class RepositoriesContainer(containers.DeclarativeContainer):
     database = providers.Singleton(
         Database,
         db_url=settings.provided.DATABASE_URL,
+        replica_urls=settings.provided.DATABASE_REPLICA_URLS,
+        echo=settings.provided.DATABASE_ECHO,
+        pool_size=settings.provided.DATABASE_POOL_SIZE,
+        max_overflow=settings.provided.DATABASE_MAX_OVERFLOW,
+        pool_timeout=settings.provided.DATABASE_POOL_TIMEOUT,
+        pool_recycle=settings.provided.DATABASE_POOL_RECYCLE,
+        pool_pre_ping=settings.provided.DATABASE_POOL_PRE_PING,
+        statement_timeout_ms=settings.provided.DATABASE_STATEMENT_TIMEOUT_MS,
+        slow_checkout_ms=settings.provided.DATABASE_SLOW_CHECKOUT_MS,
+        replica_retry_seconds=settings.provided.DATABASE_REPLICA_RETRY_SECONDS,
+        slow_query_threshold_ms=settings.provided.DATABASE_SLOW_QUERY_MS,
+    )
+
+    invalidation_bus = providers.Selector(
+        settings.provided.CACHE_INVALIDATION_BACKEND,
+        local=providers.Singleton(InvalidationBus),
+        database=providers.Singleton(DatabaseInvalidationBus, db=database),
     )
 
     user_repository: Singleton[UserRepository] = providers.Singleton(
@@ -36,3 +55,8 @@ class RepositoriesContainer(containers.DeclarativeContainer):
         ActivityRepository,
         db=database
     )
+
+    maintenance_repository: Singleton[MaintenanceRepository] = providers.Singleton(
+        MaintenanceRepository,
+        db=database
+    )
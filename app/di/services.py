@@ -3,9 +3,17 @@ from dependency_injector.providers import Singleton
 
 from app.core.activity.service import ActivityService
 from app.core.auth.password.password_service import PasswordService
+from app.core.auth.cache import SessionTokenCache
 from app.core.auth.service import AuthService
+from app.core.auth.tokens import SessionTokenSigner, SessionRevocationList
+from app.core.maintenance.service import JanitorService
+from app.core.rooms.cache import RoomMembershipCache
 from app.core.rooms.service import RoomService
+from app.core.users.avatars import AvatarProcessor
+from app.core.users.loader import UserLoader
 from app.core.users.service import UserService
+from app.infra.response_cache import ResponseCache
+from app.infra.versions import ResourceVersions
 from settings.database import Settings
 
 
@@ -13,30 +21,111 @@ class ServicesContainer(containers.DeclarativeContainer):
     settings: providers.Dependency[Settings] = providers.Dependency()
     repositories = providers.DependenciesContainer()
 
+    user_loader: Singleton[UserLoader] = providers.Singleton(
+        UserLoader,
+        user_repository=repositories.user_repository
+    )
+
+    avatar_processor: Singleton[AvatarProcessor] = providers.Singleton(
+        AvatarProcessor,
+        max_workers=settings.provided.AVATAR_PROCESSING_WORKERS,
+        max_queue=settings.provided.AVATAR_PROCESSING_QUEUE_LIMIT,
+    )
+
+    resource_versions: Singleton[ResourceVersions] = providers.Singleton(
+        ResourceVersions,
+        invalidation_bus=repositories.invalidation_bus,
+        maxsize=settings.provided.RESOURCE_VERSIONS_SIZE,
+    )
+
+    response_cache: Singleton[ResponseCache] = providers.Singleton(
+        ResponseCache,
+        invalidation_bus=repositories.invalidation_bus,
+        max_bytes=settings.provided.RESPONSE_CACHE_MAX_BYTES,
+        ttl=settings.provided.RESPONSE_CACHE_TTL,
+    )
+
     user_service: Singleton[UserService] = providers.Singleton(
         UserService,
-        user_repository=repositories.user_repository
+        user_repository=repositories.user_repository,
+        user_loader=user_loader,
+        avatar_processor=avatar_processor,
+        resource_versions=resource_versions
     )
 
     password_service: Singleton[PasswordService] = providers.Singleton(
-        PasswordService
+        PasswordService,
+        rounds=settings.provided.PASSWORD_BCRYPT_ROUNDS,
+        max_workers=settings.provided.PASSWORD_HASHING_WORKERS,
+        max_queue=settings.provided.PASSWORD_HASHING_QUEUE_LIMIT,
+    )
+
+    session_cache: Singleton[SessionTokenCache] = providers.Singleton(
+        SessionTokenCache,
+        invalidation_bus=repositories.invalidation_bus,
+        maxsize=settings.provided.SESSION_CACHE_SIZE,
+        ttl=settings.provided.SESSION_CACHE_TTL,
+        negative_maxsize=settings.provided.SESSION_NEGATIVE_CACHE_SIZE,
+        negative_ttl=settings.provided.SESSION_NEGATIVE_CACHE_TTL,
+    )
+
+    session_token_signer: Singleton[SessionTokenSigner] = providers.Singleton(
+        SessionTokenSigner,
+        secret_key=settings.provided.SESSION_SIGNING_KEY,
+        max_age=settings.provided.COOKIE_MAX_AGE,
+    )
+
+    session_revocation_list: Singleton[SessionRevocationList] = providers.Singleton(
+        SessionRevocationList,
+        fetch_revoked=repositories.auth_repository.provided.get_revoked_sessions,
+        refresh_interval=settings.provided.SESSION_REVOCATION_REFRESH_INTERVAL,
+        max_age=settings.provided.COOKIE_MAX_AGE,
     )
 
     auth_service: Singleton[AuthService] = providers.Singleton(
         AuthService,
         user_service=user_service,
         password_service=password_service,
-        auth_repository=repositories.auth_repository
+        auth_repository=repositories.auth_repository,
+        session_cache=session_cache,
+        token_signer=session_token_signer,
+        revocation_list=session_revocation_list
+    )
+
+    room_membership_cache: Singleton[RoomMembershipCache] = providers.Singleton(
+        RoomMembershipCache,
+        invalidation_bus=repositories.invalidation_bus,
+        maxsize=settings.provided.ROOM_MEMBERSHIP_CACHE_SIZE,
+        ttl=settings.provided.ROOM_MEMBERSHIP_CACHE_TTL,
     )
 
     room_service: Singleton = providers.Singleton(
         RoomService,
-        room_repository=repositories.room_repository
+        room_repository=repositories.room_repository,
+        membership_cache=room_membership_cache,
+        resource_versions=resource_versions
     )
 
     activity_service: Singleton = providers.Singleton(
         ActivityService,
         room_service=room_service,
         user_service=user_service,
-        activity_repository=repositories.activity_repository
-    )
\ No newline at end of file
+        activity_repository=repositories.activity_repository,
+        resource_versions=resource_versions
+    )
+
+    janitor_service: Singleton[JanitorService] = providers.Singleton(
+        JanitorService,
+        maintenance_repository=repositories.maintenance_repository,
+        resource_versions=resource_versions,
+        batch_size=settings.provided.JANITOR_BATCH_SIZE,
+        batch_pause=settings.provided.JANITOR_BATCH_PAUSE_SECONDS,
+        max_batches_per_run=settings.provided.JANITOR_MAX_BATCHES_PER_RUN,
+        session_max_age_seconds=settings.provided.COOKIE_MAX_AGE,
+        presence_max_age_seconds=settings.provided.PRESENCE_MAX_AGE_SECONDS,
+        archive_after_seconds=settings.provided.ACTIVITY_ARCHIVE_AFTER_SECONDS,
+        archive_batch_size=settings.provided.ACTIVITY_ARCHIVE_BATCH_SIZE,
+        invalidation_retention_seconds=settings.provided.CACHE_INVALIDATION_RETENTION_SECONDS,
+        avatar_processor=avatar_processor,
+        avatar_grace_seconds=settings.provided.AVATAR_GC_GRACE_SECONDS,
+    )
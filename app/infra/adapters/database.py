@@ -1,41 +1,201 @@
-from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+import asyncio
+import hashlib
+import itertools
+import logging
+import re
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Iterator
 
+from sqlalchemy import event, exc, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
     create_async_engine,
     async_sessionmaker,
 )
-from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlalchemy.orm import declarative_base
 
+from app.infra.adapters.pool import (
+    InstrumentedAsyncAdaptedQueuePool,
+    PoolMetrics,
+    PoolStats,
+    instrument_engine,
+    set_statement_timeout,
+)
+
 Base = declarative_base()
 
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger(f"{__name__}.slow_query")
+
+_STRING_LITERAL_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\bIN\s*\((?:\s*(?:\?|%s|:\w+|\$\d+)\s*,?)+\)", re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    total_time: float = 0.0
+    slowest_time: float = 0.0
+    slowest_statement: str | None = None
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total_time += elapsed
+        if elapsed > self.slowest_time:
+            self.slowest_time = elapsed
+            self.slowest_statement = statement
+
+
+_query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def profile_queries() -> Iterator[QueryStats]:
+    """
+    Собирает статистику запросов к БД, выполненных в текущем контексте
+    (HTTP-запрос или обработка одного WS-сообщения).
+    """
+    stats = QueryStats()
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+
+def fingerprint_statement(statement: str) -> str:
+    """Нормализует SQL без значений параметров, чтобы группировать одинаковые запросы."""
+    fingerprint = _STRING_LITERAL_RE.sub("?", statement)
+    fingerprint = _NUMBER_LITERAL_RE.sub("?", fingerprint)
+    fingerprint = _IN_LIST_RE.sub("IN (...)", fingerprint)
+    return _WHITESPACE_RE.sub(" ", fingerprint).strip()
+
+
+def instrument_queries(engine: Engine, slow_query_threshold_ms: float | None) -> None:
+    """Подключает подсчет запросов и журнал медленных запросов к движку."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any,
+                               executemany: bool) -> None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any,
+                              executemany: bool) -> None:
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+
+        stats = _query_stats.get()
+        if stats is not None:
+            stats.record(statement, elapsed)
+
+        if slow_query_threshold_ms is not None and elapsed * 1000 >= slow_query_threshold_ms:
+            fingerprint = fingerprint_statement(statement)
+            fingerprint_id = hashlib.sha1(fingerprint.encode()).hexdigest()[:12]
+            slow_query_logger.warning(
+                f"Медленный запрос {elapsed * 1000:.1f} ms [{fingerprint_id}]: {fingerprint}"
+            )
+
+
+@dataclass
+class Replica:
+    url: str
+    engine: AsyncEngine
+    session_factory: async_sessionmaker[AsyncSession]
+    metrics: PoolMetrics
+    healthy: bool = True
+    retry_at: float = 0.0
+
+    @property
+    def is_available(self) -> bool:
+        return self.healthy or time.monotonic() >= self.retry_at
+
 
 class Database:
     def __init__(
         self,
         db_url: str,
+        replica_urls: list[str] | None = None,
         echo: bool = False,
-        pool_size: int = 5
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_timeout: float = 30,
+        pool_recycle: int = 3600,
+        pool_pre_ping: bool = True,
+        statement_timeout_ms: int | None = None,
+        slow_checkout_ms: float = 100,
+        replica_retry_seconds: float = 30,
+        slow_query_threshold_ms: float | None = None,
     ) -> None:
-        self._engine: AsyncEngine = create_async_engine(
-            db_url,
+        engine_options = dict(
             echo=echo,
             pool_size=pool_size,
-            poolclass=AsyncAdaptedQueuePool,
-            pool_pre_ping=True,
-            pool_recycle=3600
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            poolclass=InstrumentedAsyncAdaptedQueuePool,
+            pool_pre_ping=pool_pre_ping,
+            pool_recycle=pool_recycle
+        )
+        self._engine: AsyncEngine = create_async_engine(db_url, **engine_options)
+
+        self.pool_metrics = PoolMetrics(
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            slow_checkout_ms=slow_checkout_ms,
         )
+        instrument_engine(self._engine.sync_engine, self.pool_metrics)
+        instrument_queries(self._engine.sync_engine, slow_query_threshold_ms)
+        if statement_timeout_ms:
+            set_statement_timeout(self._engine.sync_engine, statement_timeout_ms)
 
-        self._session_factory = async_sessionmaker(
-            bind=self._engine,
+        self._session_factory = self._create_session_factory(self._engine)
+
+        self._replica_retry_seconds = replica_retry_seconds
+        self._replicas: list[Replica] = []
+        for replica_url in replica_urls or []:
+            replica_engine = create_async_engine(replica_url, **engine_options)
+            replica_metrics = PoolMetrics(
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                slow_checkout_ms=slow_checkout_ms,
+            )
+            instrument_engine(replica_engine.sync_engine, replica_metrics)
+            instrument_queries(replica_engine.sync_engine, slow_query_threshold_ms)
+            if statement_timeout_ms:
+                set_statement_timeout(replica_engine.sync_engine, statement_timeout_ms)
+            self._replicas.append(
+                Replica(
+                    url=replica_engine.url.render_as_string(hide_password=True),
+                    engine=replica_engine,
+                    session_factory=self._create_session_factory(replica_engine),
+                    metrics=replica_metrics,
+                )
+            )
+        self._replica_counter = itertools.count()
+        self._health_check_task: asyncio.Task | None = None
+
+    @staticmethod
+    def _create_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+        return async_sessionmaker(
+            bind=engine,
             class_=AsyncSession,
             expire_on_commit=False,
             autoflush=False
         )
 
+    def pool_stats(self) -> PoolStats:
+        return self.pool_metrics.snapshot()
+
+    def replica_pool_metrics(self) -> dict[str, PoolMetrics]:
+        """Метрики пула каждой реплики по ее URL (без пароля)."""
+        return {replica.url: replica.metrics for replica in self._replicas}
+
     async def create_database(self) -> None:
         async with self._engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
@@ -51,5 +211,80 @@ class Database:
         finally:
             await session.close()
 
+    @asynccontextmanager
+    async def read_session(self) -> AsyncGenerator[AsyncSession, None]:
+        """
+        Сессия только для чтения запросов, допускающих отставание реплики.
+        Берет доступную реплику по кругу, при ее недоступности помечает
+        ее нездоровой и переходит к следующей, в крайнем случае — к основной БД.
+        Записи и чтение только что записанных данных идут через session().
+        """
+        for replica in self._available_replicas():
+            session = replica.session_factory()
+            try:
+                await session.connection()
+            except (exc.OperationalError, exc.InterfaceError, OSError) as error:
+                await session.close()
+                self._mark_unhealthy(replica, error)
+                continue
+
+            replica.healthy = True
+            try:
+                yield session
+            except Exception:
+                await session.rollback()
+                raise
+            finally:
+                await session.close()
+            return
+
+        async with self.session() as session:
+            yield session
+
+    def _available_replicas(self) -> list[Replica]:
+        if not self._replicas:
+            return []
+        start = next(self._replica_counter) % len(self._replicas)
+        replicas = self._replicas[start:] + self._replicas[:start]
+        return [replica for replica in replicas if replica.is_available]
+
+    def _mark_unhealthy(self, replica: Replica, error: Exception) -> None:
+        if replica.healthy:
+            logger.warning(f"Реплика {replica.url} исключена из ротации: {error}")
+        replica.healthy = False
+        replica.retry_at = time.monotonic() + self._replica_retry_seconds
+
+    async def check_replicas(self) -> None:
+        """Пингует реплики и возвращает в ротацию восстановившиеся."""
+        for replica in self._replicas:
+            try:
+                async with replica.engine.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+            except (exc.OperationalError, exc.InterfaceError, OSError) as error:
+                self._mark_unhealthy(replica, error)
+                continue
+
+            if not replica.healthy:
+                logger.info(f"Реплика {replica.url} возвращена в ротацию")
+            replica.healthy = True
+
+    def start_replica_health_checks(self, interval: float) -> None:
+        if not self._replicas or self._health_check_task is not None:
+            return
+        self._health_check_task = asyncio.create_task(self._run_replica_health_checks(interval))
+
+    async def _run_replica_health_checks(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.check_replicas()
+            except Exception as e:
+                logger.error(f"Ошибка проверки реплик: {e}")
+
     async def disconnect(self) -> None:
+        if self._health_check_task is not None:
+            self._health_check_task.cancel()
+            self._health_check_task = None
+        for replica in self._replicas:
+            await replica.engine.dispose()
         await self._engine.dispose()
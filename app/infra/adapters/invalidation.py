@@ -0,0 +1,136 @@
+import asyncio
+import logging
+import secrets
+from collections import defaultdict
+from datetime import datetime
+from typing import Callable
+
+from sqlalchemy import String, DateTime, func, select, insert
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.infra.adapters.database import Base, Database
+
+logger = logging.getLogger(__name__)
+
+InvalidationCallback = Callable[[str], None]
+
+
+class CacheInvalidation(Base):
+    __tablename__ = "cache_invalidations"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    channel: Mapped[str] = mapped_column(String(64), nullable=False)
+    key: Mapped[str] = mapped_column(String(255), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+        index=True
+    )
+
+
+class InvalidationBus:
+    """
+    Шина событий инвалидации кэшей. Эта реализация работает в пределах процесса:
+    подписчики вызываются сразу при публикации.
+
+    События нумеруются по возрастанию: position - номер последнего известного
+    события, dispatch_position - номер рассылаемого сейчас (None, если номер
+    еще не известен). Номера сравнимы только в пределах одной epoch: у шины
+    в процессе она своя у каждого процесса.
+    """
+
+    def __init__(self) -> None:
+        self._subscribers: dict[str, list[InvalidationCallback]] = defaultdict(list)
+        self.epoch = secrets.token_hex(4)
+        self.position: int | None = 0
+        self.dispatch_position: int | None = None
+
+    def subscribe(self, channel: str, callback: InvalidationCallback) -> None:
+        self._subscribers[channel].append(callback)
+
+    async def publish(self, channel: str, key: str) -> None:
+        self.position += 1
+        self._dispatch(channel, key, position=self.position)
+
+    def _dispatch(self, channel: str, key: str, position: int | None = None) -> None:
+        self.dispatch_position = position
+        for callback in self._subscribers.get(channel, ()):
+            try:
+                callback(key)
+            except Exception as e:
+                logger.error(f"Ошибка обработчика инвалидации {channel}:{key}: {e}")
+
+    def start(self, interval: float) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+
+class DatabaseInvalidationBus(InvalidationBus):
+    """
+    Шина инвалидации между воркерами через таблицу cache_invalidations:
+    публикация пишет строку, каждый воркер раз в interval секунд читает
+    новые строки (id больше последнего прочитанного) и вызывает подписчиков.
+    Старые строки удаляет периодическая очистка БД.
+
+    Номер события - id строки, он общий для всех воркеров. Подписчики этого
+    воркера вызываются сразу при публикации, еще без номера, и второй раз
+    с номером, когда строку прочитает poll.
+    """
+
+    def __init__(self, db: Database) -> None:
+        super().__init__()
+        self.db = db
+        self.epoch = "db"
+        self.position = None
+        self._last_id: int | None = None
+        self._task: asyncio.Task | None = None
+
+    async def publish(self, channel: str, key: str) -> None:
+        self._dispatch(channel, key)
+        async with self.db.session() as session:
+            await session.execute(insert(CacheInvalidation).values(channel=channel, key=key))
+            await session.commit()
+
+    async def poll(self) -> int:
+        async with self.db.session() as session:
+            if self._last_id is None:
+                self._last_id = (await session.execute(select(func.max(CacheInvalidation.id)))).scalar() or 0
+                self.position = self._last_id
+                return 0
+            result = await session.execute(
+                select(CacheInvalidation.id, CacheInvalidation.channel, CacheInvalidation.key)
+                .where(CacheInvalidation.id > self._last_id)
+                .order_by(CacheInvalidation.id)
+            )
+            rows = result.all()
+
+        for row in rows:
+            self._dispatch(row.channel, row.key, position=row.id)
+            self._last_id = self.position = row.id
+        return len(rows)
+
+    def start(self, interval: float) -> None:
+        if self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run(interval))
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self, interval: float) -> None:
+        while True:
+            try:
+                await self.poll()
+            except Exception as e:
+                logger.error(f"Ошибка чтения событий инвалидации: {e}")
+            await asyncio.sleep(interval)
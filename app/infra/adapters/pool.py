@@ -0,0 +1,170 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Any
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PoolStats:
+    pool_size: int
+    max_overflow: int
+    checked_out: int
+    overflow: int
+    peak_checked_out: int
+    peak_overflow: int
+    checkouts: int
+    timeouts: int
+    invalidations: int
+    avg_wait_ms: float
+    max_wait_ms: float
+
+
+class PoolMetrics:
+    """
+    Счетчики пула соединений: ожидание при выдаче соединения,
+    количество занятых и overflow-соединений, таймауты.
+    """
+
+    def __init__(self, pool_size: int, max_overflow: int, slow_checkout_ms: float) -> None:
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.slow_checkout_ms = slow_checkout_ms
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checked_out = 0
+            self.peak_checked_out = 0
+            self.peak_overflow = 0
+            self.checkouts = 0
+            self.timeouts = 0
+            self.invalidations = 0
+            self.total_wait = 0.0
+            self.max_wait = 0.0
+
+    @property
+    def overflow(self) -> int:
+        return max(self.checked_out - self.pool_size, 0)
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+        if seconds * 1000 >= self.slow_checkout_ms:
+            logger.warning(
+                f"Долгое ожидание соединения из пула: {seconds * 1000:.1f} ms "
+                f"(занято {self.checked_out}/{self.pool_size}, overflow {self.overflow}/{self.max_overflow})"
+            )
+
+    def record_timeout(self, seconds: float) -> None:
+        with self._lock:
+            self.timeouts += 1
+        logger.error(
+            f"Таймаут получения соединения из пула после {seconds * 1000:.1f} ms "
+            f"(занято {self.checked_out}/{self.pool_size}, overflow {self.overflow}/{self.max_overflow})"
+        )
+
+    def on_checkout(self, *_: Any) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+            self.peak_overflow = max(self.peak_overflow, self.overflow)
+            overflow = self.overflow
+        if overflow == 1:
+            logger.warning(
+                f"Пул соединений исчерпан, используются overflow-соединения (лимит {self.max_overflow})"
+            )
+
+    def on_checkin(self, *_: Any) -> None:
+        with self._lock:
+            self.checked_out = max(self.checked_out - 1, 0)
+
+    def on_invalidate(self, *_: Any) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self) -> PoolStats:
+        with self._lock:
+            return PoolStats(
+                pool_size=self.pool_size,
+                max_overflow=self.max_overflow,
+                checked_out=self.checked_out,
+                overflow=self.overflow,
+                peak_checked_out=self.peak_checked_out,
+                peak_overflow=self.peak_overflow,
+                checkouts=self.checkouts,
+                timeouts=self.timeouts,
+                invalidations=self.invalidations,
+                avg_wait_ms=self.total_wait * 1000 / self.checkouts if self.checkouts else 0.0,
+                max_wait_ms=self.max_wait * 1000,
+            )
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self.snapshot())
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Пул, который замеряет время ожидания свободного соединения и таймауты.
+    У событий пула нет хука "до выдачи соединения", поэтому ожидание
+    измеряется вокруг _do_get.
+    """
+    metrics: PoolMetrics | None = None
+
+    def _do_get(self) -> Any:
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            if self.metrics is not None:
+                self.metrics.record_timeout(time.perf_counter() - started)
+            raise
+        if self.metrics is not None:
+            self.metrics.record_wait(time.perf_counter() - started)
+        return connection
+
+    def recreate(self) -> "InstrumentedAsyncAdaptedQueuePool":
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def instrument_engine(engine: Engine, metrics: PoolMetrics) -> None:
+    """Подключает счетчики метрик к событиям пула движка."""
+    if isinstance(engine.pool, InstrumentedAsyncAdaptedQueuePool):
+        engine.pool.metrics = metrics
+    event.listen(engine, "checkout", metrics.on_checkout)
+    event.listen(engine, "checkin", metrics.on_checkin)
+    event.listen(engine, "invalidate", metrics.on_invalidate)
+
+
+def set_statement_timeout(engine: Engine, timeout_ms: int) -> None:
+    """
+    Ограничивает время выполнения запросов на уровне сессии БД.
+    Для MySQL действует только на SELECT (max_execution_time).
+    """
+    statements = {
+        "mysql": f"SET SESSION max_execution_time = {int(timeout_ms)}",
+        "postgresql": f"SET statement_timeout = {int(timeout_ms)}",
+    }
+    statement = statements.get(engine.dialect.name)
+    if statement is None:
+        logger.info(f"Таймаут запросов не поддерживается для диалекта {engine.dialect.name}")
+        return
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection: Any, _: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(statement)
+        finally:
+            cursor.close()
@@ -0,0 +1,172 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Hashable
+
+from app.infra.adapters.invalidation import InvalidationBus
+from app.infra.versions import RESOURCE_VERSIONS_CHANNEL
+
+# Примерные накладные расходы на запись сверх длины тела: ключ, кортеж, теги.
+ENTRY_OVERHEAD_BYTES = 256
+
+
+@dataclass
+class ResponseCacheStats:
+    size: int
+    bytes: int
+    max_bytes: int
+    hits: int
+    misses: int
+    coalesced: int
+    evictions: int
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses + self.coalesced
+        return self.hits / total if total else 0.0
+
+
+@dataclass
+class _Entry:
+    body: bytes
+    tags: tuple[str, ...]
+    expires_at: float
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + ENTRY_OVERHEAD_BYTES
+
+
+class ResponseCache:
+    """
+    Read-through кэш готовых JSON-ответов, ограниченный по памяти (LRU) и по
+    времени жизни записи.
+
+    Каждая запись помечена тегами - ключами ResourceVersions ресурсов, из
+    которых собран ответ. Запись, меняющая ресурс, вызывает bump, и по событию
+    на шине инвалидации записи с этим тегом удаляются во всех воркерах.
+
+    Одновременные промахи по одному ключу собирают ответ один раз: первый
+    запрос запускает загрузку в отдельной задаче, остальные ждут ее результата.
+    Отмена ожидающего запроса загрузку не прерывает. Если с начала загрузки
+    была инвалидация, результат не кэшируется, а новые запросы не присоединяются
+    к ней и начинают свою.
+
+    load должен читать основную БД, в которую писал bump: загрузка сразу после
+    инвалидации с отстающей реплики сохранила бы старый ответ на весь ttl.
+    """
+
+    def __init__(
+        self,
+        invalidation_bus: InvalidationBus,
+        max_bytes: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._keys_by_tag: dict[str, set[Hashable]] = {}
+        self._inflight: dict[Hashable, tuple[int, asyncio.Task]] = {}
+        self._bytes = 0
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        invalidation_bus.subscribe(RESOURCE_VERSIONS_CHANNEL, self.invalidate_tag)
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        tags: tuple[str, ...],
+        load: Callable[[], Awaitable[bytes]],
+        ttl: float | None = None
+    ) -> bytes:
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.expires_at > self._clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.body
+            self._remove(key)
+
+        inflight = self._inflight.get(key)
+        if inflight is not None and inflight[0] == self.generation:
+            self.coalesced += 1
+            return await asyncio.shield(inflight[1])
+
+        self.misses += 1
+        generation = self.generation
+        task = asyncio.ensure_future(load())
+        self._inflight[key] = (generation, task)
+        task.add_done_callback(lambda done: self._on_loaded(key, tags, generation, done, ttl))
+        return await asyncio.shield(task)
+
+    def _on_loaded(
+        self,
+        key: Hashable,
+        tags: tuple[str, ...],
+        generation: int,
+        task: asyncio.Task,
+        ttl: float | None
+    ) -> None:
+        if self._inflight.get(key, (None, None))[1] is task:
+            del self._inflight[key]
+        if task.cancelled() or task.exception() is not None or generation != self.generation:
+            return
+        self._store(key, _Entry(
+            body=task.result(), tags=tags, expires_at=self._clock() + (self.ttl if ttl is None else ttl)
+        ))
+
+    def _store(self, key: Hashable, entry: _Entry) -> None:
+        if entry.size > self.max_bytes:
+            return
+        self._remove(key)
+        self._entries[key] = entry
+        self._bytes += entry.size
+        for tag in entry.tags:
+            self._keys_by_tag.setdefault(tag, set()).add(key)
+        while self._bytes > self.max_bytes:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= entry.size
+        for tag in entry.tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+    def invalidate_tag(self, tag: str) -> None:
+        self.generation += 1
+        for key in self._keys_by_tag.pop(tag, set()):
+            self._remove(key)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+        self._keys_by_tag.clear()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> ResponseCacheStats:
+        return ResponseCacheStats(
+            size=len(self._entries),
+            bytes=self._bytes,
+            max_bytes=self.max_bytes,
+            hits=self.hits,
+            misses=self.misses,
+            coalesced=self.coalesced,
+            evictions=self.evictions,
+        )
@@ -0,0 +1,91 @@
+from collections import OrderedDict
+
+from app.infra.adapters.invalidation import InvalidationBus
+
+RESOURCE_VERSIONS_CHANNEL = "resource_versions"
+
+# Изменения, которые затрагивают ресурсы всех комнат сразу.
+USER_PROFILES_KEY = "user_profiles"
+ACTIVITY_ARCHIVE_KEY = "activity_archive"
+
+
+def user_rooms_key(user_id: int) -> str:
+    return f"user_rooms:{user_id}"
+
+
+def room_members_key(room_id: int) -> str:
+    return f"room_members:{room_id}"
+
+
+def room_activities_key(room_id: int) -> str:
+    return f"room_activities:{room_id}"
+
+
+def user_profile_key(user_id: int) -> str:
+    return f"user_profile:{user_id}"
+
+
+class ResourceVersions:
+    """
+    Версии ресурсов (список комнат пользователя, участники комнаты и т.п.)
+    для условных GET-запросов. Запись, меняющая ресурс, вызывает bump, чтение
+    получает токен через token без обращения к БД.
+
+    Версия ресурса - номер последнего события шины инвалидации по нему, поэтому
+    с DatabaseInvalidationBus токены совпадают у всех воркеров и переживают
+    перезапуск. Для ресурсов, которых нет в памяти, версия - floor: номер шины
+    на момент запуска или наибольшая вытесненная версия. Так токен вытесненного
+    или не встречавшегося ресурса может только вырасти и лишний раз дать 200,
+    но не совпасть с токеном, выданным до изменения.
+    Пока номер события неизвестен (шина еще не прочитала его из БД), токена нет.
+    Как и кэши на той же шине, другие воркеры узнают об изменении с задержкой
+    до интервала ее опроса.
+    """
+
+    def __init__(self, invalidation_bus: InvalidationBus, maxsize: int = 100000) -> None:
+        self.invalidation_bus = invalidation_bus
+        self.maxsize = maxsize
+        self._versions: OrderedDict[str, int | None] = OrderedDict()
+        self._floor: int | None = None
+        invalidation_bus.subscribe(RESOURCE_VERSIONS_CHANNEL, self._on_bump)
+
+    def version(self, key: str) -> int | None:
+        if key in self._versions:
+            return self._versions[key]
+        if self._floor is None:
+            self._floor = self.invalidation_bus.position
+        return self._floor
+
+    def token(self, *keys: str) -> str | None:
+        """
+        Общий токен нескольких ресурсов, None - если версия какого-то из них неизвестна.
+        Ключи входят в токен: у разных ресурсов с одной версией токены разные.
+        """
+        versions = []
+        for key in keys:
+            version = self.version(key)
+            if version is None:
+                return None
+            versions.append(f"{key}={version}")
+        return f"{self.invalidation_bus.epoch}:{','.join(versions)}"
+
+    async def bump(self, *keys: str) -> None:
+        for key in keys:
+            await self.invalidation_bus.publish(RESOURCE_VERSIONS_CHANNEL, key)
+
+    def _on_bump(self, key: str) -> None:
+        self._versions[key] = self.invalidation_bus.dispatch_position
+        self._versions.move_to_end(key)
+        while len(self._versions) > self.maxsize:
+            _, evicted = self._versions.popitem(last=False)
+            self._raise_floor(evicted if evicted is not None else self.invalidation_bus.position)
+
+    def _raise_floor(self, version: int | None) -> None:
+        if version is None:
+            # Номер вытесненного изменения неизвестен: пока шина его не узнает, токенов не будет.
+            self._floor = None
+        elif self._floor is None or version > self._floor:
+            self._floor = version
+
+    def __len__(self) -> int:
+        return len(self._versions)
@@ -5,10 +5,14 @@ import logging
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.staticfiles import StaticFiles
+from starlette.exceptions import HTTPException as StarletteHTTPException
 
-from app.api.exceptions import BaseAPIException, api_exception_handler
+from app.api.debug.controller import router as debug_router
+from app.api.exceptions import BaseAPIException, api_exception_handler, http_exception_handler, \
+    prerender_error_bodies
+from app.api.middlewares import QueryProfilingMiddleware
 from app.api.routes import api_router
+from app.api.static_files import CachedStaticFiles
 from app.di.containers import DIContainer
 
 logging.basicConfig(
@@ -22,7 +26,9 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI, container: DIContainer) -> AsyncGenerator[None, None]:
     """
     Контекстный менеджер для управления жизненным циклом приложения.
-    Выполняет wire и shutdown для контейнера DI.
+    Выполняет wire и shutdown для контейнера DI, запускает проверку реплик,
+    чтение событий инвалидации кэшей и периодическую очистку БД,
+    закрывает соединения с БД.
     """
     container.wire(
         modules=[
@@ -33,10 +39,28 @@ async def lifespan(app: FastAPI, container: DIContainer) -> AsyncGenerator[None,
             "app.api.activity.controller",
             "app.api.activity.ws",
             "app.api.auth.deps",
+            "app.api.debug.controller",
         ],
         packages=["app.di"],
     )
+    settings = container.settings()
+    database = container.repositories.database()
+    database.start_replica_health_checks(interval=settings.DATABASE_REPLICA_HEALTHCHECK_INTERVAL)
+    invalidation_bus = container.repositories.invalidation_bus()
+    invalidation_bus.start(interval=settings.CACHE_INVALIDATION_POLL_INTERVAL)
+    session_revocation_list = container.services.session_revocation_list()
+    if settings.SESSION_SIGNING_KEY:
+        session_revocation_list.start()
+    janitor_service = container.services.janitor_service()
+    if settings.JANITOR_ENABLED:
+        janitor_service.start(interval=settings.JANITOR_INTERVAL_SECONDS)
     yield
+    await janitor_service.stop()
+    await session_revocation_list.stop()
+    await invalidation_bus.stop()
+    container.services.password_service().shutdown()
+    container.services.avatar_processor().shutdown()
+    await database.disconnect()
     container.unwire()
 
 
@@ -56,7 +80,11 @@ def create_app(container: DIContainer | None = None) -> FastAPI:
         version="0.1.0",
         lifespan=app_lifespan
     )
-    app.mount("/static", StaticFiles(directory="static"), name="static")
+    app.mount(
+        "/static",
+        CachedStaticFiles(directory="static", max_open_files=container.settings().STATIC_MAX_OPEN_FILES),
+        name="static"
+    )
 
     app.add_middleware(
         CORSMiddleware,
@@ -84,7 +112,13 @@ def create_app(container: DIContainer | None = None) -> FastAPI:
 
     app.container = container
     app.include_router(api_router)
+
+    if container.settings().DEBUG:
+        app.add_middleware(QueryProfilingMiddleware)
+        app.include_router(debug_router, prefix="/api", tags=["debug"])
     app.add_exception_handler(BaseAPIException, api_exception_handler)
+    app.add_exception_handler(StarletteHTTPException, http_exception_handler)
+    prerender_error_bodies()
 
 
     return app
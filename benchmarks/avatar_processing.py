@@ -0,0 +1,121 @@
+"""
+Простои цикла событий при загрузке аватаров: обработка изображения прямо
+в цикле событий против пула процессов AvatarProcessor.
+
+Параллельно с загрузками работает «пульс» - задача, которая просыпается
+каждые 10 ms; задержка ее пробуждения и есть простой цикла событий.
+
+Отдельно измеряется пиковая память процесса на одну обработку JPEG
+с полным декодированием и в режиме draft.
+
+    python -m benchmarks.avatar_processing
+"""
+import asyncio
+import io
+import multiprocessing
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image
+
+from app.core.users.avatars import AvatarProcessor, render_avatar
+from benchmarks.common import print_table
+from benchmarks.password_hashing import heartbeat, percentile, HEARTBEAT_INTERVAL
+
+CONCURRENT_UPLOADS = 8
+IMAGE_SIZE = (4000, 3000)
+
+
+def make_jpeg() -> bytes:
+    image = Image.effect_noise(IMAGE_SIZE, 64).convert("RGB")
+    output = io.BytesIO()
+    image.save(output, "JPEG", quality=90)
+    return output.getvalue()
+
+
+async def run(name: str, upload) -> tuple:
+    stalls: list[float] = []
+    stop = asyncio.Event()
+    heartbeat_task = asyncio.create_task(heartbeat(stalls, stop))
+    await asyncio.sleep(HEARTBEAT_INTERVAL * 2)
+
+    started = time.perf_counter()
+
+    async def timed_upload() -> float:
+        await upload()
+        return (time.perf_counter() - started) * 1000
+
+    latencies = await asyncio.gather(*(timed_upload() for _ in range(CONCURRENT_UPLOADS)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await heartbeat_task
+
+    return (
+        name,
+        f"{percentile(latencies, 50):.0f}",
+        f"{max(latencies):.0f}",
+        f"{max(stalls):.0f}",
+        f"{sum(stalls):.0f}",
+        f"{CONCURRENT_UPLOADS / elapsed:.1f}",
+    )
+
+
+def peak_rss_kb() -> int:
+    with open("/proc/self/status") as status:
+        return next(int(line.split()[1]) for line in status if line.startswith("VmHWM"))
+
+
+def peak_rss_growth_mb(data: bytes, draft: bool) -> float:
+    """
+    Выполняется в отдельном процессе: прирост пикового RSS за одну обработку.
+    Пик сбрасывается через /proc/self/clear_refs (только Linux), иначе
+    ru_maxrss унаследовал бы пик родителя.
+    """
+    with open("/proc/self/clear_refs", "w") as clear_refs:
+        clear_refs.write("5")
+    before = peak_rss_kb()
+    render_avatar(data, draft=draft)
+    return (peak_rss_kb() - before) / 1024
+
+
+def measure_memory(data: bytes) -> list[tuple]:
+    rows = []
+    for name, draft in (("полное декодирование", False), ("draft", True)):
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+            rows.append((name, f"{executor.submit(peak_rss_growth_mb, data, draft).result():.1f}"))
+    return rows
+
+
+async def main() -> None:
+    data = make_jpeg()
+    processor = AvatarProcessor(max_workers=2, max_queue=CONCURRENT_UPLOADS, static_root=tempfile.mkdtemp())
+    # Прогрев: запуск процессов пула не должен попасть в замер.
+    await asyncio.gather(*(processor.save_avatar(data + b"warmup%d" % i) for i in range(processor.max_workers)))
+
+    async def blocking_upload() -> None:
+        render_avatar(data)
+
+    uploads = iter(range(1_000_000))
+
+    async def pooled_upload() -> None:
+        # Байты после маркера конца JPEG не декодируются, но меняют хэш и обходят дедупликацию.
+        await processor.save_avatar(data + str(next(uploads)).encode())
+
+    rows = [await run("в цикле событий", blocking_upload), await run("пул процессов", pooled_upload)]
+    print_table(
+        f"{CONCURRENT_UPLOADS} одновременных загрузок JPEG {IMAGE_SIZE[0]}x{IMAGE_SIZE[1]}, ms",
+        ("режим", "p50", "макс.", "макс. простой", "сумма простоев", "загрузок/с"),
+        rows,
+    )
+    processor.shutdown()
+
+    print_table(
+        f"Пиковая память на одну обработку JPEG {IMAGE_SIZE[0]}x{IMAGE_SIZE[1]} ({len(data) // 1024} KB), MB",
+        ("режим", "прирост RSS"),
+        measure_memory(data),
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,28 @@
+import tempfile
+import time
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from app.infra.adapters.database import Database
+
+
+def create_benchmark_database(directory: str | None = None) -> Database:
+    """Создает Database поверх SQLite-файла во временной директории."""
+    directory = directory or tempfile.mkdtemp(prefix="stt-bench-")
+    return Database(db_url=f"sqlite+aiosqlite:///{Path(directory) / 'bench.db'}")
+
+
+async def measure(func: Callable[[], Awaitable[object]], iterations: int) -> float:
+    """Возвращает среднее время одного вызова в микросекундах."""
+    await func()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await func()
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+def print_table(title: str, header: tuple[str, ...], rows: list[tuple]) -> None:
+    print(f"\n{title}")
+    widths = [max(len(str(cell)) for cell in column) for column in zip(header, *rows)]
+    for row in (header, *rows):
+        print("  ".join(str(cell).rjust(width) for cell, width in zip(row, widths)))
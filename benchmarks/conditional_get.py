@@ -0,0 +1,90 @@
+"""
+Повторный опрос списков при возврате фокуса в приложение: полный ответ 200
+против 304 по ETag из If-None-Match. Приложение работает в том же процессе
+поверх SQLite-файла, в комнате MEMBERS участников и ACTIVITIES активностей.
+
+    python -m benchmarks.conditional_get
+"""
+import asyncio
+import logging
+from datetime import datetime
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import insert
+
+from app.core.activity.constants import ActivityStatuses, ActivityTypes
+from app.core.activity.models import Activity
+from app.core.auth.models import UsersSession
+from app.core.pagination import MAX_PAGE_SIZE
+from app.core.rooms.models import Rooms, UsersRooms
+from app.core.users.models import Users
+from app.di.containers import DIContainer
+from app.infra.adapters.database import Database
+from app.main import create_app
+from benchmarks.common import create_benchmark_database, measure, print_table
+
+MEMBERS = 50
+ACTIVITIES = 50
+ITERATIONS = 300
+SESSION_TOKEN = "benchmark-session"
+
+
+async def seed(db: Database) -> None:
+    now = datetime.now()
+    async with db.session() as session:
+        await session.execute(insert(Users), [
+            {
+                "id": i, "login": f"user_{i}", "email": f"user_{i}@example.com", "first_name": "Имя",
+                "last_name": "Фамилия", "password": "x" * 60, "created_at": now, "updated_at": now,
+            }
+            for i in range(1, MEMBERS + 1)
+        ])
+        await session.execute(insert(Rooms), [{"id": 1, "name": "Комната", "created_at": now}])
+        await session.execute(insert(UsersRooms), [{"user_id": i, "room_id": 1} for i in range(1, MEMBERS + 1)])
+        await session.execute(insert(Activity), [
+            {
+                "name": f"Активность {i}", "room_id": 1, "creator_user_id": 1, "status": ActivityStatuses.FINISHED,
+                "type": ActivityTypes.VIDEO_GAMES, "scheduled_at": now, "created_at": now,
+            }
+            for i in range(ACTIVITIES)
+        ])
+        await session.execute(insert(UsersSession), [{"user_id": 1, "session_token": SESSION_TOKEN}])
+        await session.commit()
+
+
+async def main() -> None:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    db = create_benchmark_database()
+    await db.create_database()
+    await seed(db)
+
+    container = DIContainer()
+    container.repositories.database.override(db)
+    container.wire(modules=[
+        "app.api.auth.deps", "app.api.users.controller", "app.api.rooms.controller", "app.api.activity.controller",
+    ])
+    app = create_app(container=container)
+
+    rows = []
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test", cookies={"session_token": SESSION_TOKEN}
+    ) as client:
+        for path in (
+            "/api/rooms/all",
+            f"/api/rooms/1/users?limit={MAX_PAGE_SIZE}",
+            f"/api/activities/1/all?limit={MAX_PAGE_SIZE}",
+            "/api/users/me",
+        ):
+            etag = (await client.get(path)).headers["etag"]
+            assert (await client.get(path, headers={"if-none-match": etag})).status_code == 304
+
+            full = await measure(lambda: client.get(path), ITERATIONS)
+            conditional = await measure(lambda: client.get(path, headers={"if-none-match": etag}), ITERATIONS)
+            rows.append((f"GET {path}", f"{full:.0f}", f"{conditional:.0f}", f"{full / conditional:.1f}x"))
+
+    print_table("Опрос списков, мкс на запрос", ("запрос", "200", "304", "ускорение"), rows)
+    await db.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,81 @@
+"""
+Задержки логина и простои цикла событий при проверке паролей bcrypt:
+синхронный вызов в цикле событий против пула потоков PasswordService.
+
+Параллельно с проверками работает «пульс» - задача, которая просыпается
+каждые 10 ms; задержка ее пробуждения и есть простой цикла событий.
+
+    python -m benchmarks.password_hashing
+"""
+import asyncio
+import statistics
+import time
+
+from app.core.auth.password.password_service import PasswordService
+from benchmarks.common import print_table
+
+CONCURRENT_LOGINS = 16
+HEARTBEAT_INTERVAL = 0.01
+
+
+def percentile(values: list[float], q: float) -> float:
+    return statistics.quantiles(values, n=100)[q - 1] if len(values) > 1 else values[0]
+
+
+async def heartbeat(stalls: list[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+        stalls.append(max(time.perf_counter() - started - HEARTBEAT_INTERVAL, 0.0) * 1000)
+
+
+async def run(name: str, login) -> tuple:
+    stalls: list[float] = []
+    stop = asyncio.Event()
+    heartbeat_task = asyncio.create_task(heartbeat(stalls, stop))
+    await asyncio.sleep(HEARTBEAT_INTERVAL * 2)
+
+    # Все логины приходят одновременно, задержка считается от момента прихода.
+    started = time.perf_counter()
+
+    async def timed_login() -> float:
+        await login()
+        return (time.perf_counter() - started) * 1000
+
+    latencies = await asyncio.gather(*(timed_login() for _ in range(CONCURRENT_LOGINS)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await heartbeat_task
+
+    return (
+        name,
+        f"{percentile(latencies, 50):.0f}",
+        f"{percentile(latencies, 95):.0f}",
+        f"{percentile(latencies, 99):.0f}",
+        f"{max(stalls):.0f}",
+        f"{sum(stalls):.0f}",
+        f"{CONCURRENT_LOGINS / elapsed:.1f}",
+    )
+
+
+async def main() -> None:
+    password_service = PasswordService(max_workers=2, max_queue=CONCURRENT_LOGINS)
+    hashed_password = await password_service.get_password_hash("Secret-password-1")
+
+    async def blocking_login() -> None:
+        password_service.pwd_context.verify("Secret-password-1", hashed_password)
+
+    async def pooled_login() -> None:
+        await password_service.verify_password("Secret-password-1", hashed_password)
+
+    rows = [await run("в цикле событий", blocking_login), await run("пул потоков", pooled_login)]
+    print_table(
+        f"{CONCURRENT_LOGINS} одновременных логинов, ms",
+        ("режим", "p50", "p95", "p99", "макс. простой", "сумма простоев", "логинов/с"),
+        rows,
+    )
+    password_service.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
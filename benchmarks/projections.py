@@ -0,0 +1,149 @@
+"""
+Сравнение ORM-пути (гидратация сущностей + копирование в DTO) и проекций
+(выборка колонок + DTO прямо из строк) для 10, 100 и 1000 строк.
+
+    python -m benchmarks.projections
+"""
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import insert, select
+
+from app.core.activity.constants import ActivityStatuses, ActivityTypes
+from app.core.activity.dto import ActivityDTO
+from app.core.activity.models import Activity
+from app.core.activity.projections import select_activity_dto, to_activity_dto
+from app.core.rooms.dto import RoomDTO
+from app.core.rooms.models import Rooms, UsersRooms
+from app.core.rooms.projections import select_room_dto, to_room_dto
+from app.core.users.dto import UserDTO
+from app.core.users.models import Users
+from app.core.users.projections import select_user_dto, to_user_dto
+from app.infra.adapters.database import Database
+from benchmarks.common import create_benchmark_database, measure, print_table
+
+ROW_COUNTS = (10, 100, 1000)
+ITERATIONS = 200
+
+
+async def seed(db: Database, rows: int) -> None:
+    now = datetime.now()
+    async with db.session() as session:
+        await session.execute(insert(Users), [
+            {
+                "id": i, "login": f"user_{i}", "email": f"user_{i}@example.com", "first_name": "Name",
+                "last_name": "Surname", "password": "x" * 60, "created_at": now, "updated_at": now,
+            }
+            for i in range(1, rows + 1)
+        ])
+        await session.execute(insert(Rooms), [
+            {"id": i, "name": f"room {i}", "description": "description", "created_at": now}
+            for i in range(1, rows + 1)
+        ])
+        await session.execute(insert(UsersRooms), [{"user_id": 1, "room_id": i} for i in range(1, rows + 1)])
+        await session.execute(insert(Activity), [
+            {
+                "name": f"activity {i}", "room_id": 1, "creator_user_id": 1, "status": ActivityStatuses.FINISHED,
+                "type": ActivityTypes.VIDEO_GAMES, "scheduled_at": now, "created_at": now,
+            }
+            for i in range(rows)
+        ])
+        await session.commit()
+
+
+def users_orm(db: Database, user_ids: list[int]):
+    async def run() -> list[UserDTO]:
+        async with db.session() as session:
+            result = await session.execute(select(Users).where(Users.id.in_(user_ids)))
+            return [
+                UserDTO(
+                    id=user.id, login=user.login, email=user.email, first_name=user.first_name,
+                    last_name=user.last_name, created_at=user.created_at, updated_at=user.updated_at,
+                    avatar_url=user.avatar_url,
+                ) for user in result.scalars().all()
+            ]
+    return run
+
+
+def users_projection(db: Database, user_ids: list[int]):
+    async def run() -> list[UserDTO]:
+        async with db.session() as session:
+            result = await session.execute(select_user_dto().where(Users.id.in_(user_ids)))
+            return [to_user_dto(row) for row in result]
+    return run
+
+
+def rooms_orm(db: Database, limit: int):
+    async def run() -> list[RoomDTO]:
+        query = select(Rooms).join(UsersRooms, UsersRooms.room_id == Rooms.id).where(UsersRooms.user_id == 1)
+        async with db.session() as session:
+            result = await session.execute(query.limit(limit))
+            return [
+                RoomDTO(id=room.id, name=room.name, description=room.description,
+                        created_at=room.created_at.isoformat())
+                for room in result.scalars().all()
+            ]
+    return run
+
+
+def rooms_projection(db: Database, limit: int):
+    async def run() -> list[RoomDTO]:
+        query = select_room_dto().join(UsersRooms, UsersRooms.room_id == Rooms.id).where(UsersRooms.user_id == 1)
+        async with db.session() as session:
+            result = await session.execute(query.limit(limit))
+            return [to_room_dto(row) for row in result]
+    return run
+
+
+def activities_orm(db: Database, limit: int):
+    async def run() -> list[ActivityDTO]:
+        async with db.session() as session:
+            result = await session.execute(select(Activity).where(Activity.room_id == 1).limit(limit))
+            return [
+                ActivityDTO(
+                    id=activity.id, name=activity.name, room_id=activity.room_id, status=activity.status,
+                    type=activity.type,
+                    scheduled_at=activity.scheduled_at.__str__() if activity.scheduled_at else None,
+                    winner_user_id=activity.winner_user_id, creator_user_id=activity.creator_user_id,
+                ) for activity in result.scalars().all()
+            ]
+    return run
+
+
+def activities_projection(db: Database, limit: int):
+    async def run() -> list[ActivityDTO]:
+        async with db.session() as session:
+            result = await session.execute(select_activity_dto().where(Activity.room_id == 1).limit(limit))
+            return [to_activity_dto(row) for row in result]
+    return run
+
+
+async def main() -> None:
+    db = create_benchmark_database()
+    await db.create_database()
+    await seed(db, max(ROW_COUNTS))
+
+    rows = []
+    for count in ROW_COUNTS:
+        cases = {
+            "get_users_by_ids": (users_orm(db, list(range(1, count + 1))),
+                                 users_projection(db, list(range(1, count + 1)))),
+            "get_rooms_by_user_id": (rooms_orm(db, count), rooms_projection(db, count)),
+            "get_activities_by_room_id": (activities_orm(db, count), activities_projection(db, count)),
+        }
+        for name, (orm_path, projection_path) in cases.items():
+            iterations = max(ITERATIONS * 10 // count, 5)
+            orm_us = await measure(orm_path, iterations)
+            projection_us = await measure(projection_path, iterations)
+            rows.append((name, count, f"{orm_us:.0f}", f"{projection_us:.0f}", f"{orm_us / projection_us:.2f}x"))
+
+    print_table(
+        "ORM-сущности vs проекции (мкс на вызов)",
+        ("query", "rows", "orm_us", "projection_us", "speedup"),
+        rows,
+    )
+    await db.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
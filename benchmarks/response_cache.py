@@ -0,0 +1,85 @@
+"""
+Кэш ответов списков: полный ответ 200 со сборкой из БД (кэш отключен)
+против ответа из кэша, и наплыв одновременных запросов после изменения
+комнаты - сколько раз ответ собирается из БД. Приложение и данные - как в
+benchmarks.conditional_get.
+
+    python -m benchmarks.response_cache
+"""
+import asyncio
+import logging
+
+from httpx import ASGITransport, AsyncClient
+
+from app.core.pagination import MAX_PAGE_SIZE
+from app.di.containers import DIContainer
+from app.infra.response_cache import ResponseCache
+from app.infra.versions import room_activities_key
+from app.main import create_app
+from benchmarks.common import create_benchmark_database, measure, print_table
+from benchmarks.conditional_get import SESSION_TOKEN, seed
+
+ITERATIONS = 300
+CONCURRENT_REQUESTS = 50
+PATHS = (
+    "/api/rooms/all",
+    f"/api/rooms/1/users?limit={MAX_PAGE_SIZE}",
+    f"/api/activities/1/all?limit={MAX_PAGE_SIZE}",
+)
+
+
+def build_client(db, max_bytes: int) -> tuple[AsyncClient, DIContainer]:
+    container = DIContainer()
+    container.repositories.database.override(db)
+    container.services.response_cache.override(ResponseCache(
+        invalidation_bus=container.repositories.invalidation_bus(), max_bytes=max_bytes, ttl=30,
+    ))
+    container.wire(modules=[
+        "app.api.auth.deps", "app.api.users.controller", "app.api.rooms.controller", "app.api.activity.controller",
+    ])
+    client = AsyncClient(
+        transport=ASGITransport(app=create_app(container=container)),
+        base_url="http://test",
+        cookies={"session_token": SESSION_TOKEN},
+    )
+    return client, container
+
+
+async def main() -> None:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    db = create_benchmark_database()
+    await db.create_database()
+    await seed(db)
+
+    rows = []
+    for path in PATHS:
+        # Ответ больше лимита не сохраняется: каждый запрос собирается из БД.
+        uncached_client, _ = build_client(db, max_bytes=0)
+        async with uncached_client:
+            uncached = await measure(lambda: uncached_client.get(path), ITERATIONS)
+        cached_client, _ = build_client(db, max_bytes=32 * 1024 * 1024)
+        async with cached_client:
+            cached = await measure(lambda: cached_client.get(path), ITERATIONS)
+        rows.append((f"GET {path}", f"{uncached:.0f}", f"{cached:.0f}", f"{uncached / cached:.1f}x"))
+    print_table("Ответ 200, мкс на запрос", ("запрос", "без кэша", "из кэша", "ускорение"), rows)
+
+    client, container = build_client(db, max_bytes=32 * 1024 * 1024)
+    response_cache = container.services.response_cache()
+    path = PATHS[2]
+    async with client:
+        await client.get(path)
+        await container.services.resource_versions().bump(room_activities_key(1))
+        misses = response_cache.stats().misses
+        responses = await asyncio.gather(*(client.get(path) for _ in range(CONCURRENT_REQUESTS)))
+        assert all(response.status_code == 200 for response in responses)
+        loads = response_cache.stats().misses - misses
+    print_table(
+        "Наплыв после изменения комнаты",
+        ("запрос", "одновременных запросов", "сборок ответа из БД"),
+        [(f"GET {path}", CONCURRENT_REQUESTS, loads)],
+    )
+    await db.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
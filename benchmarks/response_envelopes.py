@@ -0,0 +1,135 @@
+"""
+Стоимость сборки JSON-ответа по эндпоинтам: прежний путь FastAPI
+(asdict -> OkResponse.new -> валидация по response_model -> ORJSONResponse)
+против OkResponse.render (поля DTO сразу в orjson), и событие activity_variants
+по WebSocket: модели VariantData, собранные вручную, против DTO, которые orjson
+пишет сам через реестр сериализаторов.
+
+    python -m benchmarks.response_envelopes
+"""
+import asyncio
+from dataclasses import asdict
+from datetime import datetime
+
+import orjson
+from fastapi.responses import ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.api.activity.serializers import ActivitySerializer
+from app.api.activity.ws_events import ActivityVariantsEvent, VariantData, StoreData, PlatformData
+from app.api.auth.serializers import AuthMeResponseSerializer
+from app.api.response_patterns import OkResponse, OkPageResponse
+from app.api.rooms.serializers import RoomInfoSerializer
+from app.api.serialization import JSON_OPTIONS, dto_serializers
+from app.api.users.serializers import UserInfoSerializer
+from app.core.activity.constants import ActivityStatuses, ActivityTypes
+from app.core.activity.dto import ActivityDTO, UserActivityVariantDTO, GameStoreDTO, GamePlatformDTO
+from app.core.pagination import DEFAULT_PAGE_SIZE
+from app.core.rooms.dto import RoomDTO
+from app.core.users.dto import UserDTO
+from benchmarks.common import measure, print_table
+
+ITERATIONS = 2000
+
+
+def make_user(user_id: int) -> UserDTO:
+    return UserDTO(
+        id=user_id, login=f"user{user_id}", email=f"user{user_id}@example.com", first_name="Имя",
+        last_name="Фамилия", avatar_url=f"/static/avatars/{user_id:032x}-256.png",
+        created_at=datetime(2026, 1, 1), updated_at=datetime(2026, 1, 1),
+    )
+
+
+def make_activity(activity_id: int) -> ActivityDTO:
+    return ActivityDTO(
+        id=activity_id, name="Активность", room_id=1, status=ActivityStatuses.FINISHED,
+        type=ActivityTypes.VIDEO_GAMES, scheduled_at="2026-01-01 18:00:00", creator_user_id=1,
+    )
+
+
+def make_room(room_id: int) -> RoomDTO:
+    return RoomDTO(id=room_id, name="Комната", description="Описание", created_at="2026-01-01 12:00:00")
+
+
+def make_variant(user_id: int) -> UserActivityVariantDTO:
+    return UserActivityVariantDTO(
+        user_id=user_id, activity_id=1, variant="Portal 2", api_game_id=user_id, name="Portal 2",
+        description="Описание игры", release_date=datetime(2011, 4, 18), rating="4.6", metacritic=95,
+        stores=[GameStoreDTO(store_id=i, store_name="Steam", store_url="https://store.example.com") for i in range(3)],
+        platforms=[GamePlatformDTO(platform_id=i, platform_name="PC", platform_slug="pc") for i in range(3)],
+        user_first_name="Имя", user_last_name="Фамилия", user_avatar_url=f"/static/avatars/{user_id:032x}-256.png",
+    )
+
+
+def variants_by_models(variants: list[UserActivityVariantDTO]) -> str:
+    """Как событие собиралось раньше: модели Pydantic на каждый вариант, магазин и платформу."""
+    return ActivityVariantsEvent(variants=[
+        VariantData(
+            **{**asdict(v), "release_date": v.release_date.isoformat() if v.release_date else None,
+               "stores": [StoreData(**asdict(s)) for s in v.stores],
+               "platforms": [PlatformData(**asdict(p)) for p in v.platforms]}
+        )
+        for v in variants
+    ]).model_dump_json()
+
+
+def variants_by_registry(variants: list[UserActivityVariantDTO]) -> str:
+    return orjson.dumps(
+        {"event": "activity_variants", "variants": dto_serializers.prepare(VariantData, variants)},
+        option=JSON_OPTIONS,
+    ).decode()
+
+
+async def fastapi_path(field, response_class, model, data, **kwargs) -> ORJSONResponse:
+    if isinstance(data, list):
+        payload = [asdict(item) for item in data]
+    else:
+        payload = asdict(data)
+    envelope = response_class.new(status_code=200, model=model, data=payload, **kwargs)
+    return ORJSONResponse(await serialize_response(field=field, response_content=envelope))
+
+
+ENDPOINTS = [
+    ("GET /rooms/all", OkPageResponse, RoomInfoSerializer,
+     [make_room(i) for i in range(DEFAULT_PAGE_SIZE)], {"next_cursor": "abc"}),
+    ("GET /rooms/{id}/users", OkPageResponse, UserInfoSerializer,
+     [make_user(i) for i in range(DEFAULT_PAGE_SIZE)], {"next_cursor": "abc"}),
+    ("GET /activities/{room_id}/all", OkPageResponse, ActivitySerializer,
+     [make_activity(i) for i in range(DEFAULT_PAGE_SIZE)], {"next_cursor": "abc"}),
+    ("GET /activities/{id}", OkResponse, ActivitySerializer, make_activity(1), {}),
+    ("GET /users/me", OkResponse, UserInfoSerializer, make_user(1), {}),
+    ("GET /auth/me", OkResponse, AuthMeResponseSerializer, make_user(1), {}),
+]
+
+
+async def main() -> None:
+    rows = []
+    for name, response_class, model, data, kwargs in ENDPOINTS:
+        # FastAPI создает поле ответа один раз при регистрации роута.
+        field = create_model_field(name="Response", type_=response_class[model], mode="serialization")
+        before = await measure(lambda: fastapi_path(field, response_class, model, data, **kwargs), ITERATIONS)
+
+        async def render() -> None:
+            response_class.render(status_code=200, model=model, data=data, **kwargs)
+
+        after = await measure(render, ITERATIONS)
+        rows.append((name, f"{before:.1f}", f"{after:.1f}", f"{before / after:.1f}x"))
+
+    variants = [make_variant(i) for i in range(10)]
+
+    async def by_models() -> None:
+        variants_by_models(variants)
+
+    async def by_registry() -> None:
+        variants_by_registry(variants)
+
+    before = await measure(by_models, ITERATIONS)
+    after = await measure(by_registry, ITERATIONS)
+    rows.append(("WS activity_variants, 10", f"{before:.1f}", f"{after:.1f}", f"{before / after:.1f}x"))
+
+    print_table("Сборка ответа, мкс на запрос", ("эндпоинт", "FastAPI + Pydantic", "render", "ускорение"), rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
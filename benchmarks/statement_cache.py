@@ -0,0 +1,171 @@
+"""
+Сравнение пересобираемых на каждый вызов select(...) и готовых выражений
+горячих запросов репозиториев: доля попаданий в кэш скомпилированных
+запросов и CPU на вызов.
+
+    python -m benchmarks.statement_cache
+"""
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Callable
+
+from sqlalchemy import event, insert, select
+from sqlalchemy.engine import default
+
+from app.core.activity import repository as activity_repository_module
+from app.core.auth import repository as auth_repository_module
+from app.core.rooms import repository as rooms_repository_module
+from app.core.users import repository as users_repository_module
+from app.core.activity.constants import ActivityStatuses, ActivityTypes
+from app.core.activity.models import Activity
+from app.core.activity.repository import ActivityRepository
+from app.core.auth.models import UsersSession
+from app.core.auth.repository import AuthRepository
+from app.core.rooms.models import Rooms, UsersRooms
+from app.core.rooms.repository import RoomRepository
+from app.core.users.models import Users
+from app.core.users.repository import UserRepository
+from app.infra.adapters.database import Database
+from benchmarks.common import create_benchmark_database, print_table
+
+ITERATIONS = 2000
+SESSION_TOKEN = "bench-session-token"
+
+
+class CacheHitCounter:
+    def __init__(self, db: Database) -> None:
+        self.hits = 0
+        self.total = 0
+        event.listen(db._engine.sync_engine, "after_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.total += 1
+        if context is not None and context.cache_hit is default.CACHE_HIT:
+            self.hits += 1
+
+    def reset(self) -> None:
+        self.hits = self.total = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.total * 100 if self.total else 0.0
+
+
+async def seed(db: Database) -> None:
+    now = datetime.now()
+    async with db.session() as session:
+        await session.execute(insert(Users), [{
+            "id": 1, "login": "user", "email": "user@example.com", "first_name": "Name",
+            "created_at": now, "updated_at": now,
+        }])
+        await session.execute(insert(Rooms), [{"id": 1, "name": "room", "created_at": now}])
+        await session.execute(insert(UsersRooms), [{"user_id": 1, "room_id": 1}])
+        await session.execute(insert(Activity), [{
+            "id": 1, "name": "activity", "room_id": 1, "creator_user_id": 1, "status": ActivityStatuses.PLANNED,
+            "type": ActivityTypes.VIDEO_GAMES, "created_at": now,
+        }])
+        await session.execute(insert(UsersSession), [{
+            "user_id": 1, "session_token": SESSION_TOKEN, "created_at": now, "updated_at": now,
+        }])
+        await session.commit()
+
+
+def rebuilt_queries() -> dict[str, Callable[[], Any]]:
+    """Запросы в том виде, в каком они собирались на каждый вызов раньше."""
+    return {
+        "activity.get_activity_by_id": lambda: select(Activity).where(Activity.id == 1),
+        "rooms.is_user_in_room": lambda: select(UsersRooms).where(
+            UsersRooms.user_id == 1, UsersRooms.room_id == 1
+        ),
+        "users.get_user_by_id": lambda: select(Users).where(Users.id == 1),
+        "auth.get_users_session_by_token": lambda: select(UsersSession).where(
+            UsersSession.session_token == SESSION_TOKEN
+        ),
+    }
+
+
+def prebuilt_queries() -> dict[str, Callable[[], Any]]:
+    """Готовые выражения из репозиториев, собранные один раз при импорте."""
+    return {
+        "activity.get_activity_by_id": lambda: activity_repository_module._ACTIVITY_BY_ID,
+        "rooms.is_user_in_room": lambda: rooms_repository_module._IS_USER_IN_ROOM,
+        "users.get_user_by_id": lambda: users_repository_module._USER_BY_ID,
+        "auth.get_users_session_by_token": lambda: auth_repository_module._SESSION_BY_TOKEN,
+    }
+
+
+def repository_calls(db: Database) -> dict[str, Callable[[], Any]]:
+    activity_repository = ActivityRepository(db=db)
+    room_repository = RoomRepository(db=db)
+    user_repository = UserRepository(db=db)
+    auth_repository = AuthRepository(db=db)
+    return {
+        "activity.get_activity_by_id": lambda: activity_repository.get_activity_by_id(activity_id=1),
+        "rooms.is_user_in_room": lambda: room_repository.is_user_in_room(user_id=1, room_id=1),
+        "users.get_user_by_id": lambda: user_repository.get_user_by_id(user_id=1),
+        "auth.get_users_session_by_token": lambda: auth_repository.get_users_session_by_token(
+            session_token=SESSION_TOKEN
+        ),
+    }
+
+
+def measure_build_us(factory: Callable[[], Any]) -> float:
+    """CPU на сборку выражения и вычисление ключа кэша компиляции."""
+    factory()._generate_cache_key()
+    started = time.process_time()
+    for _ in range(ITERATIONS):
+        factory()._generate_cache_key()
+    return (time.process_time() - started) / ITERATIONS * 1_000_000
+
+
+async def measure_execute(db: Database, counter: CacheHitCounter, call: Callable[[], Any]) -> tuple[float, float]:
+    counter.reset()
+    started = time.process_time()
+    for _ in range(ITERATIONS):
+        await call()
+    cpu_us = (time.process_time() - started) / ITERATIONS * 1_000_000
+    return cpu_us, counter.hit_rate
+
+
+async def main() -> None:
+    db = create_benchmark_database()
+    await db.create_database()
+    await seed(db)
+    counter = CacheHitCounter(db)
+
+    rebuilt, prebuilt, calls = rebuilt_queries(), prebuilt_queries(), repository_calls(db)
+
+    async def execute_rebuilt(factory: Callable[[], Any]) -> None:
+        async with db.session() as session:
+            result = await session.execute(factory())
+            result.scalars().first()
+
+    rows = []
+    for name in rebuilt:
+        build_rebuilt_us = measure_build_us(rebuilt[name])
+        build_prebuilt_us = measure_build_us(prebuilt[name])
+        rebuilt_cpu_us, rebuilt_hits = await measure_execute(db, counter, lambda: execute_rebuilt(rebuilt[name]))
+        prebuilt_cpu_us, prebuilt_hits = await measure_execute(db, counter, calls[name])
+        rows.append((
+            name,
+            f"{build_rebuilt_us:.1f}",
+            f"{build_prebuilt_us:.1f}",
+            f"{rebuilt_cpu_us:.0f}",
+            f"{prebuilt_cpu_us:.0f}",
+            f"{rebuilt_cpu_us - prebuilt_cpu_us:.0f}",
+            f"{rebuilt_hits:.1f}%",
+            f"{prebuilt_hits:.1f}%",
+        ))
+
+    print_table(
+        f"select(...) на каждый вызов vs готовые выражения, {ITERATIONS} вызовов (CPU, мкс на вызов)",
+        ("query", "build_rebuilt", "build_prebuilt", "cpu_rebuilt", "cpu_prebuilt", "saved",
+         "hits_rebuilt", "hits_prebuilt"),
+        rows,
+    )
+    await db.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
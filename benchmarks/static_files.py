@@ -0,0 +1,100 @@
+"""
+Раздача аватаров для страницы комнаты: StaticFiles по умолчанию против CachedStaticFiles.
+
+Страница комнаты показывает ROOM_MEMBERS аватаров 48 px. Холодная загрузка
+скачивает их все; при повторном открытии браузер без Cache-Control
+перепроверяет каждый файл условным запросом (304), а immutable-версии
+берет из кэша без запросов. Запросы идут в ASGI-приложение в том же процессе.
+
+    python -m benchmarks.static_files
+"""
+import asyncio
+import io
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from PIL import Image
+from starlette.staticfiles import StaticFiles
+
+from app.api.static_files import CachedStaticFiles
+from app.core.users.avatars import render_avatar
+from benchmarks.common import print_table
+
+ROOM_MEMBERS = 30
+PAGE_LOADS = 50
+
+
+def create_avatars(directory: Path) -> list[str]:
+    names = []
+    for member in range(ROOM_MEMBERS):
+        output = io.BytesIO()
+        Image.new("RGB", (512, 512), color=(member * 8, 100, 200)).save(output, "PNG")
+        size, image_format, content = next(
+            rendition for rendition in render_avatar(output.getvalue(), sizes=(48,)) if rendition[1] == "webp"
+        )
+        name = f"{member:032x}-{size}.{image_format}"
+        (directory / name).write_bytes(content)
+        names.append(name)
+    return names
+
+
+async def load_page(client: AsyncClient, names: list[str], browser_cache: dict[str, dict]) -> int:
+    """Загружает аватары страницы как браузер с кэшем, возвращает число запросов к серверу."""
+
+    async def load(name: str) -> int:
+        cached = browser_cache.get(name)
+        if cached is not None and "immutable" in cached.get("cache-control", ""):
+            return 0
+        headers = {"if-none-match": cached["etag"]} if cached is not None else {}
+        response = await client.get(f"/static/{name}", headers=headers)
+        if response.status_code == 200:
+            browser_cache[name] = dict(response.headers)
+        return 1
+
+    return sum(await asyncio.gather(*(load(name) for name in names)))
+
+
+async def run(name: str, static_files: StaticFiles, names: list[str]) -> tuple:
+    app = FastAPI()
+    app.mount("/static", static_files, name="static")
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        cold_requests, started = 0, time.perf_counter()
+        for _ in range(PAGE_LOADS):
+            cold_requests += await load_page(client, names, {})
+        cold_elapsed = time.perf_counter() - started
+
+        browser_cache: dict[str, dict] = {}
+        await load_page(client, names, browser_cache)
+        warm_requests, started = 0, time.perf_counter()
+        for _ in range(PAGE_LOADS):
+            warm_requests += await load_page(client, names, browser_cache)
+        warm_elapsed = time.perf_counter() - started
+
+    return (
+        name,
+        f"{cold_requests / cold_elapsed:.0f}",
+        f"{PAGE_LOADS / cold_elapsed:.1f}",
+        f"{warm_requests / PAGE_LOADS:.0f}",
+        f"{PAGE_LOADS / warm_elapsed:.1f}",
+    )
+
+
+async def main() -> None:
+    directory = Path(tempfile.mkdtemp(prefix="stt-static-"))
+    names = create_avatars(directory)
+    rows = [
+        await run("StaticFiles", StaticFiles(directory=directory), names),
+        await run("CachedStaticFiles", CachedStaticFiles(directory=directory), names),
+    ]
+    print_table(
+        f"Страница комнаты с {ROOM_MEMBERS} аватарами, {PAGE_LOADS} загрузок",
+        ("раздача", "холодная: запросов/с", "страниц/с", "повторная: запросов на страницу", "страниц/с"),
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
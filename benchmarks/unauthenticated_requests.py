@@ -0,0 +1,90 @@
+"""
+Пропускная способность на запросах, которые заканчиваются ошибкой:
+401 без cookie сессии (истекшие cookie), 404 на несуществующие пути
+(сканеры) и 404 из исключения API. Прежние обработчики (HTTPException
+из FastAPI, BaseResponse -> JSONResponse) против orjson и тел, собранных
+при старте. Запросы идут в ASGI-приложение в том же процессе.
+
+    python -m benchmarks.unauthenticated_requests
+"""
+import asyncio
+import logging
+import time
+
+from fastapi import FastAPI
+from fastapi.exception_handlers import http_exception_handler as fastapi_http_exception_handler
+from fastapi.requests import Request
+from httpx import ASGITransport, AsyncClient
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from starlette.responses import JSONResponse
+
+from app.api.exceptions import BaseAPIException, api_exception_handler
+from app.api.rooms.exceptions import RoomNotFoundException
+from app.main import create_app
+from benchmarks.common import measure, print_table
+
+REQUESTS = 2000
+ROUNDS = 5
+HANDLER_ITERATIONS = 20000
+
+
+async def legacy_api_exception_handler(_: Request, exc: BaseAPIException) -> JSONResponse:
+    return JSONResponse(
+        status_code=exc.status_code,
+        content=exc.get_response_data().model_dump(exclude_none=True),
+        headers=exc.headers,
+    )
+
+
+def build_app(legacy: bool) -> FastAPI:
+    app = create_app()
+    app.container.wire(modules=["app.api.auth.deps", "app.api.users.controller"])
+    if legacy:
+        app.exception_handlers[StarletteHTTPException] = fastapi_http_exception_handler
+        app.exception_handlers[BaseAPIException] = legacy_api_exception_handler
+    return app
+
+
+async def requests_per_second(app: FastAPI, path: str, expected_status: int) -> float:
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        assert (await client.get(path)).status_code == expected_status
+        started = time.perf_counter()
+        for _ in range(REQUESTS):
+            await client.get(path)
+        return REQUESTS / (time.perf_counter() - started)
+
+
+async def main() -> None:
+    # httpx пишет в INFO каждый запрос, это дороже самого ответа.
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    legacy_app, app = build_app(legacy=True), build_app(legacy=False)
+    rows = []
+    for name, path, expected_status in (
+        ("401 GET /api/users/me", "/api/users/me", 401),
+        ("404 GET /wp-login.php", "/wp-login.php", 404),
+    ):
+        # Прогоны чередуются, берется лучший: на общей машине шум больше разницы.
+        before, after = 0.0, 0.0
+        for _ in range(ROUNDS):
+            before = max(before, await requests_per_second(legacy_app, path, expected_status))
+            after = max(after, await requests_per_second(app, path, expected_status))
+        rows.append((name, f"{before:.0f}", f"{after:.0f}", f"{after / before:.2f}x"))
+    print_table("Запросов в секунду", ("запрос", "до", "после", "ускорение"), rows)
+
+    async def legacy_handler() -> None:
+        await legacy_api_exception_handler(None, RoomNotFoundException(detail="Room with id 5 not found."))
+
+    async def handler() -> None:
+        await api_exception_handler(None, RoomNotFoundException(detail="Room with id 5 not found."))
+
+    before = await measure(legacy_handler, HANDLER_ITERATIONS)
+    after = await measure(handler, HANDLER_ITERATIONS)
+    print_table(
+        "Обработчик исключения API, мкс",
+        ("исключение", "до", "после", "ускорение"),
+        [("RoomNotFoundException", f"{before:.1f}", f"{after:.1f}", f"{before / after:.1f}x")],
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -7,9 +7,10 @@ from sqlalchemy import pool
 
 from app.infra.adapters.database import Base
 from app.core.users import models as users_models
-from app.core.auth.models import UsersSession
+from app.core.auth.models import UsersSession, RevokedSession
 from app.core.rooms.models import Rooms, UsersRooms, RoomInvites
 from app.core.activity.models import Activity, UserActivity, UserActivityVariants
+from app.infra.adapters.invalidation import CacheInvalidation
 
 from settings.database import Settings
 
@@ -0,0 +1,28 @@
+"""activity room status index
+
+Revision ID: 4b1e6f0c2a7d
+Revises: 0e98f400831c
+Create Date: 2026-10-19 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b1e6f0c2a7d'
+down_revision: Union[str, Sequence[str], None] = '0e98f400831c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_activity_room_id_status_id', 'activity', ['room_id', 'status', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_activity_room_id_status_id', table_name='activity')
@@ -0,0 +1,35 @@
+"""revoked sessions table
+
+Revision ID: 7a2c4e9b1d35
+Revises: 1f6b8d3e7a20
+Create Date: 2026-10-19 16:05:37.214903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a2c4e9b1d35'
+down_revision: Union[str, Sequence[str], None] = '1f6b8d3e7a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('revoked_sessions',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('session_id', sa.Integer(), nullable=False),
+    sa.Column('revoked_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_revoked_sessions_revoked_at'), 'revoked_sessions', ['revoked_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_revoked_sessions_revoked_at'), table_name='revoked_sessions')
+    op.drop_table('revoked_sessions')
@@ -0,0 +1,66 @@
+"""unique variant per user and activity
+
+Revision ID: 8c3d91a5e4f2
+Revises: 4b1e6f0c2a7d
+Create Date: 2026-10-19 11:40:05.902113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c3d91a5e4f2'
+down_revision: Union[str, Sequence[str], None] = '4b1e6f0c2a7d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Из дубликатов от параллельных отправок остается самый ранний вариант (MIN(id)).
+    duplicates_join = """
+        JOIN (
+            SELECT activity_id, user_id, MIN(id) AS keep_id
+            FROM user_activity_variants
+            GROUP BY activity_id, user_id
+            HAVING COUNT(*) > 1
+        ) keep
+          ON keep.activity_id = v.activity_id
+         AND keep.user_id = v.user_id
+         AND v.id <> keep.keep_id
+    """
+    op.execute(f"""
+        UPDATE activity a
+        JOIN user_activity_variants v ON v.id = a.winner_variant_id
+        {duplicates_join}
+        SET a.winner_variant_id = keep.keep_id
+    """)
+    op.execute(f"""
+        DELETE gs FROM game_stores gs
+        JOIN user_activity_variants v ON v.id = gs.variant_id
+        {duplicates_join}
+    """)
+    op.execute(f"""
+        DELETE gp FROM game_platforms gp
+        JOIN user_activity_variants v ON v.id = gp.variant_id
+        {duplicates_join}
+    """)
+    op.execute(f"DELETE v FROM user_activity_variants v {duplicates_join}")
+
+    op.create_unique_constraint(
+        'uq_user_activity_variants_activity_id_user_id',
+        'user_activity_variants',
+        ['activity_id', 'user_id']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint(
+        'uq_user_activity_variants_activity_id_user_id',
+        'user_activity_variants',
+        type_='unique'
+    )
@@ -0,0 +1,31 @@
+"""user activity last seen at
+
+Revision ID: c61e0b7d4a92
+Revises: 7a2c4e9b1d35
+Create Date: 2026-10-19 17:20:11.408315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c61e0b7d4a92'
+down_revision: Union[str, Sequence[str], None] = '7a2c4e9b1d35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('user_activity', sa.Column(
+        'last_seen_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False
+    ))
+    op.execute("UPDATE user_activity SET last_seen_at = joined_at")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('user_activity', 'last_seen_at')
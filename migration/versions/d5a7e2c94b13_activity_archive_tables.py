@@ -0,0 +1,100 @@
+"""activity archive tables
+
+Revision ID: d5a7e2c94b13
+Revises: 8c3d91a5e4f2
+Create Date: 2026-10-19 13:05:41.217934
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a7e2c94b13'
+down_revision: Union[str, Sequence[str], None] = '8c3d91a5e4f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('activity', sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True))
+    op.execute(
+        "UPDATE activity SET finished_at = COALESCE(scheduled_at, created_at) "
+        "WHERE status IN ('FINISHED', 'CANCELLED')"
+    )
+    op.create_index('ix_activity_status_finished_at', 'activity', ['status', 'finished_at'], unique=False)
+
+    op.create_table('activity_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('room_id', sa.Integer(), nullable=False),
+    sa.Column('creator_user_id', sa.Integer(), nullable=False),
+    sa.Column('winner_user_id', sa.Integer(), nullable=True),
+    sa.Column('winner_variant_id', sa.Integer(), nullable=True),
+    sa.Column('status', sa.Enum('PLANNED', 'IN_PROGRESS', 'FINISHED', 'CANCELLED', name='activitystatuses'), nullable=False),
+    sa.Column('type', sa.Enum('BOARD_GAMES', 'VIDEO_GAMES', 'MOVIES', name='activitytypes'), nullable=False),
+    sa.Column('scheduled_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_activity_archive_room_id_id', 'activity_archive', ['room_id', 'id'], unique=False)
+
+    op.create_table('user_activity_variants_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('api_game_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('background_image', sa.String(length=1024), nullable=True),
+    sa.Column('background_image_additional', sa.String(length=1024), nullable=True),
+    sa.Column('release_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('rating', sa.String(length=4), nullable=True),
+    sa.Column('metacritic', sa.Integer(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('activity_id', sa.Integer(), nullable=False),
+    sa.Column('variant', sa.String(length=255), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        op.f('ix_user_activity_variants_archive_activity_id'), 'user_activity_variants_archive',
+        ['activity_id'], unique=False
+    )
+
+    op.create_table('game_stores_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('variant_id', sa.Integer(), nullable=False),
+    sa.Column('store_id', sa.Integer(), nullable=False),
+    sa.Column('store_name', sa.String(length=100), nullable=False),
+    sa.Column('store_url', sa.String(length=1024), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_game_stores_archive_variant_id'), 'game_stores_archive', ['variant_id'], unique=False)
+
+    op.create_table('game_platforms_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('variant_id', sa.Integer(), nullable=False),
+    sa.Column('platform_id', sa.Integer(), nullable=False),
+    sa.Column('platform_name', sa.String(length=100), nullable=False),
+    sa.Column('platform_slug', sa.String(length=100), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        op.f('ix_game_platforms_archive_variant_id'), 'game_platforms_archive', ['variant_id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_game_platforms_archive_variant_id'), table_name='game_platforms_archive')
+    op.drop_table('game_platforms_archive')
+    op.drop_index(op.f('ix_game_stores_archive_variant_id'), table_name='game_stores_archive')
+    op.drop_table('game_stores_archive')
+    op.drop_index(op.f('ix_user_activity_variants_archive_activity_id'), table_name='user_activity_variants_archive')
+    op.drop_table('user_activity_variants_archive')
+    op.drop_index('ix_activity_archive_room_id_id', table_name='activity_archive')
+    op.drop_table('activity_archive')
+    op.drop_index('ix_activity_status_finished_at', table_name='activity')
+    op.drop_column('activity', 'finished_at')
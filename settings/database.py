@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -9,6 +11,55 @@ class Settings(BaseSettings):
     )
 
     DATABASE_URL: str
+    DATABASE_REPLICA_URLS: list[str] = []
+    DATABASE_REPLICA_HEALTHCHECK_INTERVAL: float = 10
+    DATABASE_REPLICA_RETRY_SECONDS: float = 30
+    DATABASE_ECHO: bool = False
+    DATABASE_POOL_SIZE: int = 20
+    DATABASE_MAX_OVERFLOW: int = 20
+    DATABASE_POOL_TIMEOUT: float = 10
+    DATABASE_POOL_RECYCLE: int = 3600  # 1 hour
+    DATABASE_POOL_PRE_PING: bool = True
+    DATABASE_STATEMENT_TIMEOUT_MS: int | None = None
+    DATABASE_SLOW_CHECKOUT_MS: float = 100
+    DATABASE_SLOW_QUERY_MS: float | None = 200
+
+    DEBUG: bool = False
+
+    # local - только в пределах процесса, database - между воркерами через таблицу cache_invalidations
+    CACHE_INVALIDATION_BACKEND: Literal["local", "database"] = "local"
+    CACHE_INVALIDATION_POLL_INTERVAL: float = 1
+    CACHE_INVALIDATION_RETENTION_SECONDS: int = 3600  # 1 hour
+    ROOM_MEMBERSHIP_CACHE_SIZE: int = 10000
+    ROOM_MEMBERSHIP_CACHE_TTL: float = 60
+    SESSION_CACHE_SIZE: int = 10000
+    SESSION_CACHE_TTL: float = 60
+    SESSION_NEGATIVE_CACHE_SIZE: int = 10000
+    SESSION_NEGATIVE_CACHE_TTL: float = 10
+    RESOURCE_VERSIONS_SIZE: int = 100000
+    RESPONSE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    RESPONSE_CACHE_TTL: float = 30
+    # С ключом выдаются подписанные токены, проверяемые без БД; без него - UUID-токены
+    SESSION_SIGNING_KEY: str | None = None
+    SESSION_REVOCATION_REFRESH_INTERVAL: float = 5
+    PASSWORD_BCRYPT_ROUNDS: int = 12  # подбирается python -m app.core.auth.password.calibrate
+    PASSWORD_HASHING_WORKERS: int = 2
+    PASSWORD_HASHING_QUEUE_LIMIT: int = 32
+    AVATAR_PROCESSING_WORKERS: int = 2
+    AVATAR_PROCESSING_QUEUE_LIMIT: int = 8
+    AVATAR_GC_GRACE_SECONDS: int = 3600  # 1 hour
+
+    JANITOR_ENABLED: bool = True
+    JANITOR_INTERVAL_SECONDS: float = 3600  # 1 hour
+    JANITOR_BATCH_SIZE: int = 500
+    JANITOR_BATCH_PAUSE_SECONDS: float = 0.5
+    JANITOR_MAX_BATCHES_PER_RUN: int = 100
+    PRESENCE_MAX_AGE_SECONDS: int = 86400  # 1 day
+    PRESENCE_TOUCH_INTERVAL_SECONDS: float = 3600  # должен быть меньше PRESENCE_MAX_AGE_SECONDS
+    ACTIVITY_ARCHIVE_AFTER_SECONDS: int = 2592000  # 30 days
+    ACTIVITY_ARCHIVE_BATCH_SIZE: int = 50
+
+    STATIC_MAX_OPEN_FILES: int = 256
 
     COOKIE_SECURE: bool = False
     COOKIE_DOMAIN: str | None = None
@@ -0,0 +1,79 @@
+from datetime import datetime
+
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.activity.constants import ActivityStatuses, ActivityTypes
+from app.core.activity.models import ActivityArchive
+from tests.factories.activity import ActivityFactory
+from tests.factories.auth import UsersSessionFactory
+from tests.factories.rooms import RoomFactory, UsersRoomsFactory
+from tests.factories.users import UserFactory
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.usefixtures("factories_session")]
+
+
+async def test_get_room_activities_filters_by_status_newest_first(
+    rest_client: AsyncClient,
+) -> None:
+    user = await UserFactory.create()
+    user_session = await UsersSessionFactory.create(user_id=user.id)
+    room = await RoomFactory.create()
+    await UsersRoomsFactory.create(user_id=user.id, room_id=room.id)
+    statuses = [
+        ActivityStatuses.FINISHED,
+        ActivityStatuses.PLANNED,
+        ActivityStatuses.FINISHED,
+        ActivityStatuses.FINISHED,
+        ActivityStatuses.PLANNED,
+    ]
+    activities = [
+        await ActivityFactory.create(room_id=room.id, creator_user_id=user.id, status=activity_status)
+        for activity_status in statuses
+    ]
+    finished_ids = [a.id for a in reversed(activities) if a.status == ActivityStatuses.FINISHED]
+    rest_client.cookies.set("session_token", user_session.session_token)
+
+    first_page = await rest_client.get(
+        f"/api/activities/{room.id}/all", params={"status": "finished", "limit": 2}
+    )
+    assert first_page.status_code == status.HTTP_200_OK
+    first_payload = first_page.json()["payload"]
+    assert [a["id"] for a in first_payload["data"]] == finished_ids[:2]
+
+    second_page = await rest_client.get(
+        f"/api/activities/{room.id}/all",
+        params={"status": "finished", "limit": 2, "cursor": first_payload["next_cursor"]},
+    )
+    second_payload = second_page.json()["payload"]
+    assert [a["id"] for a in second_payload["data"]] == finished_ids[2:]
+    assert second_payload["next_cursor"] is None
+
+
+async def test_archived_activities_are_served_from_archive(
+    rest_client: AsyncClient,
+    db_session: AsyncSession,
+) -> None:
+    user = await UserFactory.create()
+    user_session = await UsersSessionFactory.create(user_id=user.id)
+    room = await RoomFactory.create()
+    await UsersRoomsFactory.create(user_id=user.id, room_id=room.id)
+    archived = ActivityArchive(
+        id=100_000 + room.id, name="archived", room_id=room.id, creator_user_id=user.id,
+        status=ActivityStatuses.FINISHED, type=ActivityTypes.MOVIES, created_at=datetime.utcnow(),
+    )
+    db_session.add(archived)
+    await db_session.flush()
+    rest_client.cookies.set("session_token", user_session.session_token)
+
+    hot_page = await rest_client.get(f"/api/activities/{room.id}/all")
+    assert hot_page.json()["payload"]["data"] == []
+
+    history_page = await rest_client.get(f"/api/activities/{room.id}/all", params={"archived": True})
+    assert [a["id"] for a in history_page.json()["payload"]["data"]] == [archived.id]
+
+    activity = await rest_client.get(f"/api/activities/{archived.id}")
+    assert activity.status_code == status.HTTP_200_OK
+    assert activity.json()["payload"]["data"]["name"] == "archived"
@@ -0,0 +1,84 @@
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+
+from tests.factories.auth import UsersSessionFactory
+from tests.factories.rooms import RoomFactory, UsersRoomsFactory
+from tests.factories.users import UserFactory
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.usefixtures("factories_session")]
+
+
+async def test_get_users_rooms_list_paginates_with_cursor(
+    rest_client: AsyncClient,
+) -> None:
+    user = await UserFactory.create()
+    user_session = await UsersSessionFactory.create(user_id=user.id)
+    rooms = await RoomFactory.create_batch(5)
+    for room in rooms:
+        await UsersRoomsFactory.create(user_id=user.id, room_id=room.id)
+    rest_client.cookies.set("session_token", user_session.session_token)
+
+    received_ids, cursor, pages = [], None, 0
+    while True:
+        params = {"limit": 2} if cursor is None else {"limit": 2, "cursor": cursor}
+        response = await rest_client.get("/api/rooms/all", params=params)
+        assert response.status_code == status.HTTP_200_OK
+        payload = response.json()["payload"]
+        received_ids += [room["id"] for room in payload["data"]]
+        pages += 1
+        cursor = payload["next_cursor"]
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert received_ids == sorted(room.id for room in rooms)
+
+
+async def test_get_users_rooms_list_rejects_invalid_cursor(
+    rest_client: AsyncClient,
+) -> None:
+    user = await UserFactory.create()
+    user_session = await UsersSessionFactory.create(user_id=user.id)
+    rest_client.cookies.set("session_token", user_session.session_token)
+
+    response = await rest_client.get("/api/rooms/all", params={"cursor": "not-a-cursor"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.parametrize("path", ["/api/rooms/{room_id}/users", "/api/activities/{room_id}/all"])
+async def test_unknown_room_returns_not_found(
+    rest_client: AsyncClient,
+    path: str,
+) -> None:
+    user = await UserFactory.create()
+    user_session = await UsersSessionFactory.create(user_id=user.id)
+    rest_client.cookies.set("session_token", user_session.session_token)
+
+    response = await rest_client.get(path.format(room_id=999_999))
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert "999999" in response.json()["error"]["detail"]
+
+
+async def test_get_users_rooms_list_conditional_get(
+    rest_client: AsyncClient,
+) -> None:
+    user = await UserFactory.create()
+    user_session = await UsersSessionFactory.create(user_id=user.id)
+    rest_client.cookies.set("session_token", user_session.session_token)
+
+    first = await rest_client.get("/api/rooms/all")
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    not_modified = await rest_client.get("/api/rooms/all", headers={"if-none-match": etag})
+    assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+    assert not_modified.headers["etag"] == etag
+
+    await rest_client.post("/api/rooms/create", json={"name": "Новая комната"})
+    modified = await rest_client.get("/api/rooms/all", headers={"if-none-match": etag})
+    assert modified.status_code == status.HTTP_200_OK
+    assert modified.headers["etag"] != etag
+    assert [room["name"] for room in modified.json()["payload"]["data"]] == ["Новая комната"]
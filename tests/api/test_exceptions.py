@@ -0,0 +1,40 @@
+import orjson
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+
+from app.api.exceptions import api_exception_handler
+from app.api.rooms.exceptions import RoomNotFoundException
+
+pytestmark = [pytest.mark.asyncio]
+
+
+@pytest.mark.parametrize(
+    "exc",
+    [
+        RoomNotFoundException(),
+        RoomNotFoundException(detail='Room "5" not found.\n'),
+        RoomNotFoundException(detail="Комната не найдена", title="Not found"),
+    ],
+)
+async def test_error_body_matches_pydantic(exc: RoomNotFoundException) -> None:
+    response = await api_exception_handler(None, exc)  # type: ignore[arg-type]
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.media_type == "application/json"
+    assert orjson.loads(response.body) == exc.get_response_data().model_dump(exclude_none=True)
+
+
+async def test_unauthenticated_request(rest_client: AsyncClient) -> None:
+    response = await rest_client.get("/api/users/me")
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response.headers["www-authenticate"] == "Bearer"
+    assert response.json() == {"detail": "Not authenticated"}
+
+
+async def test_unknown_path(rest_client: AsyncClient) -> None:
+    response = await rest_client.get("/wp-login.php")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json() == {"detail": "Not Found"}
@@ -0,0 +1,60 @@
+from dataclasses import asdict
+from datetime import datetime, timezone
+
+import orjson
+import pytest
+from fastapi.encoders import jsonable_encoder
+
+from app.api.activity.serializers import ActivitySerializer
+from app.api.response_patterns import OkResponse, OkPageResponse
+from app.api.rooms.serializers import RoomInfoSerializer
+from app.api.users.serializers import UserInfoSerializer
+from app.core.activity.constants import ActivityStatuses, ActivityTypes
+from app.core.activity.dto import ActivityDTO
+from app.core.rooms.dto import RoomDTO
+from app.core.users.dto import UserDTO
+
+
+def pydantic_body(response_class, model, data, **kwargs) -> dict:
+    """Ответ так, как его раньше собирал FastAPI: DTO -> asdict -> модель -> JSON."""
+    envelope = response_class.new(status_code=200, model=model, data=data, **kwargs)
+    return orjson.loads(orjson.dumps(jsonable_encoder(envelope)))
+
+
+@pytest.mark.parametrize(
+    ("model", "dto"),
+    [
+        (
+            ActivitySerializer,
+            ActivityDTO(
+                id=1, name="Кино", room_id=2, status=ActivityStatuses.PLANNED, type=ActivityTypes.MOVIES,
+                scheduled_at="2026-10-19 18:30:00+00:00", creator_user_id=3,
+            ),
+        ),
+        (
+            UserInfoSerializer,
+            UserDTO(
+                id=1, login="anna", email="anna@example.com", first_name="Анна", password="secret-hash",
+                avatar_url="/static/avatars/0123456789abcdef0123456789abcdef-256.png",
+                created_at=datetime(2026, 10, 19, 12, 0, 0, 123456, tzinfo=timezone.utc),
+                updated_at=datetime(2026, 10, 19, 12, 0, 0),
+            ),
+        ),
+    ],
+)
+def test_render_matches_pydantic_envelope(model, dto) -> None:
+    body = orjson.loads(OkResponse.render(status_code=200, model=model, data=dto).body)
+
+    assert body == pydantic_body(OkResponse, model, asdict(dto))
+    assert "password" not in body["payload"]["data"]
+
+
+def test_page_render_matches_pydantic_envelope() -> None:
+    rooms = [RoomDTO(id=i, name=f"room {i}", created_at="2026-10-19 12:00:00") for i in range(3)]
+
+    response = OkPageResponse.render(status_code=200, model=RoomInfoSerializer, data=rooms, next_cursor="abc")
+
+    assert response.media_type == "application/json"
+    assert orjson.loads(response.body) == pydantic_body(
+        OkPageResponse, RoomInfoSerializer, [asdict(room) for room in rooms], next_cursor="abc"
+    )
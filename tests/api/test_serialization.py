@@ -0,0 +1,93 @@
+from dataclasses import asdict, dataclass
+from datetime import datetime
+
+import orjson
+import pytest
+from pydantic import BaseModel
+
+from app.api.activity.ws_events import ActivityVariantsEvent, VariantData
+from app.api.rooms.serializers import RoomInfoSerializer
+from app.api.serialization import DTOSerializerRegistry, JSON_OPTIONS, dto_serializers
+from app.api.users.serializers import UserInfoSerializer
+from app.core.activity.dto import GamePlatformDTO, GameStoreDTO, UserActivityVariantDTO
+from app.core.rooms.dto import RoomDTO
+from app.core.users.dto import UserDTO
+
+
+def test_matching_dto_list_is_passed_to_orjson_as_is() -> None:
+    rooms = [RoomDTO(id=i, name=f"room {i}", created_at="2026-10-19 12:00:00") for i in range(3)]
+
+    assert dto_serializers.prepare(RoomInfoSerializer, rooms) is rooms
+
+
+def test_excluded_fields_are_not_written() -> None:
+    user = UserDTO(
+        id=1, login="anna", email="anna@example.com", first_name="Анна", password="secret-hash",
+        created_at=datetime(2026, 10, 19, 12, 0), updated_at=datetime(2026, 10, 19, 12, 0),
+    )
+
+    data = orjson.loads(dto_serializers.dumps(UserInfoSerializer, user))
+
+    assert dto_serializers.get(UserDTO, UserInfoSerializer).native is False
+    assert "password" not in data
+    assert data["avatar_renditions"] is None
+
+
+def test_variants_event_matches_pydantic() -> None:
+    variants = [
+        UserActivityVariantDTO(
+            user_id=1, activity_id=2, variant="Portal 2", api_game_id=3, name="Portal 2",
+            release_date=datetime(2011, 4, 18), metacritic=95,
+            stores=[GameStoreDTO(store_id=1, store_name="Steam", store_url="https://store.steampowered.com")],
+            platforms=[GamePlatformDTO(platform_id=4, platform_name="PC", platform_slug="pc")],
+        ),
+        UserActivityVariantDTO(user_id=5, activity_id=2, variant="Кино", api_game_id=6, name="Кино"),
+    ]
+
+    body = orjson.dumps(
+        {"event": "activity_variants", "variants": dto_serializers.prepare(VariantData, variants)},
+        option=JSON_OPTIONS,
+    )
+
+    assert dto_serializers.get(UserActivityVariantDTO, VariantData).native is True
+    expected = ActivityVariantsEvent(variants=[VariantData(**asdict(variant)) for variant in variants])
+    assert body == expected.model_dump_json().encode()
+
+
+def test_missing_required_field_fails_on_register() -> None:
+    @dataclass
+    class PartialDTO:
+        id: int
+
+    class FullSerializer(BaseModel):
+        id: int
+        name: str
+
+    with pytest.raises(TypeError, match="name"):
+        DTOSerializerRegistry().register(PartialDTO, FullSerializer)
+
+
+def test_nested_non_native_pair_is_written_as_json() -> None:
+    @dataclass
+    class ItemDTO:
+        id: int
+        name: str
+
+    class ItemSerializer(BaseModel):
+        name: str
+        id: int
+
+    @dataclass
+    class BoxDTO:
+        id: int
+        items: list[ItemDTO]
+
+    class BoxSerializer(BaseModel):
+        id: int
+        items: list[ItemSerializer]
+
+    registry = DTOSerializerRegistry()
+    box = BoxDTO(id=1, items=[ItemDTO(id=2, name="Portal 2")])
+
+    assert registry.register(BoxDTO, BoxSerializer).native is False
+    assert orjson.loads(registry.dumps(BoxSerializer, box)) == {"id": 1, "items": [{"name": "Portal 2", "id": 2}]}
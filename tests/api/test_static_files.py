@@ -0,0 +1,52 @@
+import gzip
+
+import pytest
+from fastapi import FastAPI, status
+from httpx import ASGITransport, AsyncClient
+
+from app.api.static_files import CachedStaticFiles, IMMUTABLE_CACHE_CONTROL, REVALIDATE_CACHE_CONTROL
+
+pytestmark = [pytest.mark.asyncio]
+
+
+@pytest.fixture
+def static_client(tmp_path) -> AsyncClient:
+    (tmp_path / "0123456789abcdef0123456789abcdef-48.webp").write_bytes(b"webp" * 100)
+    (tmp_path / "app.js").write_text("console.log('hello');" * 20)
+    (tmp_path / "app.js.gz").write_bytes(gzip.compress((tmp_path / "app.js").read_bytes()))
+
+    app = FastAPI()
+    app.mount("/static", CachedStaticFiles(directory=tmp_path, max_open_files=2), name="static")
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+async def test_content_hashed_files_are_immutable(static_client: AsyncClient) -> None:
+    response = await static_client.get("/static/0123456789abcdef0123456789abcdef-48.webp")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert response.headers["content-type"] == "image/webp"
+
+    partial = await static_client.get(
+        "/static/0123456789abcdef0123456789abcdef-48.webp", headers={"range": "bytes=0-3"}
+    )
+    assert partial.status_code == status.HTTP_206_PARTIAL_CONTENT
+    assert partial.content == b"webp"
+
+
+async def test_other_files_revalidate_and_use_precompressed_variant(static_client: AsyncClient) -> None:
+    plain = await static_client.get("/static/app.js", headers={"accept-encoding": "identity"})
+    assert plain.headers["cache-control"] == REVALIDATE_CACHE_CONTROL
+    assert "content-encoding" not in plain.headers
+
+    compressed = await static_client.get("/static/app.js", headers={"accept-encoding": "gzip, br"})
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["content-type"].startswith("text/javascript")
+    assert compressed.headers["vary"] == "Accept-Encoding"
+    assert compressed.text == plain.text
+    assert compressed.headers["etag"] != plain.headers["etag"]
+
+    not_modified = await static_client.get(
+        "/static/app.js", headers={"accept-encoding": "gzip", "if-none-match": compressed.headers["etag"]}
+    )
+    assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
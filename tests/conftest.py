@@ -16,6 +16,12 @@ from sqlalchemy.ext.asyncio import (
 from app.di.containers import DIContainer
 from app.infra.adapters.database import Base
 from app.main import create_app
+from tests.factories.activity import ActivityFactory
+from tests.factories.auth import UsersSessionFactory
+from tests.factories.rooms import RoomFactory, UsersRoomsFactory
+from tests.factories.users import UserFactory
+
+FACTORIES = (UserFactory, UsersSessionFactory, RoomFactory, UsersRoomsFactory, ActivityFactory)
 
 
 @pytest.fixture(scope="session")
@@ -54,6 +60,16 @@ async def db_session(db_engine: AsyncEngine) -> AsyncGenerator[AsyncSession, Non
         await session.rollback()
 
 
+@pytest.fixture()
+def factories_session(db_session: AsyncSession) -> AsyncSession:
+    """
+    Привязывает фабрики моделей к сессии БД теста.
+    """
+    for factory_class in FACTORIES:
+        factory_class._meta.sqlalchemy_session = db_session
+    return db_session
+
+
 @pytest_asyncio.fixture()
 async def app(db_session: AsyncSession) -> AsyncGenerator[FastAPI, None]:
     """
@@ -63,6 +79,7 @@ async def app(db_session: AsyncSession) -> AsyncGenerator[FastAPI, None]:
     mock_session_context = AsyncMock()
     mock_session_context.__aenter__.return_value = db_session
     mock_db.session = MagicMock(return_value=mock_session_context)
+    mock_db.read_session = mock_db.session
 
     test_container = DIContainer()
     test_container.repositories.database.override(mock_db)
@@ -71,6 +88,11 @@ async def app(db_session: AsyncSession) -> AsyncGenerator[FastAPI, None]:
         modules=[
             "app.main",
             "app.api.users.controller",
+            "app.api.auth.controller",
+            "app.api.rooms.controller",
+            "app.api.activity.controller",
+            "app.api.activity.ws",
+            "app.api.auth.deps",
         ],
         packages=["app.di"],
     )
@@ -0,0 +1,40 @@
+import asyncio
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.core.activity.exceptions import UserAlreadySubmittedVariant
+from app.core.activity.repository import ActivityRepository
+from app.infra.adapters.database import Database
+
+pytestmark = [pytest.mark.asyncio]
+
+
+async def test_concurrent_variant_submissions_are_rejected(tmp_path) -> None:
+    db = Database(db_url=f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}")
+    await db.create_database()
+    repository = ActivityRepository(db=db)
+
+    def submit():
+        return repository.add_user_variant(
+            user_id=1, activity_id=1, variant="Portal 2", api_game_id=4200, name="Portal 2"
+        )
+
+    results = await asyncio.gather(submit(), submit(), return_exceptions=True)
+
+    assert sum(isinstance(result, UserAlreadySubmittedVariant) for result in results) == 1
+    assert await repository.has_user_variant(user_id=1, activity_id=1)
+    assert not await repository.has_user_variant(user_id=2, activity_id=1)
+
+    await db.disconnect()
+
+
+async def test_other_integrity_errors_are_not_reported_as_duplicates(tmp_path) -> None:
+    db = Database(db_url=f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}")
+    await db.create_database()
+    repository = ActivityRepository(db=db)
+
+    with pytest.raises(IntegrityError):
+        await repository.add_user_variant(user_id=1, activity_id=1, variant="Portal 2", api_game_id=4200, name=None)
+
+    await db.disconnect()
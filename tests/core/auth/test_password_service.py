@@ -0,0 +1,35 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core.auth.exceptions import PasswordHashingOverloaded
+from app.core.auth.password.password_service import PasswordService
+
+pytestmark = [pytest.mark.asyncio]
+
+
+async def test_saturated_pool_rejects_new_work() -> None:
+    password_service = PasswordService(max_workers=1, max_queue=1)
+
+    results = await asyncio.gather(
+        *(password_service._run(time.sleep, 0.05) for _ in range(3)),
+        return_exceptions=True,
+    )
+
+    assert [isinstance(result, PasswordHashingOverloaded) for result in results] == [False, False, True]
+    await password_service._run(time.sleep, 0)
+    password_service.shutdown()
+
+
+async def test_hashes_with_other_cost_need_rehash() -> None:
+    old_service, password_service = PasswordService(rounds=4), PasswordService(rounds=5)
+    old_hash = await old_service.get_password_hash("Secret-password-1")
+    new_hash = await password_service.get_password_hash("Secret-password-1")
+
+    assert await password_service.verify_password("Secret-password-1", old_hash)
+    assert password_service.needs_rehash(old_hash)
+    assert not password_service.needs_rehash(new_hash)
+
+    old_service.shutdown()
+    password_service.shutdown()
@@ -0,0 +1,27 @@
+import pytest
+
+from app.core.auth.exceptions import UserAlreadyExists
+from app.core.auth.repository import AuthRepository
+from app.infra.adapters.database import Database
+
+pytestmark = [pytest.mark.asyncio]
+
+
+async def test_register_user_creates_user_and_session_atomically(tmp_path) -> None:
+    db = Database(db_url=f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}")
+    await db.create_database()
+    repository = AuthRepository(db=db)
+
+    user, user_session = await repository.register_user(
+        login="alice", email="alice@example.com", first_name="Alice", password="hash", session_token="token-1"
+    )
+    assert user_session.user_id == user.id
+    assert user.created_at is not None
+
+    with pytest.raises(UserAlreadyExists):
+        await repository.register_user(
+            login="alice", email="other@example.com", first_name="Alice", password="hash", session_token="token-2"
+        )
+    assert await repository.get_users_session_by_token("token-2") is None
+
+    await db.disconnect()
@@ -0,0 +1,103 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.auth.cache import SessionTokenCache
+from app.core.auth.service import AuthService
+from app.core.auth.tokens import SessionTokenSigner, SessionRevocationList
+from app.infra.adapters.invalidation import InvalidationBus
+
+pytestmark = [pytest.mark.asyncio]
+
+
+class FakeAuthRepository:
+    def __init__(self) -> None:
+        now = datetime.now()
+        self.sessions = {"known": SimpleNamespace(id=1, user_id=7, session_token="known", created_at=now, updated_at=now)}
+        self.lookups = 0
+        self.revoked: list[int] = []
+
+    async def get_users_session_by_token(self, session_token: str):
+        self.lookups += 1
+        return self.sessions.get(session_token)
+
+    async def delete_user_session_by_token(self, session_token: str) -> int | None:
+        session = self.sessions.pop(session_token, None)
+        return session.id if session else None
+
+    async def revoke_session(self, session_id: int) -> None:
+        self.revoked.append(session_id)
+
+    async def get_revoked_sessions(self, after_id: int) -> list[tuple[int, int]]:
+        return [(row_id, session_id) for row_id, session_id in enumerate(self.revoked, 1) if row_id > after_id]
+
+
+def make_auth_service(repository: FakeAuthRepository, secret_key: str | None = None) -> AuthService:
+    session_cache = SessionTokenCache(
+        invalidation_bus=InvalidationBus(), maxsize=10, ttl=60, negative_maxsize=10, negative_ttl=60
+    )
+    return AuthService(
+        auth_repository=repository,
+        user_service=None,
+        password_service=None,
+        session_cache=session_cache,
+        token_signer=SessionTokenSigner(secret_key=secret_key, max_age=60),
+        revocation_list=SessionRevocationList(
+            fetch_revoked=repository.get_revoked_sessions, refresh_interval=1, max_age=60
+        ),
+    )
+
+
+async def test_session_lookups_are_cached_and_logout_invalidates() -> None:
+    repository = FakeAuthRepository()
+    auth_service = make_auth_service(repository)
+    session_cache = auth_service.session_cache
+
+    for _ in range(3):
+        assert (await auth_service.get_user_session_by_token("known")).user_id == 7
+        assert await auth_service.get_user_session_by_token("guessed") is None
+    assert repository.lookups == 2
+
+    await auth_service.logout_user("known", session_id=1)
+    assert await auth_service.get_user_session_by_token("known") is None
+    assert repository.lookups == 3
+
+    stats = session_cache.stats()
+    assert (stats.hits, stats.db_lookups_avoided) == (2, 4)
+    assert stats.hit_ratio == pytest.approx(2 / 7)
+
+
+async def test_signed_tokens_are_verified_without_db_until_revoked() -> None:
+    repository = FakeAuthRepository()
+    auth_service = make_auth_service(repository, secret_key="secret")
+    token = auth_service.token_signer.sign(user_id=7, session_id=1)
+    repository.sessions[token] = repository.sessions.pop("known")
+
+    user_session = await auth_service.get_user_session_by_token(token)
+    assert (user_session.id, user_session.user_id) == (1, 7)
+    tampered = token[:-1] + ("A" if token[-1] != "A" else "B")
+    assert await auth_service.get_user_session_by_token(tampered) is None
+    assert repository.lookups == 0
+
+    await auth_service.logout_user(token, session_id=user_session.id)
+    assert repository.revoked == [1]
+    assert await auth_service.get_user_session_by_token(token) is None
+
+    other_worker = make_auth_service(repository, secret_key="secret")
+    assert await other_worker.get_user_session_by_token(token) is not None
+    await other_worker.revocation_list.refresh()
+    assert await other_worker.get_user_session_by_token(token) is None
+
+
+async def test_signed_token_is_revoked_when_session_row_is_already_gone() -> None:
+    repository = FakeAuthRepository()
+    auth_service = make_auth_service(repository, secret_key="secret")
+    token = auth_service.token_signer.sign(user_id=7, session_id=42)
+    # Строку сессии уже удалила очистка БД: подписанные запросы не обновляют updated_at.
+    user_session = await auth_service.get_user_session_by_token(token)
+
+    await auth_service.logout_user(token, session_id=user_session.id)
+
+    assert repository.revoked == [42]
+    assert await auth_service.get_user_session_by_token(token) is None
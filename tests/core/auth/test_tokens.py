@@ -0,0 +1,25 @@
+import time
+
+from app.core.auth.tokens import SessionTokenSigner
+
+
+def test_signer_round_trip_rejects_tampering_and_expiry() -> None:
+    signer = SessionTokenSigner(secret_key="secret", max_age=60)
+    token = signer.sign(user_id=7, session_id=3)
+
+    claims = signer.verify(token)
+    assert (claims.user_id, claims.session_id) == (7, 3)
+
+    assert signer.verify(token.replace(".7.", ".8.", 1)) is None
+    assert SessionTokenSigner(secret_key="other", max_age=60).verify(token) is None
+    assert signer.verify(signer.sign(user_id=7, session_id=3, issued_at=int(time.time()) - 61)) is None
+    assert signer.verify("stt1.garbage") is None
+    assert signer.verify("stt1.1.2.3.é") is None
+    assert signer.verify(token.rpartition(".")[0] + ".é") is None
+
+
+def test_signer_without_key_is_disabled() -> None:
+    signer = SessionTokenSigner(secret_key=None, max_age=60)
+
+    assert not signer.enabled
+    assert signer.verify("stt1.7.3.0.signature") is None
@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import insert, select
+
+from app.core.activity.constants import ActivityStatuses, ActivityTypes
+from app.core.activity.models import Activity, ActivityArchive, UserActivity
+from app.core.activity.repository import ActivityRepository
+from app.core.auth.models import UsersSession
+from app.core.maintenance.repository import MaintenanceRepository
+from app.core.rooms.models import RoomInvites
+from app.core.users.models import Users
+from app.infra.adapters.database import Database
+
+pytestmark = [pytest.mark.asyncio]
+
+DAY = 86400
+
+
+@pytest_asyncio.fixture()
+async def db(tmp_path):
+    db = Database(db_url=f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}")
+    await db.create_database()
+    yield db
+    await db.disconnect()
+
+
+def days_ago(days: int) -> datetime:
+    return datetime.now(timezone.utc) - timedelta(days=days)
+
+
+async def test_stale_sessions_are_deleted_by_age(db: Database) -> None:
+    async with db.session() as session:
+        await session.execute(insert(UsersSession), [
+            {"user_id": 1, "session_token": "stale", "updated_at": days_ago(31)},
+            {"user_id": 1, "session_token": "fresh", "updated_at": days_ago(1)},
+        ])
+        await session.commit()
+
+    assert await MaintenanceRepository(db=db).delete_stale_sessions(max_age_seconds=30 * DAY, limit=10) == 1
+
+    async with db.session() as session:
+        assert (await session.execute(select(UsersSession.session_token))).scalars().all() == ["fresh"]
+
+
+async def test_expired_invites_are_deleted(db: Database) -> None:
+    async with db.session() as session:
+        await session.execute(insert(RoomInvites), [
+            {"room_id": 1, "invite_code": "EXPIRED1", "expires_at": days_ago(1)},
+            {"room_id": 1, "invite_code": "ACTIVE01", "expires_at": days_ago(-1)},
+        ])
+        await session.commit()
+
+    assert await MaintenanceRepository(db=db).delete_expired_invites(limit=10) == 1
+
+    async with db.session() as session:
+        assert (await session.execute(select(RoomInvites.invite_code))).scalars().all() == ["ACTIVE01"]
+
+
+async def test_reconnected_presence_survives_orphan_cleanup(db: Database) -> None:
+    async with db.session() as session:
+        await session.execute(insert(Activity), [{
+            "id": 1, "name": "Игра", "room_id": 1, "creator_user_id": 1,
+            "status": ActivityStatuses.IN_PROGRESS, "type": ActivityTypes.VIDEO_GAMES,
+        }])
+        await session.execute(insert(UserActivity), [
+            {"user_id": user_id, "activity_id": 1, "joined_at": days_ago(2), "last_seen_at": days_ago(2)}
+            for user_id in (1, 2)
+        ])
+        await session.commit()
+
+    # Пользователь 1 переподключился к записи, оставленной упавшим воркером.
+    await ActivityRepository(db=db).add_user_to_activity(user_id=1, activity_id=1)
+    deleted = await MaintenanceRepository(db=db).delete_orphaned_user_activity(max_age_seconds=DAY, limit=10)
+
+    assert deleted == 1
+    async with db.session() as session:
+        assert (await session.execute(select(UserActivity.user_id))).scalars().all() == [1]
+
+
+async def test_finished_activities_are_moved_to_archive(db: Database) -> None:
+    async with db.session() as session:
+        await session.execute(insert(Activity), [
+            {
+                "id": activity_id, "name": "Игра", "room_id": 1, "creator_user_id": 1,
+                "status": ActivityStatuses.FINISHED, "type": ActivityTypes.VIDEO_GAMES, "finished_at": finished_at,
+            }
+            for activity_id, finished_at in ((1, days_ago(31)), (2, days_ago(1)))
+        ])
+        await session.commit()
+
+    archived = await MaintenanceRepository(db=db).archive_finished_activities(older_than_seconds=30 * DAY, limit=10)
+
+    assert archived == 1
+    async with db.session() as session:
+        assert (await session.execute(select(Activity.id))).scalars().all() == [2]
+        assert (await session.execute(select(ActivityArchive.id))).scalars().all() == [1]
+
+
+async def test_avatar_urls_in_use(db: Database) -> None:
+    async with db.session() as session:
+        await session.execute(insert(Users), [
+            {
+                "login": f"user_{i}", "email": f"user_{i}@example.com", "first_name": "Имя",
+                "password": "x", "avatar_url": "/avatars/shared.png",
+            }
+            for i in range(2)
+        ])
+        await session.commit()
+
+    in_use = await MaintenanceRepository(db=db).get_avatar_urls_in_use(["/avatars/shared.png", "/avatars/old.png"])
+
+    assert in_use == {"/avatars/shared.png"}
@@ -0,0 +1,80 @@
+import pytest
+
+from app.core.maintenance.service import JanitorService
+
+pytestmark = [pytest.mark.asyncio]
+
+
+class FakeMaintenanceRepository:
+    def __init__(self, invites: int, sessions: int, user_activity: int) -> None:
+        self.rows = {"invites": invites, "sessions": sessions, "user_activity": user_activity}
+        self.limits: list[int] = []
+        self.avatars_in_use: set[str] = set()
+
+    def _take(self, table: str, limit: int) -> int:
+        self.limits.append(limit)
+        deleted = min(self.rows[table], limit)
+        self.rows[table] -= deleted
+        return deleted
+
+    async def delete_expired_invites(self, limit: int) -> int:
+        return self._take("invites", limit)
+
+    async def delete_stale_sessions(self, max_age_seconds: int, limit: int) -> int:
+        return self._take("sessions", limit)
+
+    async def delete_orphaned_user_activity(self, max_age_seconds: int, limit: int) -> int:
+        return self._take("user_activity", limit)
+
+    async def archive_finished_activities(self, older_than_seconds: int, limit: int) -> int:
+        return 0
+
+    async def delete_old_cache_invalidations(self, max_age_seconds: int, limit: int) -> int:
+        return 0
+
+    async def delete_old_revoked_sessions(self, max_age_seconds: int, limit: int) -> int:
+        return 0
+
+    async def get_avatar_urls_in_use(self, avatar_urls: list[str]) -> set[str]:
+        return self.avatars_in_use & set(avatar_urls)
+
+
+async def test_run_once_deletes_in_bounded_batches() -> None:
+    repository = FakeMaintenanceRepository(invites=25, sessions=3, user_activity=100)
+    janitor = JanitorService(
+        maintenance_repository=repository, batch_size=10, batch_pause=0, max_batches_per_run=5
+    )
+
+    report = await janitor.run_once()
+
+    assert (report.expired_invites, report.stale_sessions, report.orphaned_user_activity) == (25, 3, 50)
+    assert set(repository.limits) == {10}
+    assert repository.rows["user_activity"] == 50
+    assert janitor.last_report is report
+
+
+class FakeAvatarProcessor:
+    def __init__(self, stale: list[str]) -> None:
+        self.stale = stale
+        self.deleted: list[str] = []
+
+    async def find_stale_avatars(self, min_age_seconds: float) -> list[str]:
+        return self.stale
+
+    async def delete_avatar(self, avatar_url: str, min_age_seconds: float | None = None) -> bool:
+        self.deleted.append(avatar_url)
+        return True
+
+
+async def test_run_once_deletes_only_unreferenced_avatars() -> None:
+    repository = FakeMaintenanceRepository(invites=0, sessions=0, user_activity=0)
+    repository.avatars_in_use = {"/avatars/b.png"}
+    avatar_processor = FakeAvatarProcessor(stale=["/avatars/a.png", "/avatars/b.png", "/avatars/c.png"])
+    janitor = JanitorService(
+        maintenance_repository=repository, avatar_processor=avatar_processor, batch_size=2, batch_pause=0
+    )
+
+    report = await janitor.run_once()
+
+    assert report.unused_avatars == 2
+    assert avatar_processor.deleted == ["/avatars/a.png", "/avatars/c.png"]
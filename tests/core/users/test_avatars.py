@@ -0,0 +1,124 @@
+import io
+import os
+import time
+
+import pytest
+from fastapi import UploadFile
+from PIL import Image
+
+from app.core.users.avatars import AvatarProcessor, read_upload, render_avatar, avatar_renditions
+from app.core.users.constants import AVATARS_DIR, AVATAR_MAX_DIMENSION
+from app.core.users.exceptions import InvalidAvatarFormatException, AvatarProcessingOverloaded, \
+    AvatarTooLargeException
+
+pytestmark = [pytest.mark.asyncio]
+
+
+def jpeg_bytes(width: int, height: int) -> bytes:
+    output = io.BytesIO()
+    Image.new("RGB", (width, height), color=(200, 40, 40)).save(output, "JPEG")
+    return output.getvalue()
+
+
+async def test_save_avatar_writes_deduplicated_renditions(tmp_path) -> None:
+    processor = AvatarProcessor(max_workers=1, max_queue=0, static_root=str(tmp_path))
+    data = jpeg_bytes(640, 480)
+    try:
+        avatar_url = await processor.save_avatar(data)
+        processor.shutdown()
+        # Повторная загрузка того же файла не доходит до пула процессов.
+        processor._executor = "unused"
+        assert await processor.save_avatar(data) == avatar_url
+        processor._executor = None
+
+        with pytest.raises(InvalidAvatarFormatException):
+            await processor.save_avatar(b"not an image")
+
+        processor._in_flight = 1
+        with pytest.raises(AvatarProcessingOverloaded):
+            await processor.save_avatar(jpeg_bytes(10, 10))
+        processor._in_flight = 0
+    finally:
+        processor.shutdown()
+
+    avatars_dir = tmp_path / AVATARS_DIR
+    renditions = avatar_renditions(avatar_url)
+    assert renditions["256"]["png"] == avatar_url
+    files = sorted(url.rsplit("/", 1)[1] for formats in renditions.values() for url in formats.values())
+    assert sorted(os.listdir(avatars_dir)) == files
+    for size, formats in renditions.items():
+        for image_format, url in formats.items():
+            with Image.open(avatars_dir / url.rsplit("/", 1)[1]) as image:
+                assert (image.format, image.size) == (image_format.upper(), (int(size), int(size)))
+
+    legacy = avatars_dir / "0b5e4f7a-1c2d-4e3f-8a9b-0c1d2e3f4a5b.png"
+    legacy.write_bytes(b"png")
+    await processor.delete_avatar(f"/{AVATARS_DIR}/{legacy.name}")
+    await processor.delete_avatar(avatar_url)
+    await processor.delete_avatar("/../../etc/passwd")
+    assert os.listdir(avatars_dir) == []
+    assert avatar_renditions(f"/{AVATARS_DIR}/{legacy.name}") is None
+
+
+class CountingFile(io.BytesIO):
+    def __init__(self, data: bytes) -> None:
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+async def test_read_upload_stops_as_soon_as_limit_is_exceeded() -> None:
+    small = UploadFile(file=io.BytesIO(b"x" * 100))
+    assert await read_upload(small, max_bytes=100, chunk_size=30) == b"x" * 100
+
+    large_file = CountingFile(b"x" * 10_000)
+    with pytest.raises(AvatarTooLargeException):
+        await read_upload(UploadFile(file=large_file), max_bytes=100, chunk_size=30)
+    assert large_file.bytes_read == 120
+
+    with pytest.raises(AvatarTooLargeException):
+        await read_upload(UploadFile(file=io.BytesIO(b""), size=101), max_bytes=100)
+
+
+def test_render_avatar_checks_dimensions_before_decoding() -> None:
+    output = io.BytesIO()
+    Image.new("L", (AVATAR_MAX_DIMENSION + 1, 1)).save(output, "JPEG")
+
+    with pytest.raises(ValueError, match="max"):
+        render_avatar(output.getvalue())
+
+    size, image_format, content = render_avatar(jpeg_bytes(2048, 1536), sizes=(256,))[-1]
+    with Image.open(io.BytesIO(content)) as image:
+        assert (image.size, image.format) == ((256, 256), "PNG")
+
+
+async def test_only_stale_avatar_files_are_collected(tmp_path) -> None:
+    processor = AvatarProcessor(max_workers=1, max_queue=0, static_root=str(tmp_path))
+    try:
+        avatar_url = await processor.save_avatar(jpeg_bytes(64, 64))
+    finally:
+        processor.shutdown()
+    avatars_dir = tmp_path / AVATARS_DIR
+    legacy = avatars_dir / "0b5e4f7a-1c2d-4e3f-8a9b-0c1d2e3f4a5b.png"
+    legacy.write_bytes(b"png")
+    (avatars_dir / "tmpabc.png").write_bytes(b"partial")
+    hour_ago = time.time() - 3600
+    for path in avatars_dir.iterdir():
+        os.utime(path, (hour_ago, hour_ago))
+
+    assert sorted(await processor.find_stale_avatars(min_age_seconds=60)) == sorted(
+        [avatar_url, f"/{AVATARS_DIR}/{legacy.name}"]
+    )
+
+    # Повторная загрузка того же изображения защищает файлы от очистки, пока ссылка не записана в БД.
+    processor._executor = "unused"
+    assert await processor.save_avatar(jpeg_bytes(64, 64)) == avatar_url
+    processor._executor = None
+    assert await processor.find_stale_avatars(min_age_seconds=60) == [f"/{AVATARS_DIR}/{legacy.name}"]
+    assert not await processor.delete_avatar(avatar_url, min_age_seconds=60)
+    assert await processor.delete_avatar(f"/{AVATARS_DIR}/{legacy.name}", min_age_seconds=60)
+    assert not legacy.exists()
@@ -0,0 +1,51 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from app.core.users.dto import UserDTO
+from app.core.users.loader import UserLoader
+
+pytestmark = [pytest.mark.asyncio]
+
+
+class RecordingUserRepository:
+    def __init__(self, existing_ids: set[int]) -> None:
+        self.existing_ids = existing_ids
+        self.calls: list[list[int]] = []
+
+    async def get_users_by_ids(self, user_ids: list[int], from_replica: bool = True) -> list[UserDTO]:
+        self.calls.append(user_ids)
+        now = datetime.now()
+        return [
+            UserDTO(id=user_id, login=f"user{user_id}", email=f"user{user_id}@example.com",
+                    first_name="User", created_at=now, updated_at=now)
+            for user_id in sorted(user_ids) if user_id in self.existing_ids
+        ]
+
+
+async def test_concurrent_loads_are_coalesced_into_one_query() -> None:
+    repository = RecordingUserRepository(existing_ids={1, 2, 3})
+    loader = UserLoader(user_repository=repository)
+
+    first, second, missing, many = await asyncio.gather(
+        loader.load(1),
+        loader.load(1),
+        loader.load(42),
+        loader.load_many([3, 2, 3, 1]),
+    )
+
+    assert repository.calls == [[1, 42, 3, 2]]
+    assert first.id == second.id == 1 and first is not second
+    assert missing is None
+    assert [user.id for user in many] == [3, 2, 1]
+
+
+async def test_batches_are_bounded() -> None:
+    repository = RecordingUserRepository(existing_ids=set(range(5)))
+    loader = UserLoader(user_repository=repository, max_batch_size=2)
+
+    users = await loader.load_many(range(5))
+
+    assert [user.id for user in users] == [0, 1, 2, 3, 4]
+    assert repository.calls == [[0, 1], [2, 3], [4]]
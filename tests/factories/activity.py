@@ -0,0 +1,21 @@
+from datetime import datetime
+
+import factory
+from factory import Faker
+
+from app.core.activity.constants import ActivityStatuses, ActivityTypes
+from app.core.activity.models import Activity
+from tests.factories.base import AsyncSQLAlchemyModelFactory
+
+
+class ActivityFactory(AsyncSQLAlchemyModelFactory):
+    class Meta:
+        model = Activity
+        sqlalchemy_session = None
+        sqlalchemy_session_persistence = "flush"
+
+    name = Faker("word")
+    status = ActivityStatuses.PLANNED
+    type = ActivityTypes.VIDEO_GAMES
+    scheduled_at = factory.LazyFunction(datetime.utcnow)
+    created_at = factory.LazyFunction(datetime.utcnow)
@@ -0,0 +1,18 @@
+import uuid
+from datetime import datetime
+
+import factory
+
+from app.core.auth.models import UsersSession
+from tests.factories.base import AsyncSQLAlchemyModelFactory
+
+
+class UsersSessionFactory(AsyncSQLAlchemyModelFactory):
+    class Meta:
+        model = UsersSession
+        sqlalchemy_session = None
+        sqlalchemy_session_persistence = "flush"
+
+    session_token = factory.LazyFunction(lambda: str(uuid.uuid4()))
+    created_at = factory.LazyFunction(datetime.utcnow)
+    updated_at = factory.LazyFunction(datetime.utcnow)
@@ -0,0 +1,25 @@
+from datetime import datetime
+
+import factory
+from factory import Faker
+
+from app.core.rooms.models import Rooms, UsersRooms
+from tests.factories.base import AsyncSQLAlchemyModelFactory
+
+
+class RoomFactory(AsyncSQLAlchemyModelFactory):
+    class Meta:
+        model = Rooms
+        sqlalchemy_session = None
+        sqlalchemy_session_persistence = "flush"
+
+    name = Faker("word")
+    description = Faker("sentence")
+    created_at = factory.LazyFunction(datetime.utcnow)
+
+
+class UsersRoomsFactory(AsyncSQLAlchemyModelFactory):
+    class Meta:
+        model = UsersRooms
+        sqlalchemy_session = None
+        sqlalchemy_session_persistence = "flush"
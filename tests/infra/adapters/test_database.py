@@ -0,0 +1,115 @@
+import pytest
+from sqlalchemy import exc, text
+
+from app.infra.adapters.database import Database, fingerprint_statement, profile_queries
+
+pytestmark = [pytest.mark.asyncio]
+
+
+async def test_pool_metrics_track_checkouts_and_timeouts(tmp_path) -> None:
+    db = Database(
+        db_url=f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}",
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.1,
+    )
+
+    async with db.session() as first:
+        await first.execute(text("SELECT 1"))
+        assert db.pool_stats().checked_out == 1
+
+        with pytest.raises(exc.TimeoutError):
+            async with db.session() as second:
+                await second.execute(text("SELECT 1"))
+
+    stats = db.pool_stats()
+    assert stats.checked_out == 0
+    assert stats.peak_checked_out == 1
+    assert stats.checkouts == 1
+    assert stats.timeouts == 1
+
+    await db.disconnect()
+
+
+async def _create_marker_table(db_url: str, marker: str) -> None:
+    db = Database(db_url=db_url)
+    async with db.session() as session:
+        await session.execute(text("CREATE TABLE marker (name VARCHAR(20))"))
+        await session.execute(text("INSERT INTO marker (name) VALUES (:name)"), {"name": marker})
+        await session.commit()
+    await db.disconnect()
+
+
+async def _read_marker(session) -> str:
+    result = await session.execute(text("SELECT name FROM marker"))
+    return result.scalar_one()
+
+
+async def test_read_session_routes_to_replica(tmp_path) -> None:
+    primary_url = f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}"
+    replica_url = f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}"
+    await _create_marker_table(primary_url, "primary")
+    await _create_marker_table(replica_url, "replica")
+
+    db = Database(db_url=primary_url, replica_urls=[replica_url])
+
+    async with db.session() as session:
+        assert await _read_marker(session) == "primary"
+    async with db.read_session() as session:
+        assert await _read_marker(session) == "replica"
+
+    assert db.pool_stats().checkouts == 1
+    [replica_metrics] = db.replica_pool_metrics().values()
+    assert replica_metrics.snapshot().checkouts == 1
+    assert replica_metrics.snapshot().checked_out == 0
+
+    await db.disconnect()
+
+
+async def test_read_session_falls_back_to_primary_when_replica_is_down(tmp_path) -> None:
+    primary_url = f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}"
+    broken_replica_url = f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'replica.db'}"
+    replica_url = f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}"
+    await _create_marker_table(primary_url, "primary")
+    await _create_marker_table(replica_url, "replica")
+
+    db = Database(db_url=primary_url, replica_urls=[broken_replica_url], replica_retry_seconds=60)
+
+    async with db.read_session() as session:
+        assert await _read_marker(session) == "primary"
+    assert db._available_replicas() == []
+
+    await db.disconnect()
+
+    db = Database(db_url=primary_url, replica_urls=[broken_replica_url, replica_url])
+    for _ in range(3):
+        async with db.read_session() as session:
+            assert await _read_marker(session) == "replica"
+
+    await db.check_replicas()
+    assert [replica.healthy for replica in db._replicas] == [False, True]
+
+    await db.disconnect()
+
+
+async def test_profile_queries_counts_statements_and_logs_slow_ones(tmp_path, caplog) -> None:
+    db = Database(db_url=f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}", slow_query_threshold_ms=0)
+
+    with caplog.at_level("WARNING", logger="app.infra.adapters.database.slow_query"):
+        with profile_queries() as stats:
+            async with db.session() as session:
+                await session.execute(text("SELECT 1 WHERE 'secret' = 'secret'"))
+                await session.execute(text("SELECT 2"))
+
+    assert stats.count == 2
+    assert stats.total_time >= stats.slowest_time > 0
+    assert "secret" not in caplog.text
+    assert "SELECT ? WHERE ? = ?" in caplog.text
+
+    await db.disconnect()
+
+
+def test_fingerprint_statement_collapses_in_lists() -> None:
+    assert fingerprint_statement("SELECT id FROM users\n WHERE id IN (?, ?, ?) LIMIT 10") == (
+        "SELECT id FROM users WHERE id IN (...) LIMIT ?"
+    )
@@ -0,0 +1,26 @@
+import pytest
+
+from app.infra.adapters.database import Database
+from app.infra.adapters.invalidation import DatabaseInvalidationBus
+
+pytestmark = [pytest.mark.asyncio]
+
+
+async def test_database_bus_delivers_events_to_other_workers(tmp_path) -> None:
+    db_url = f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}"
+    first_db, second_db = Database(db_url=db_url), Database(db_url=db_url)
+    await first_db.create_database()
+    first, second = DatabaseInvalidationBus(db=first_db), DatabaseInvalidationBus(db=second_db)
+    received: list[str] = []
+    second.subscribe("room_membership", received.append)
+
+    await second.poll()
+    await first.publish("room_membership", "1:2")
+    await first.publish("other", "3")
+
+    assert await second.poll() == 2
+    assert received == ["1:2"]
+    assert await second.poll() == 0
+
+    await first_db.disconnect()
+    await second_db.disconnect()
@@ -0,0 +1,36 @@
+from app.infra.cache import MISSING, TTLCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_cache_expires_and_evicts_least_recently_used() -> None:
+    clock = FakeClock()
+    cache: TTLCache[str, int | None] = TTLCache(maxsize=2, ttl=10, clock=clock)
+
+    cache.set("a", 1)
+    cache.set("b", None)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+
+    cache.set("c", 3)
+    assert cache.get("a") is MISSING
+
+    clock.now = 10
+    assert cache.get("b") is MISSING
+    assert cache.stats().evictions == 1
+
+
+def test_ttl_cache_skips_values_read_before_invalidation() -> None:
+    cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=10)
+
+    generation = cache.generation
+    cache.pop("a")
+    cache.set("a", 1, generation=generation)
+
+    assert cache.get("a") is MISSING
@@ -0,0 +1,151 @@
+import asyncio
+
+import orjson
+import pytest
+
+from app.core.rooms.cache import RoomMembershipCache
+from app.core.rooms.repository import RoomRepository
+from app.core.rooms.service import RoomService
+from app.infra.adapters.database import Database
+from app.infra.adapters.invalidation import InvalidationBus
+from app.infra.response_cache import ENTRY_OVERHEAD_BYTES, ResponseCache
+from app.infra.versions import ResourceVersions, user_rooms_key
+
+pytestmark = [pytest.mark.asyncio]
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_cache(max_bytes: int = 1024 * 1024, clock: FakeClock | None = None) -> tuple[ResponseCache, ResourceVersions]:
+    bus = InvalidationBus()
+    cache = ResponseCache(invalidation_bus=bus, max_bytes=max_bytes, ttl=10, clock=clock or FakeClock())
+    return cache, ResourceVersions(invalidation_bus=bus)
+
+
+async def test_concurrent_misses_load_once() -> None:
+    cache, _ = make_cache()
+    calls = 0
+    release = asyncio.Event()
+
+    async def load() -> bytes:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return b"body"
+
+    waiters = [asyncio.create_task(cache.get_or_load("key", ("rooms:1",), load)) for _ in range(10)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*waiters) == [b"body"] * 10
+    assert calls == 1
+    assert (cache.stats().misses, cache.stats().coalesced) == (1, 9)
+    assert await cache.get_or_load("key", ("rooms:1",), load) == b"body"
+    assert cache.stats().hits == 1
+
+
+async def test_bump_drops_tagged_entries() -> None:
+    cache, versions = make_cache()
+    bodies = iter([b"old", b"new"])
+
+    async def load() -> bytes:
+        return next(bodies)
+
+    async def unrelated() -> bytes:
+        return b"other"
+
+    assert await cache.get_or_load("rooms", ("rooms:1",), load) == b"old"
+    await cache.get_or_load("members", ("rooms:2",), unrelated)
+
+    await versions.bump("rooms:1")
+
+    assert await cache.get_or_load("rooms", ("rooms:1",), load) == b"new"
+    assert len(cache) == 2
+
+
+async def test_load_started_before_bump_is_not_stored() -> None:
+    cache, versions = make_cache()
+    release = asyncio.Event()
+
+    async def stale_load() -> bytes:
+        await release.wait()
+        return b"stale"
+
+    async def fresh_load() -> bytes:
+        return b"fresh"
+
+    stale = asyncio.create_task(cache.get_or_load("rooms", ("rooms:1",), stale_load))
+    await asyncio.sleep(0)
+    await versions.bump("rooms:1")
+
+    assert await cache.get_or_load("rooms", ("rooms:1",), fresh_load) == b"fresh"
+    release.set()
+    assert await stale == b"stale"
+    assert await cache.get_or_load("rooms", ("rooms:1",), stale_load) == b"fresh"
+
+
+async def test_failed_load_is_not_stored() -> None:
+    cache, _ = make_cache()
+
+    async def failing() -> bytes:
+        raise ValueError("cursor")
+
+    with pytest.raises(ValueError):
+        await cache.get_or_load("rooms", (), failing)
+    assert len(cache) == 0
+
+
+async def test_entries_expire_and_evict_by_bytes() -> None:
+    clock = FakeClock()
+    cache, _ = make_cache(max_bytes=2 * (ENTRY_OVERHEAD_BYTES + 10), clock=clock)
+
+    def body(value: bytes):
+        async def load() -> bytes:
+            return value
+        return load
+
+    await cache.get_or_load("a", (), body(b"a" * 10))
+    await cache.get_or_load("b", (), body(b"b" * 10))
+    await cache.get_or_load("a", (), body(b"unused"))
+    await cache.get_or_load("c", (), body(b"c" * 10))
+
+    assert len(cache) == 2
+    assert cache.stats().evictions == 1
+    assert await cache.get_or_load("b", (), body(b"reloaded")) == b"reloaded"
+
+    clock.now = 10
+    assert await cache.get_or_load("c", (), body(b"expired")) == b"expired"
+
+
+async def test_body_loaded_after_write_is_fresh_despite_lagging_replica(tmp_path) -> None:
+    # Реплика без данных - предельный случай отставания.
+    replica_url = f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}"
+    replica = Database(db_url=replica_url)
+    await replica.create_database()
+    await replica.disconnect()
+    db = Database(db_url=f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}", replica_urls=[replica_url])
+    await db.create_database()
+
+    bus = InvalidationBus()
+    cache = ResponseCache(invalidation_bus=bus, max_bytes=1024 * 1024, ttl=10, clock=FakeClock())
+    room_service = RoomService(
+        room_repository=RoomRepository(db=db),
+        membership_cache=RoomMembershipCache(invalidation_bus=bus, maxsize=10, ttl=10),
+        resource_versions=ResourceVersions(invalidation_bus=bus),
+    )
+
+    async def load() -> bytes:
+        page = await room_service.get_rooms_by_user_id(user_id=1)
+        return orjson.dumps([room.name for room in page.items])
+
+    assert await cache.get_or_load("rooms", (user_rooms_key(1),), load) == b"[]"
+    await room_service.create_room(user_id=1, name="Новая комната")
+
+    assert orjson.loads(await cache.get_or_load("rooms", (user_rooms_key(1),), load)) == ["Новая комната"]
+    await db.disconnect()
@@ -0,0 +1,39 @@
+import pytest
+
+from app.infra.adapters.invalidation import InvalidationBus
+from app.infra.versions import ResourceVersions
+
+pytestmark = [pytest.mark.asyncio]
+
+
+async def test_bump_changes_only_its_token() -> None:
+    versions = ResourceVersions(invalidation_bus=InvalidationBus())
+    first, second = versions.token("rooms:1"), versions.token("rooms:2")
+    assert first != second
+
+    await versions.bump("rooms:1")
+
+    assert versions.token("rooms:1") != first
+    assert versions.token("rooms:2") == second
+
+
+async def test_evicted_version_never_returns_to_an_old_token() -> None:
+    versions = ResourceVersions(invalidation_bus=InvalidationBus(), maxsize=1)
+    before_change = versions.token("rooms:1")
+
+    await versions.bump("rooms:1")
+    await versions.bump("rooms:2")
+
+    assert len(versions) == 1
+    assert versions.token("rooms:1") != before_change
+
+
+async def test_no_token_until_the_event_number_is_known() -> None:
+    bus = InvalidationBus()
+    versions = ResourceVersions(invalidation_bus=bus)
+
+    # Так DatabaseInvalidationBus рассылает событие до записи строки в БД.
+    bus._dispatch("resource_versions", "rooms:1")
+
+    assert versions.token("rooms:1", "rooms:2") is None
+    assert versions.token("rooms:2") is not None